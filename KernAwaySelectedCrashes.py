@@ -1,5 +1,11 @@
+# Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 from GlyphsApp import *
 from vanilla import *
+from rolandhuse.crashes import CrashFinder, text_pairs
+from rolandhuse.kerningcommit import commit_kerning
+from rolandhuse.profiles import DEFAULT_PATH, ProfileCache
+
+SOURCES = ["Selected glyphs", "Current tab text", "Text below"]
 
 class SequentialKerningDialog:
     def __init__(self):
@@ -10,83 +16,97 @@ class SequentialKerningDialog:
         self.selected_layers = self.font.selectedLayers
         self.selected_glyphs = [layer.parent for layer in self.selected_layers if layer and layer.parent]
 
-        self.w = Window((300, 160), "Sequential Kerning")
-        self.w.label = TextBox((10, 10, -10, 20), "Enter positive kerning value:")
+        self.w = Window((300, 290), "Sequential Kerning")
+        self.w.label = TextBox((10, 10, -10, 20), "Minimum distance between outlines:")
         self.w.input = EditText((10, 35, -10, 20), "10")
-        self.w.preview = CheckBox((10, 60, -10, 20), "Open preview tab", value=True)
-        self.w.macro = CheckBox((10, 80, -10, 20), "Report in Macro Window", value=True)
-        self.w.overwrite = CheckBox((10, 105, -10, 20), "Overwrite existing pairs", value=False)
-        self.w.applyButton = Button((10, 130, 110, 20), "Apply", callback=self.applyKerning)
-        self.w.cancelButton = Button((-110, 130, -10, 20), "Cancel", callback=self.cancel)
+        self.w.sourceLabel = TextBox((10, 67, 80, 20), "Pairs from:")
+        self.w.source = PopUpButton((90, 65, -10, 20), SOURCES)
+        self.w.text = TextEditor((10, 95, -10, 90), "")
+        self.w.preview = CheckBox((10, 190, -10, 20), "Open preview tab", value=True)
+        self.w.macro = CheckBox((10, 210, -10, 20), "Report in Macro Window", value=True)
+        self.w.overwrite = CheckBox((10, 235, -10, 20), "Adjust existing pairs", value=False)
+        self.w.applyButton = Button((10, 260, 110, 20), "Apply", callback=self.applyKerning)
+        self.w.cancelButton = Button((-110, 260, -10, 20), "Cancel", callback=self.cancel)
         self.w.open()
 
+    def pairs(self):
+        """Neighbouring glyph pairs from the chosen source, or None without a tab to read."""
+        source = SOURCES[self.w.source.get()]
+        if source == "Selected glyphs":
+            # Neighbouring glyphs in selection order
+            names = [glyph.name for glyph in self.selected_glyphs]
+            return list(dict.fromkeys(zip(names, names[1:])))
+        if source == "Current tab text":
+            tab = self.font.currentTab
+            if tab is None:
+                return None
+            return text_pairs(self.font, tab.text)
+        return text_pairs(self.font, self.w.text.get())
+
     def applyKerning(self, sender):
         try:
-            value = int(self.w.input.get())
-            if value <= 0:
-                Message("Error", "Please enter a positive kerning value.", OKButton="OK")
+            margin = int(self.w.input.get())
+            if margin < 0:
+                Message("Error", "Please enter a distance of 0 or more.", OKButton="OK")
                 return
         except ValueError:
             Message("Error", "Please enter a valid integer.", OKButton="OK")
             return
 
+        pairs = self.pairs()
+        if pairs is None:
+            Message("Error", "Open an Edit tab with the text to kern.", OKButton="OK")
+            return
+
         open_tab = self.w.preview.get()
         report_macro = self.w.macro.get()
         overwrite = self.w.overwrite.get()
 
         if report_macro:
             Glyphs.clearLog()
-            print(f"🔧 Applying sequential kerning value {value} on master: {self.master.name}")
-            print(f"Selected glyphs in order: {[g.name for g in self.selected_glyphs]}\n")
-
+            print(f"🔧 Kerning crashes apart to {margin} units on master: {self.master.name}")
+            print(f"{len(pairs)} glyph pair(s) from {SOURCES[self.w.source.get()].lower()}\n")
+
+        # Empty glyphs (space) never crash
+        profiles = ProfileCache(self.font, path=DEFAULT_PATH)
+        finder = CrashFinder(self.font, self.master_id, margin, profiles=profiles)
+        crashes = finder.crashes(pairs)
+        profiles.save()
+
+        # Pairs sharing kerning keys get the largest value any of them needs
+        needed = {}
+        for crash in crashes:
+            key = (crash.left_key, crash.right_key)
+            if key not in needed or crash.value > needed[key][0]:
+                needed[key] = (crash.value, crash)
+
+        # Existing values from one copy of the master's kerning, all writes in one batch.
+        # font.kerning keys glyph-level pairs by glyph id, crashes name glyphs.
+        kerning = self.font.kerning.get(self.master_id) or {}
+        key_id = finder.snap.key_id
+        changes = {}
         tab_pairs = []
         applied = 0
         skipped = 0
 
-        # Step through selected glyphs in sequence
-        i = 0
-        while i < len(self.selected_glyphs) - 1:
-            leftGlyph = self.selected_glyphs[i]
-            rightGlyph = self.selected_glyphs[i + 1]
-
-            # Skip if either is space
-            if leftGlyph.name == "space" or rightGlyph.name == "space":
-                i += 1
-                continue
-
-            # Determine kerning keys (group or glyph)
-            leftGroup = leftGlyph.rightKerningGroup
-            rightGroup = rightGlyph.leftKerningGroup
-
-            leftKey = f"@MMK_L_{leftGroup}" if leftGroup else leftGlyph.name
-            rightKey = f"@MMK_R_{rightGroup}" if rightGroup else rightGlyph.name
-
-            # Check for existing kerning
-            existing = self.font.kerningForPair(self.master_id, leftKey, rightKey)
-
-            if existing is not None:
-                if overwrite:
-                    # Overwrite the existing value
-                    self.font.setKerningForPair(self.master_id, leftKey, rightKey, value)
-                    applied += 1
-                    if report_macro:
-                        print(f"🔁 Overwrote existing {existing} to {value}: {leftKey} - {rightKey}")
-                    tab_pairs.append(f"/{leftGlyph.name}/{rightGlyph.name}")
-                else:
-                    skipped += 1
-                    if report_macro:
-                        print(f"⚠️ Skipped existing: {leftKey} - {rightKey} (value: {existing})")
-                i += 1
+        for (leftKey, rightKey), (value, crash) in needed.items():
+            leftId, rightId = key_id(leftKey), key_id(rightKey)
+            existing = (kerning.get(leftId) or {}).get(rightId)
+            if existing is not None and not overwrite:
+                skipped += 1
+                if report_macro:
+                    print(f"⚠️ Skipped existing: {leftKey} - {rightKey} (value: {existing}, needs {value})")
                 continue
 
-            # Otherwise, apply new kerning
-            self.font.setKerningForPair(self.master_id, leftKey, rightKey, value)
+            changes.setdefault(leftId, {})[rightId] = value
             applied += 1
-            tab_pairs.append(f"/{leftGlyph.name}/{rightGlyph.name}")
+            tab_pairs.append(f"/{crash.left}/{crash.right}")
             if report_macro:
-                print(f"✅ Applied {value}: {leftKey} - {rightKey}")
+                verb = f"🔁 Changed {existing} to" if existing is not None else "✅ Applied"
+                print(f"{verb} {value}: {leftKey} - {rightKey} (gap was {crash.gap:.0f})")
 
-            i += 1
+        if changes:
+            commit_kerning(self.font, {self.master_id: changes})
 
         # Open preview tab
         if open_tab and tab_pairs:
@@ -94,9 +114,11 @@ class SequentialKerningDialog:
             self.font.newTab(preview_string)
 
         # Final summary
-        message = f"✅ Applied {value} to {applied} pair(s)."
+        message = f"✅ Kerned {applied} crashing pair(s) of {len(pairs)} apart."
         if skipped:
             message += f" Skipped {skipped} existing pair(s)."
+        if not crashes:
+            message = f"✅ No crashes closer than {margin} units in {len(pairs)} pair(s)."
         if report_macro:
             print("\n" + message)
 
@@ -1,18 +1,21 @@
 # MenuTitle: Set Glyph Order from Kerning Groups (Strict, Bidirectional, No Marks)
+# Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 
 from GlyphsApp import Glyphs
+from rolandhuse.snapshot import snapshot
 
 font = Glyphs.font
 if not font:
     print("No font open")
 else:
     master = font.selectedFontMaster
+    snap = snapshot(font)
 
     # key = (leftGroup, rightGroup)
     pairs = {}
 
     def sort_key(glyph_name):
-        g = font.glyphs[glyph_name]
+        g = snap.glyph(glyph_name)
         uni = g.unicode
 
         if not uni:
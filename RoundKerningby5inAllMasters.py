@@ -1,62 +1,69 @@
 # add code here#MenuTitle: Round Kerning to Multiples of 5
 # -*- coding: utf-8 -*-
 __doc__ = """
-Rounds all kerning values in all masters to the nearest multiple of 5. Skips invalid glyph pairs and optimizes to prevent freezing.
+Rounds all kerning values in all masters to the nearest multiple of 5. Skips invalid glyph pairs and writes all changes in one go.
+With compact = True it then also deletes pairs that change nothing: exceptions equal to the value they fall back to, and group pairs of 0.
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 
 import GlyphsApp
 from AppKit import NSApp
-import time
+from rolandhuse.kerningcheck import KerningKeys, Orphan
+from rolandhuse.kerningcommit import commit_kerning
+from rolandhuse.kerningcompact import compact_kerning, gpos_size, print_report
 
 font = Glyphs.font  # Current font
 round_value = 5
+compact = False  # True: afterwards delete exceptions equal to their group value, and 0 pairs
+report_gpos = False  # compare compiled GPOS sizes of the current master (slow, needs fontTools)
 
-def process_kerning_batch(master, left, right_pairs, batch_size=100):
-    """Process kerning pairs in batches with progress feedback."""
-    count = 0
+def rounded_changes(master, left, right_pairs):
+    """{right: new value} for the pairs of one left key that need rounding."""
+    changes = {}
+    valid_right = keys.right
     for right, current_value in right_pairs.items():
-        # Check if right is a valid glyph or group
-        right_glyph = font.glyphForId_(right) if right.startswith("@") or font.glyphs[right] else None
-        if not right_glyph and not right.startswith("@"):
-            print(f"Skipping invalid right glyph ID: {right} for left: {left}")
+        if right not in valid_right:
+            orphans.append(Orphan(master.id, left, right, current_value, "right: " + keys.problem(right, False)))
             continue
-        
         # Only update if the rounded value differs
         new_value = round_value * round(current_value / round_value)
         if new_value != current_value:
-            try:
-                font.setKerningForPair(master.id, left, right, new_value)
-                count += 1
-                if count % batch_size == 0:
-                    # Force UI update and small delay to prevent freezing
-                    NSApp.updateWindows()
-                    time.sleep(0.01)  # Brief pause to allow Glyphs to breathe
-            except Exception as e:
-                print(f"Error setting kerning for pair {left}, {right}: {e}")
-    return count
+            changes[right] = new_value
+    return changes
 
 if font is None:
     print("No font open.")
 else:
-    # Disable UI updates to reduce overhead
-    Glyphs.font.disableUpdateInterface()
-    try:
-        total_updated = 0
-        for master in font.masters:
-            print(f"Processing master: {master.name}")
-            master_kerning = font.kerning.get(master.id, {})
-            for left in list(master_kerning.keys()):
-                # Check if left is a valid glyph or group
-                left_glyph = font.glyphForId_(left) if left.startswith("@") or font.glyphs[left] else None
-                if not left_glyph and not left.startswith("@"):
-                    print(f"Skipping invalid left glyph ID: {left}")
-                    continue
-                # Process right-side pairs in batches
-                updated = process_kerning_batch(master, left, master_kerning[left])
-                total_updated += updated
-                if updated > 0:
-                    print(f"Updated {updated} pairs for left: {left} in master: {master.name}")
-        print(f"Finished: Rounded {total_updated} kerning values to multiples of 5 in all masters.")
-    finally:
-        # Re-enable UI updates
-        Glyphs.font.enableUpdateInterface()
\ No newline at end of file
+    # Valid glyph and group keys are worked out once, not per pair
+    keys = KerningKeys(font)
+    orphans = []
+    # Collect all changes first, then write them in one transaction:
+    # no per-pair setKerningForPair calls, no sleeps, one UI refresh.
+    changes = {}
+    total_updated = 0
+    for master in font.masters:
+        print(f"Processing master: {master.name}")
+        master_changes = changes[master.id] = {}
+        for left, right_pairs in (font.kerning.get(master.id) or {}).items():
+            if not keys.is_valid_left(left):
+                orphans.extend(Orphan(master.id, left, right, value, "left: " + keys.problem(left, True))
+                               for right, value in right_pairs.items())
+                continue
+            updated = rounded_changes(master, left, right_pairs)
+            if updated:
+                master_changes[left] = updated
+                total_updated += len(updated)
+                print(f"Updated {len(updated)} pairs for left: {left} in master: {master.name}")
+    commit_kerning(font, changes)
+    if compact:
+        # Rounding makes many exceptions equal to their group value
+        master_id = font.selectedFontMaster.id
+        sizes = {master_id: gpos_size(font, master_id)} if report_gpos else None
+        print_report(font, compact_kerning(font), sizes)
+    NSApp.updateWindows()
+    if orphans:
+        print(f"Skipped {len(orphans)} pairs with invalid keys:")
+        for orphan in orphans:
+            master_name = font.masters[orphan.master_id].name
+            print(f"  {master_name}: {orphan.left} → {orphan.right} ({orphan.value}): {orphan.reason}")
+    print(f"Finished: Rounded {total_updated} kerning values to multiples of 5 in all masters.")
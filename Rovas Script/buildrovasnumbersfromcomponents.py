@@ -2,14 +2,19 @@
 __doc__ = """
 Creates Old Hungarian numerals 2–4 and 6–9 using components and properly adds ss01 feature.
 Creates a dedicated lookup for Rovas numerals in the ss01 feature.
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 
 from GlyphsApp import *
+from rolandhuse import glyphrefs
+from rolandhuse.feacache import validate
+from rolandhuse.featureindex import FeatureIndex
 
 # Config
 PUA_START = 0xE100  # PUA codepoints start
 COMPONENT_SCALE = 0.9
 X_OVERLAP = 0.2
+DRY_RUN = False  # True: only print a diff of the ss01 change; no glyphs are built
 
 # Composite numerals (excluding already defined base numerals)
 composite_numerals = [
@@ -69,7 +74,7 @@ def create_composite_numerals(font):
 
     return created
 
-def ensure_ss01_feature(font, created_numerals):
+def ensure_ss01_feature(font, created_numerals, dry_run=False):
     # Create the lookup first
     lookup_name = "ROVAS_NUMERALS"
     substitutions = [
@@ -90,29 +95,28 @@ def ensure_ss01_feature(font, created_numerals):
     lookup_code = f"lookup {lookup_name} {{\n    " + "\n    ".join(substitutions) + f"\n}} {lookup_name};"
 
     # Check if feature already exists
-    ss01_feature = next((f for f in font.features if f.name == "ss01"), None)
-    
-    if not ss01_feature:
+    index = FeatureIndex(font, dry_run=dry_run)
+    ss01_code = index.feature_code("ss01")
+
+    if ss01_code is None:
         # Create new ss01 feature with the lookup
-        ss01_feature = GSFeature()
-        ss01_feature.name = "ss01"
-        ss01_feature.code = f"{lookup_code}\n\nfeature ss01 {{\n    lookup {lookup_name};\n}} ss01;"
-        font.features.append(ss01_feature)
+        index.set_feature("ss01", f"{lookup_code}\n\nfeature ss01 {{\n    lookup {lookup_name};\n}} ss01;")
         print("✅ Created ss01 feature with Rovas numerals lookup")
     else:
         # Check if lookup exists in feature
-        if lookup_name not in ss01_feature.code:
+        if lookup_name not in ss01_code:
             # Add lookup to the feature
-            if "feature ss01" in ss01_feature.code:
+            if "feature ss01" in ss01_code:
                 # Insert before feature block
-                new_code = f"{lookup_code}\n\n{ss01_feature.code}"
+                new_code = f"{lookup_code}\n\n{ss01_code}"
             else:
                 # Append to existing code
-                new_code = f"{ss01_feature.code}\n\n{lookup_code}\nfeature ss01 {{\n    lookup {lookup_name};\n}} ss01;"
-            ss01_feature.code = new_code
+                new_code = f"{ss01_code}\n\n{lookup_code}\nfeature ss01 {{\n    lookup {lookup_name};\n}} ss01;"
+            index.set_feature("ss01", new_code)
             print(f"✅ Added {lookup_name} lookup to ss01 feature")
         else:
             print(f"⚠️ Lookup {lookup_name} already exists in ss01 feature")
+    index.commit()
 
 def clean_metadata(font):
     for g in font.glyphs:
@@ -123,11 +127,17 @@ def clean_metadata(font):
 
 # Run script
 font = Glyphs.font
-if font:
+if font and DRY_RUN:
+    missing = [name for name, _ in composite_numerals if name not in font.glyphs]
+    print(f"🔍 Dry run: would build {', '.join(missing) or 'no glyphs'}")
+    ensure_ss01_feature(font, missing, dry_run=True)
+elif font:
     print("🚧 Building Rovas numerals 2–9...")
     created = create_composite_numerals(font)
     if created:
         ensure_ss01_feature(font, created)
+        validate(font, ["ss01"])
+        glyphrefs.report(font, ["ss01"])
     clean_metadata(font)
 
     font.newTab(" ".join(f"/{g}" for g in created))
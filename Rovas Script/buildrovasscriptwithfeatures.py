@@ -4,11 +4,15 @@
 Generates Old Hungarian Rovas letters and numerals with proper Unicode and OpenType features.
 Adds to existing ss01/liga features without overwriting them, and tags glyphs for sorting in the main Glyphs view.
 Also handles mirrored punctuation for RTL scripts.
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 
 import traceback
 from GlyphsApp import *
 from GlyphsApp.plugins import *
+from rolandhuse import glyphrefs
+from rolandhuse.feacache import validate
+from rolandhuse.featureindex import FeatureIndex
 
 def create_rovas_glyphs(font):
     rovas_data = [
@@ -169,22 +173,21 @@ def add_opentype_features(font):
     """
 
     def update_feature(feature_name, rules):
-        existing = font.features[feature_name] if feature_name in font.features else None
-        if existing:
-            if rules.strip() not in existing.code:
-                existing.code += "\n" + rules
+        existing_code = index.feature_code(feature_name)
+        if existing_code is not None:
+            if rules.strip() not in existing_code:
+                index.set_feature(feature_name, existing_code + "\n" + rules)
                 print(f"✅ Updated existing {feature_name} feature")
             else:
                 print(f"⚠️ {feature_name} already contains rules.")
         else:
-            new_feature = GSFeature()
-            new_feature.name = feature_name
-            new_feature.code = rules
-            font.features.append(new_feature)
+            index.set_feature(feature_name, rules)
             print(f"✅ Created new {feature_name} feature")
 
+    index = FeatureIndex(font)
     update_feature("liga", liga_rules)
     update_feature("rtlm", rtlm_rules)
+    index.commit()
 
 def tag_rovas_glyphs(font):
     try:
@@ -216,6 +219,8 @@ if font:
     create_rovas_numerals(font)
     create_mirrored_punctuation(font)
     add_opentype_features(font)
+    validate(font, ["liga", "rtlm"])
+    glyphrefs.report(font, ["liga", "rtlm"])
     tag_rovas_glyphs(font)
 
     Message(
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Measure the calt output of rolandhuse.caltbuilder against chains that take
+every cycling glyph (@AllCycling) as input, as the builder used to emit.
+
+    python benchmarks/calt_output.py --glyphs 5000 --ss 20
+    python benchmarks/calt_output.py --size medium --words 20000
+
+Both versions are compiled with fontTools' feaLib and the GSUB tables are
+compared by size, lookups and subtables. Shaping is timed by running calt
+over the same random text with a small GSUB interpreter (single and chain
+substitutions, which is all the builder emits); it also checks that both
+tables give the same glyphs. Rules tried per glyph come from running the
+feature code itself through rolandhuse.gsubsim. Needs fontTools.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+from fontTools.ttLib import TTFont
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rolandhuse import caltbuilder, synthetic  # noqa: E402
+from rolandhuse.gsubsim import GSUBSimulator  # noqa: E402
+
+
+def feature_code(classes, features):
+    lines = [f"@{name} = [{' '.join(members)}];" for name, members in classes]
+    lines += [f"feature {tag} {{\n{code}\n}} {tag};" for tag, code in features]
+    return "\n".join(lines)
+
+
+def compile_gsub(names, fea):
+    tt = TTFont()
+    tt.setGlyphOrder([".notdef"] + names)
+    addOpenTypeFeaturesFromString(tt, fea, tables={"GSUB"})
+    return tt, len(tt["GSUB"].compile(tt))
+
+
+# ── GSUB interpreter ─────────────────────────────────────────────────────────
+
+def _subtable(subtable):
+    return subtable.ExtSubTable if subtable.LookupType == 7 else subtable
+
+
+class Shaper(object):
+    """Applies one feature's lookups to a list of glyph names."""
+
+    def __init__(self, tt, tag):
+        table = tt["GSUB"].table
+        self.lookups = table.LookupList.Lookup
+        indices = set()
+        for record in table.FeatureList.FeatureRecord:
+            if record.FeatureTag == tag:
+                indices.update(record.Feature.LookupListIndex)
+        self.feature_lookups = sorted(indices)
+        self._compiled = {}
+
+    def _compile(self, index):
+        """[(kind, data)] per subtable of a lookup, with coverages as sets/dicts."""
+        compiled = self._compiled.get(index)
+        if compiled is None:
+            compiled = []
+            for subtable in map(_subtable, self.lookups[index].SubTable):
+                if subtable.LookupType == 1:
+                    compiled.append((1, subtable.mapping))
+                elif subtable.Format == 3:
+                    compiled.append((3, (
+                        [frozenset(c.glyphs) for c in subtable.BacktrackCoverage],
+                        [frozenset(c.glyphs) for c in subtable.InputCoverage],
+                        [frozenset(c.glyphs) for c in subtable.LookAheadCoverage],
+                        [(r.SequenceIndex, r.LookupListIndex) for r in subtable.SubstLookupRecord],
+                    )))
+                elif subtable.Format == 2:
+                    rules = []
+                    for rule_set in subtable.ChainSubClassSet:
+                        rules.append([(r.Backtrack, [None] + list(r.Input), r.LookAhead,
+                                       [(s.SequenceIndex, s.LookupListIndex) for s in r.SubstLookupRecord])
+                                      for r in (rule_set.ChainSubClassRule if rule_set else [])])
+                    compiled.append((2, (
+                        frozenset(subtable.Coverage.glyphs),
+                        subtable.BacktrackClassDef.classDefs,
+                        subtable.InputClassDef.classDefs,
+                        subtable.LookAheadClassDef.classDefs,
+                        rules,
+                    )))
+                else:
+                    raise NotImplementedError(f"GSUB lookup type {subtable.LookupType} format {subtable.Format}")
+            self._compiled[index] = compiled
+        return compiled
+
+    def _nested(self, records, glyphs, position):
+        for sequence_index, lookup_index in records:
+            self._apply_at(lookup_index, glyphs, position + sequence_index)
+
+    def _apply_at(self, index, glyphs, i):
+        """Apply lookup `index` at position i; True if a subtable matched."""
+        glyph = glyphs[i]
+        for kind, data in self._compile(index):
+            if kind == 1:
+                if glyph in data:
+                    glyphs[i] = data[glyph]
+                    return True
+            elif kind == 3:
+                backtrack, inputs, lookahead, records = data
+                if glyph not in inputs[0] or i < len(backtrack) or i + len(inputs) + len(lookahead) > len(glyphs):
+                    continue
+                if (all(glyphs[i - 1 - j] in cov for j, cov in enumerate(backtrack))
+                        and all(glyphs[i + j] in cov for j, cov in enumerate(inputs))
+                        and all(glyphs[i + len(inputs) + j] in cov for j, cov in enumerate(lookahead))):
+                    self._nested(records, glyphs, i)
+                    return True
+            else:
+                coverage, back_classes, input_classes, ahead_classes, rules = data
+                if glyph not in coverage:
+                    continue
+                klass = input_classes.get(glyph, 0)
+                for backtrack, inputs, lookahead, records in (rules[klass] if klass < len(rules) else ()):
+                    if i < len(backtrack) or i + len(inputs) + len(lookahead) > len(glyphs):
+                        continue
+                    if (all(back_classes.get(glyphs[i - 1 - j], 0) == c for j, c in enumerate(backtrack))
+                            and all(input_classes.get(glyphs[i + j], 0) == c for j, c in enumerate(inputs) if j)
+                            and all(ahead_classes.get(glyphs[i + len(inputs) + j], 0) == c
+                                    for j, c in enumerate(lookahead))):
+                        self._nested(records, glyphs, i)
+                        return True
+        return False
+
+    def shape(self, glyphs):
+        glyphs = list(glyphs)
+        for index in self.feature_lookups:
+            for i in range(len(glyphs)):
+                self._apply_at(index, glyphs, i)
+        return glyphs
+
+
+def shaper_output(tt, text):
+    return Shaper(tt, "calt").shape(text)
+
+
+# ── running ──────────────────────────────────────────────────────────────────
+
+def sample_text(names, classes, words, seed):
+    """Random words of letters, separated by runs of NotLetter glyphs."""
+    rng = random.Random(seed)
+    classes = dict(classes)
+    letters, others = classes["AllBase"], classes["NotLetter"] or ["space"]
+    text = []
+    for _ in range(words):
+        text += [rng.choice(letters) for _ in range(rng.randint(2, 9))]
+        text += [rng.choice(others) for _ in range(rng.randint(1, 5))]
+    return text
+
+
+def wide_inputs(features):
+    """The features with every chain taking @AllCycling as input."""
+    return [(tag, re.sub(r"@\w+' lookup", "@AllCycling' lookup", code)) for tag, code in features]
+
+
+def measure(names, wide, text, repeat):
+    classes, features, _ = caltbuilder.build(names)
+    if wide:
+        features = wide_inputs(features)
+    fea = feature_code(classes, features)
+    tt, size = compile_gsub(names, fea)
+    sim = GSUBSimulator(fea)
+    if sim.shape(text, ["calt"]) != shaper_output(tt, text):
+        print(f"⚠️ gsubsim and the compiled GSUB disagree (wide={wide})")
+    lookups = tt["GSUB"].table.LookupList.Lookup
+    shaper = Shaper(tt, "calt")
+    shaper.shape(text[:100])  # compile the subtables outside the timing
+    timings, shaped = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        shaped = shaper.shape(text)
+        timings.append(time.perf_counter() - start)
+    return {
+        "gsub": size,
+        "lookups": len(lookups),
+        "subtables": sum(len(lookup.SubTable) for lookup in lookups),
+        "rules": sum(code.count("' lookup ") for _, code in features),
+        "rules_per_glyph": sim.stats["rules"] / sim.stats["glyphs"],
+        "glyphs_per_s": len(text) / min(timings),
+        "shaped": shaped,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(synthetic.SIZES), default="small")
+    parser.add_argument("--glyphs", type=int, help="N glyphs")
+    parser.add_argument("--ss", type=int, dest="ss_levels", help="S .ssNN levels")
+    parser.add_argument("--words", type=int, default=5000, help="words of sample text")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    size = dict(synthetic.SIZES[args.size], seed=args.seed, masters=1, pairs=0)
+    for key in ("glyphs", "ss_levels"):
+        if getattr(args, key) is not None:
+            size[key] = getattr(args, key)
+    font = synthetic.make_font(**size)
+    # Synthetic fonts have no dotted non-letters; add .case punctuation as NotLetter
+    names = caltbuilder.present_names(font, font.masters[0].id)
+    names += [name + ".case" for name in synthetic.PUNCTUATION]
+
+    classes, _, ss_suffixes = caltbuilder.build(names)
+    text = sample_text(names, classes, args.words, args.seed)
+    print(f"{len(names)} glyphs, {len(ss_suffixes)} SS levels, {len(text)} glyphs of text")
+
+    wide = measure(names, True, text, args.repeat)
+    built = measure(names, False, text, args.repeat)
+    for key, label in (("gsub", "GSUB bytes"), ("lookups", "lookups"), ("subtables", "subtables"),
+                       ("rules", "chain rules"), ("rules_per_glyph", "rules/glyph"),
+                       ("glyphs_per_s", "glyphs/s")):
+        ratio = built[key] / wide[key] if wide[key] else float("nan")
+        print(f"  {label:<12} {wide[key]:>12.1f} → {built[key]:>12.1f}  ×{ratio:.2f}")
+    if built["shaped"] != wide["shaped"]:
+        print("⚠️ The narrowed inputs shape the sample text differently")
+        sys.exit(1)
+    print("✅ Same glyphs from both")
+
+
+if __name__ == "__main__":
+    main()
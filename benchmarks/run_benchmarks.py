@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Time the hot path of every batch script against synthetic fonts.
+
+    python benchmarks/run_benchmarks.py --size medium --json results.json
+    python benchmarks/run_benchmarks.py --glyphs 5000 --ss 20 --only calt
+    python benchmarks/run_benchmarks.py --size medium --compare results.json
+
+Runs on any machine: fonts are built with rolandhuse.synthetic and scripts
+see the GlyphsApp stand-in (rolandhuse.standin). Each case gets a freshly generated font
+per repetition; only the case itself is timed. --compare prints the ratio to
+an earlier JSON run and exits with 1 if a case got slower than --tolerance.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rolandhuse import feacache, headless, profiles, standin, synthetic  # noqa: E402
+from rolandhuse.crashes import CrashFinder, text_pairs  # noqa: E402
+from rolandhuse.crashmap import crash_map  # noqa: E402
+from rolandhuse.gsubsim import GSUBSimulator  # noqa: E402
+from rolandhuse.kerningcheck import find_orphans  # noqa: E402
+from rolandhuse.kerningjobs import run_master_jobs  # noqa: E402
+from rolandhuse.kerningmatrix import FontKerning  # noqa: E402
+from rolandhuse.kerningresolver import KerningResolver  # noqa: E402
+from rolandhuse.snapshot import FontSnapshot  # noqa: E402
+
+CASES = {}
+
+# Scripts validate their features and cache outline profiles; keep both out of the user's
+_CACHE = tempfile.mkdtemp(prefix="benchmarks-")
+feacache.DEFAULT_PATH = os.path.join(_CACHE, "features.json")
+profiles.DEFAULT_PATH = os.path.join(_CACHE, "profiles.npz")
+
+
+def case(name):
+    """Register `function(font) -> callable to time` as benchmark `name`."""
+    def register(function):
+        CASES[name] = function
+        return function
+    return register
+
+
+def script(relative_path):
+    return os.path.join(ROOT, relative_path)
+
+
+def script_functions(relative_path):
+    """Globals of a script loaded without running its __main__ block."""
+    return runpy.run_path(script(relative_path), init_globals=standin.namespace(), run_name="benchmark")
+
+
+def run(relative_path, font, selection=None):
+    return lambda: headless.run_script(script(relative_path), font, selection=selection)
+
+
+# ── cases ────────────────────────────────────────────────────────────────────
+
+@case("snapshot")
+def _snapshot(font):
+    return lambda: FontSnapshot(font)
+
+
+@case("calt")
+def _calt(font):
+    return run("GlyphsCaltBuilder.py", font)
+
+
+@case("calt_shaping")
+def _calt_shaping(font):
+    headless.run_script(script("GlyphsCaltBuilder.py"), font)
+    sim = GSUBSimulator.from_font(font)
+    rng = random.Random(1)
+    bases = [glyph.name for glyph in font.glyphs if "." not in glyph.name]
+    text = [rng.choice(bases) for _ in range(5000)]
+    return lambda: sim.shape(text, ["calt"])
+
+
+@case("round_kerning")
+def _round_kerning(font):
+    return run("RoundKerningby5inAllMasters.py", font)
+
+
+@case("steal_kerning")
+def _steal_kerning(font):
+    adjust_kerning = script_functions("stealandadjustmetricsandkerning.py")["adjust_kerning"]
+    source, target = font.masters[0].id, font.masters[-1].id
+    layers = [glyph.layers[source] for glyph in font.glyphs]
+    return lambda: adjust_kerning(font, source, target, layers, -7.5)
+
+
+@case("roman_features")
+def _roman_features(font):
+    add_opentype_features = script_functions("buildromannumeralswithfeatures.py")["add_opentype_features"]
+    return lambda: add_opentype_features(font)
+
+
+@case("kerning_matrix")
+def _kerning_matrix(font):
+    def round_all_masters():
+        kerning = FontKerning(font)
+        for master in font.masters:
+            kerning[master.id] = kerning[master.id].rounded(5)
+        kerning.write()
+    return round_all_masters
+
+
+@case("kerning_jobs")
+def _kerning_jobs(font):
+    return lambda: run_master_jobs(font, [("round", 5), ("prune_zeros",)])
+
+
+@case("kerning_orphans")
+def _kerning_orphans(font):
+    return lambda: find_orphans(font)
+
+
+@case("kerning_resolve")
+def _kerning_resolve(font):
+    names = [glyph.name for glyph in font.glyphs]
+    pairs = [(left, right) for left in names[:200] for right in names[:200]]
+    return lambda: KerningResolver(font).batch(pairs)
+
+
+@case("crash_gaps")
+def _crash_gaps(font):
+    names = [glyph.name for glyph in font.glyphs]
+    pairs = [(left, right) for left in names[:200] for right in names[:200]]
+    return lambda: CrashFinder(font, font.masters[0].id).crashes(pairs)
+
+
+@case("crash_text")
+def _crash_text(font):
+    names = [glyph.name for glyph in font.glyphs]
+    rng = random.Random(0)
+    text = "\n".join(" ".join("/" + name for name in rng.sample(names, 40)) for _ in range(200))
+    return lambda: CrashFinder(font, font.masters[0].id).crashes(text_pairs(font, text))
+
+
+@case("crash_map")
+def _crash_map(font):
+    return lambda: crash_map(font, font.masters[0].id, processes=1)
+
+
+@case("glyph_order")
+def _glyph_order(font):
+    return run("Kerning/GlyphOrderPerKerningGroup.py", font)
+
+
+@case("tops_bottoms")
+def _tops_bottoms(font):
+    return run("showtopsandbottomsnewtab.py", font, selection=[glyph.name for glyph in font.glyphs])
+
+
+# ── running ──────────────────────────────────────────────────────────────────
+
+def time_case(name, size, repeat):
+    timings = []
+    for _ in range(repeat):
+        font = synthetic.make_font(**size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            function = CASES[name](font)
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    return {
+        "case": name,
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "runs": timings,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = {item["case"]: item for item in json.load(f)["results"]}
+    slower = []
+    print(f"\nCompared with {baseline_path}:")
+    for item in results:
+        old = baseline.get(item["case"])
+        if not old:
+            print(f"  {item['case']:<16} (new)")
+            continue
+        ratio = item["best"] / old["best"] if old["best"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  ⚠️ slower"
+            slower.append(item["case"])
+        print(f"  {item['case']:<16} {old['best']:9.4f}s → {item['best']:9.4f}s  ×{ratio:.2f}{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(synthetic.SIZES), default="small")
+    parser.add_argument("--glyphs", type=int, help="N glyphs")
+    parser.add_argument("--masters", type=int, help="M masters")
+    parser.add_argument("--pairs", type=int, help="K kerning pairs per master")
+    parser.add_argument("--ss", type=int, dest="ss_levels", help="S .ssNN levels")
+    parser.add_argument("--groups", type=int, help="G kerning groups")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    size = dict(synthetic.SIZES[args.size], seed=args.seed)
+    for key in ("glyphs", "masters", "pairs", "ss_levels", "groups"):
+        if getattr(args, key) is not None:
+            size[key] = getattr(args, key)
+
+    print("Synthetic font: " + ", ".join(f"{key}={value}" for key, value in size.items()))
+    results = []
+    for name in args.only or CASES:
+        result = time_case(name, size, args.repeat)
+        results.append(result)
+        print(f"  {name:<16} best {result['best']:9.4f}s   median {result['median']:9.4f}s")
+
+    if args.json:
+        report = {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved {args.json}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,35 +2,41 @@
 __doc__ = """
 Builds Roman numeral glyphs and adds OpenType substitutions for stylistic sets and ligatures.
 Adds to existing ss01/liga features without overwriting them, and ensures ss01 precedes liga.
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 
 import traceback
-import re
 from GlyphsApp import *
 from GlyphsApp.plugins import *
+from rolandhuse import glyphrefs
+from rolandhuse.feacache import validate
+from rolandhuse.featureindex import FeatureIndex
+from rolandhuse.snapshot import snapshot
+
+dry_run = False  # True: only print a diff of the feature changes; no glyphs are built
+
+ROMAN_GLYPHS = [
+    ("2160", "Ⅰ", ["I"]),
+    ("2161", "Ⅱ", ["I", "I"]),
+    ("2162", "Ⅲ", ["I", "I", "I"]),
+    ("2163", "Ⅳ", ["I", "V"]),
+    ("2164", "Ⅴ", ["V"]),
+    ("2165", "Ⅵ", ["V", "I"]),
+    ("2166", "Ⅶ", ["V", "I", "I"]),
+    ("2167", "Ⅷ", ["V", "I", "I", "I"]),
+    ("2168", "Ⅸ", ["I", "X"]),
+    ("2169", "Ⅹ", ["X"]),
+    ("216A", "Ⅺ", ["X", "I"]),
+    ("216B", "Ⅻ", ["X", "I", "I"]),
+    ("216C", "Ⅼ", ["L"]),
+    ("216D", "Ⅽ", ["C"]),
+    ("216E", "Ⅾ", ["D"]),
+    ("216F", "Ⅿ", ["M"]),
+    ("", "Twenty-roman", ["X", "X"]),
+]
 
 def create_roman_glyphs(font):
-    roman_glyphs = [
-        ("2160", "Ⅰ", ["I"]),
-        ("2161", "Ⅱ", ["I", "I"]),
-        ("2162", "Ⅲ", ["I", "I", "I"]),
-        ("2163", "Ⅳ", ["I", "V"]),
-        ("2164", "Ⅴ", ["V"]),
-        ("2165", "Ⅵ", ["V", "I"]),
-        ("2166", "Ⅶ", ["V", "I", "I"]),
-        ("2167", "Ⅷ", ["V", "I", "I", "I"]),
-        ("2168", "Ⅸ", ["I", "X"]),
-        ("2169", "Ⅹ", ["X"]),
-        ("216A", "Ⅺ", ["X", "I"]),
-        ("216B", "Ⅻ", ["X", "I", "I"]),
-        ("216C", "Ⅼ", ["L"]),
-        ("216D", "Ⅽ", ["C"]),
-        ("216E", "Ⅾ", ["D"]),
-        ("216F", "Ⅿ", ["M"]),
-        ("", "Twenty-roman", ["X", "X"]),
-    ]
-
-    for unicode_hex, glyph_name, components in roman_glyphs:
+    for unicode_hex, glyph_name, components in ROMAN_GLYPHS:
         try:
             if font.glyphs[glyph_name]:
                 print(f"⚠️ Skipping {glyph_name}: Exists.")
@@ -71,7 +77,7 @@ def create_roman_glyphs(font):
             print(f"❌ Error in {glyph_name}: {e}")
             traceback.print_exc()
 
-def add_opentype_features(font):
+def add_opentype_features(font, dry_run=False):
     ss01_rules = """
   # Single substitutions (Arabic to Roman)
   sub one by One-roman;
@@ -97,36 +103,35 @@ def add_opentype_features(font):
   sub One-roman zero zero zero by Thousand-roman;
 """
 
+    known = set(snapshot(font).glyphs)
+    if dry_run:
+        # Nothing is built in a dry run: count the glyphs create_roman_glyphs() would add
+        known.update(glyph_name for _, glyph_name, _ in ROMAN_GLYPHS)
+
     def update_feature(feature_name, rules):
-        glyph_names = set(g.name for g in font.glyphs)
-        referenced = set(re.findall(r"\bby\s+([A-Za-z0-9_.-]+);", rules))
-        missing = [g for g in referenced if g not in glyph_names]
+        unknown = glyphrefs.scan(rules, known)
+        missing = sorted({ref.name for ref in unknown})
         if missing:
             print(f"⚠️ Cannot add {feature_name}. Missing glyphs: {', '.join(missing)}")
             return
 
-        existing_feature = None
-        for feature in font.features:
-            if feature.name == feature_name:
-                existing_feature = feature
-                break
-
-        if existing_feature:
-            if rules.strip() not in existing_feature.code:
-                new_code = existing_feature.code.strip() + f"\n{rules}"
-                existing_feature.code = new_code
+        existing_code = index.feature_code(feature_name)
+        if existing_code is not None:
+            if rules.strip() not in existing_code:
+                index.set_feature(feature_name, existing_code.strip() + f"\n{rules}")
                 print(f"✅ Updated existing {feature_name} feature")
             else:
                 print(f"⚠️ Rules already exist in {feature_name}")
         else:
-            new_feature = GSFeature()
-            new_feature.name = feature_name
-            new_feature.code = rules  # ✅ No 'feature { }' wrapper here
-            font.features = list(font.features) + [new_feature]
+            index.set_feature(feature_name, rules)  # ✅ No 'feature { }' wrapper here
             print(f"✅ Created new {feature_name} feature")
 
+    index = FeatureIndex(font, dry_run=dry_run)
     update_feature("ss01", ss01_rules)
     update_feature("liga", liga_rules)
+    index.commit()
+    if dry_run:
+        return
 
     # Ensure ss01 precedes liga
     feature_names = [f.name for f in font.features]
@@ -141,9 +146,13 @@ def add_opentype_features(font):
 # Run
 if __name__ == "__main__":
     font = Glyphs.font
-    if font:
+    if font and dry_run:
+        add_opentype_features(font, dry_run=True)
+    elif font:
         create_roman_glyphs(font)
         add_opentype_features(font)
+        validate(font, ["ss01", "liga"])
+        glyphrefs.report(font, ["ss01", "liga"])
 
         Message(
             title="Roman Numerals with OT Features Added!",
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Shared helpers for the rolandhuse Glyphs scripts.
+
+Everything in here works both inside the Glyphs Macro Panel (against the real
+GSFont objects) and headless on any machine (against fonts opened with
+rolandhuse.glyphsfile). Scripts import from this package; the package never
+imports GlyphsApp at module level.
+"""
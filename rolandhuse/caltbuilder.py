@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Class and feature generation behind GlyphsCaltBuilder.py.
+
+Everything is computed from the set of glyph names that are drawn (paths or
+components) and exporting. That set comes from one master, or from all
+masters combined by a policy:
+
+    presence = scan_masters(font)                 # {master id: [names]}
+    differences = inconsistencies(presence)       # {name: [master ids that have it]}
+    names = combine(presence, "intersection")     # or "union"
+    classes, features, ss_suffixes = build(names)
+
+Headless, scan_masters(font, processes=N) can read the font's file in N
+worker processes, each decoding a share of the glyphs for all masters at
+once. It only does so while no glyph has been touched since the file was
+read, so in-memory edits are never missed.
+
+Builds are incremental: fingerprint() hashes the drawn names per master and
+the options, and is stored in font.userData after writing, with a hash of
+each generated class and feature. If the fingerprint matches and Font Info
+still holds exactly that code (is_current) there is nothing to do; otherwise
+write_changed() only touches classes and features whose code differs.
+"""
+
+import concurrent.futures
+import hashlib
+
+from rolandhuse.featureindex import FeatureIndex
+from rolandhuse.suffixgraph import DEFAULT_FAMILIES, SuffixGraph
+
+POLICIES = ("intersection", "union")
+VERSION = 4  # bump when the generated code changes, so stored fingerprints expire
+USER_DATA_KEY = "com.rolandhuse.GlyphsCaltBuilder"
+
+
+# ── presence ─────────────────────────────────────────────────────────────────
+
+def _drawn(glyph, master_ids):
+    """Master ids in which `glyph` exports and has paths or components."""
+    if not glyph.export:
+        return []
+    drawn = []
+    for master_id in master_ids:
+        layer = glyph.layers[master_id]
+        if layer and (layer.paths or layer.components):
+            drawn.append(master_id)
+    return drawn
+
+
+def present_names(font, master_id):
+    """Drawn, exporting glyph names in one master, in font order."""
+    return [glyph.name for glyph in font.glyphs if _drawn(glyph, [master_id])]
+
+
+def _scan_file(path, names, master_ids):
+    from rolandhuse.glyphsfile import GSFont
+
+    font = GSFont(path)
+    try:
+        return [(name, _drawn(font.glyphs[name], master_ids)) for name in names]
+    finally:
+        font.close()
+
+
+def _unchanged_since_read(font):
+    """True for a font read from disk whose glyphs are all still undecoded, so not edited."""
+    return bool(getattr(font, "filepath", None)) and all(
+        getattr(glyph, "_source", None) is not None for glyph in font.glyphs)
+
+
+def scan_masters(font, master_ids=None, processes=1):
+    """{master id: drawn glyph names in font order} for all masters, in one pass.
+
+    With processes > 1 the font's file on disk is read by worker processes,
+    but only if no glyph has been decoded (and so possibly edited) since the
+    font was read; otherwise, and inside Glyphs, the font in memory is scanned.
+    """
+    master_ids = list(master_ids or [master.id for master in font.masters])
+    order = [glyph.name for glyph in font.glyphs]
+    if processes > 1 and _unchanged_since_read(font):
+        size = -(-len(order) // processes)
+        chunks = [order[start:start + size] for start in range(0, len(order), size)]
+        with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_scan_file, font.filepath, chunk, master_ids) for chunk in chunks]
+            found = [item for future in futures for item in future.result()]
+    else:
+        found = [(glyph.name, _drawn(glyph, master_ids)) for glyph in font.glyphs]
+    presence = {master_id: [] for master_id in master_ids}
+    for name, drawn in found:
+        for master_id in drawn:
+            presence[master_id].append(name)
+    return presence
+
+
+def inconsistencies(presence):
+    """{glyph name: [master ids that have it]} for glyphs not drawn in every master."""
+    counts = {}
+    for names in presence.values():
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+    masters = len(presence)
+    sets = {master_id: frozenset(names) for master_id, names in presence.items()}
+    return {name: [master_id for master_id, names in sets.items() if name in names]
+            for name, count in counts.items() if count < masters}
+
+
+def combine(presence, policy="intersection"):
+    """Names drawn in all masters ("intersection") or in any ("union"), in font order."""
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, use one of {', '.join(POLICIES)}")
+    lists = list(presence.values())
+    if not lists:
+        return []
+    sets = [frozenset(names) for names in lists]
+    wanted = frozenset.intersection(*sets) if policy == "intersection" else frozenset.union(*sets)
+    seen, names = set(), []
+    for each in lists:
+        for name in each:
+            if name in wanted and name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names
+
+
+# ── classes and features ─────────────────────────────────────────────────────
+
+def _lines(*args):
+    return "\n".join(args)
+
+
+def _emit_chain(lookup_name, backtrack_class, sub_lookup, input_class, skip=4):
+    """Chain lookup: `sub_lookup` on input after the backtrack, with up to `skip` NotLetters between."""
+    rules = []
+    for n in range(skip, 0, -1):
+        nl = " ".join(["@NotLetter"] * n)
+        rules.append(f"    sub {backtrack_class} {nl} {input_class}' lookup {sub_lookup};")
+    rules.append(f"    sub {backtrack_class} {input_class}' lookup {sub_lookup};")
+    return _lines(
+        f"lookup {lookup_name} {{",
+        *rules,
+        f"}} {lookup_name};"
+    )
+
+
+def build(all_names, families=DEFAULT_FAMILIES):
+    """([(class name, members)], [(feature tag, code)], cycling suffixes) for drawn glyphs.
+
+    `families` names the suffix families that cycle (see suffixgraph.FAMILIES,
+    or give a regex): ("ss",) cycles .ss01, .ss02, …; ("ss", "cv", "alt")
+    continues with .cv01… and .alt. .init/.fina forms of a base or of one of
+    its cycling forms (a.ss01.init) go to the init/fina features.
+
+    Each chain only takes the glyphs its lookup substitutes as input, so
+    other glyphs fail on the first coverage check. Up to four NotLetter
+    glyphs may sit between the backtrack and the input; these rules are
+    left out when there are no NotLetter glyphs, as an empty class does not
+    compile.
+    """
+    graph = SuffixGraph(all_names, families)
+    all_ss_suffixes = graph.levels
+
+    # A "base" is any glyph without a dot suffix
+    base_glyphs = graph.bases
+    level_bases = {sfx: [] for sfx in all_ss_suffixes}
+    bases_with_ss = []
+    for b in base_glyphs:
+        cycling = graph.cycling(b)
+        if cycling:
+            bases_with_ss.append(b)
+            for sfx in cycling:
+                level_bases[sfx].append(b)
+    bases_with_ss_set = frozenset(bases_with_ss)
+    bases_without_ss = [b for b in base_glyphs if b not in bases_with_ss_set]
+    init_pairs = graph.positional(".init")
+    fina_pairs = graph.positional(".fina")
+    bases_with_init = [form for form, _ in init_pairs]
+    bases_with_fina = [form for form, _ in fina_pairs]
+
+    # All cycling glyphs (bases + all their SS variants)
+    all_ss_forms = graph.cycling_forms()
+    all_cycling = sorted(set(base_glyphs) | set(all_ss_forms))
+
+    # Non-cycling glyphs (punct, marks, ligatures, .init/.fina forms, etc.)
+    all_letter_set = set(base_glyphs) | set(all_ss_forms)
+    init_fina_forms = frozenset([name for _, name in init_pairs] + [name for _, name in fina_pairs])
+    not_letter = [n for n in all_names if n not in all_letter_set and n not in init_fina_forms]
+
+    # Per-level data, and bases shared with the next level
+    ss_level_data = []
+    for sfx in all_ss_suffixes:
+        bases_at_level = level_bases[sfx]
+        if bases_at_level:
+            ss_level_data.append((sfx, bases_at_level, [b + sfx for b in bases_at_level]))
+    levels = []
+    for i, (sfx, bases_at_level, ss_forms) in enumerate(ss_level_data):
+        next_sfx = ss_level_data[i + 1][0] if i + 1 < len(ss_level_data) else None
+        shared = [b for b in bases_at_level if next_sfx and graph.form(b, next_sfx)]
+        levels.append((sfx, sfx[1:].upper(), bases_at_level, ss_forms, next_sfx, shared))
+
+    # ── classes ──
+    classes = [
+        ("AllBase", base_glyphs),
+        ("Base_withSS", bases_with_ss),
+        ("Base_noSS", bases_without_ss),
+    ]
+    for sfx, tag, bases_at_level, ss_forms, _, _ in levels:
+        classes.append((f"Base_with{tag}", bases_at_level))
+        classes.append((f"{tag}_all", ss_forms))
+    if bases_with_init:
+        classes.append(("Base_withInit", bases_with_init))
+        classes.append(("Init_all", [name for _, name in init_pairs]))
+    if bases_with_fina:
+        classes.append(("Base_withFina", bases_with_fina))
+        classes.append(("Fina_all", [name for _, name in fina_pairs]))
+
+    # Base_backtrack: AllBase + .init forms, so glyph after .init enters cycle
+    if bases_with_init:
+        classes.append(("Base_backtrack", base_glyphs + [name for _, name in init_pairs]))
+        base_bt = "@Base_backtrack"
+    else:
+        base_bt = "@AllBase"
+    classes.append(("AllCycling", all_cycling))
+    classes.append(("NotLetter", not_letter))
+    for sfx, tag, bases_at_level, ss_forms, next_sfx, shared in levels:
+        if shared:
+            classes.append((f"{tag}_with{next_sfx[1:].upper()}", [b + sfx for b in shared]))
+    skip = 4 if not_letter else 0
+
+    # ── features ──
+    features = []
+    if bases_with_init:
+        features.append(("init", "sub @Base_withInit' by @Init_all;"))
+    if bases_with_fina:
+        features.append(("fina", "sub @Base_withFina' by @Fina_all;"))
+
+    calt_blocks = []
+    for sfx, tag, bases_at_level, ss_forms, next_sfx, shared in levels:
+        calt_blocks.append(_lines(
+            f"lookup sub_Base_to_{tag} {{",
+            f"    sub @Base_with{tag} by @{tag}_all;",
+            f"}} sub_Base_to_{tag};"
+        ))
+        if shared:
+            next_tag = next_sfx[1:].upper()
+            calt_blocks.append(_lines(
+                f"lookup sub_{tag}_to_{next_tag} {{",
+                "\n".join(f"    sub {b + sfx} by {b + next_sfx};" for b in shared),
+                f"}} sub_{tag}_to_{next_tag};"
+            ))
+        calt_blocks.append(_lines(
+            f"lookup sub_{tag}_to_Base {{",
+            f"    sub @{tag}_all by @Base_with{tag};",
+            f"}} sub_{tag}_to_Base;"
+        ))
+
+    calt_blocks.append("")  # spacer before chain lookups
+
+    feature_lines = []
+    for sfx, tag, bases_at_level, ss_forms, next_sfx, shared in levels:
+        calt_blocks.append(_emit_chain(f"chain_Base_to_{tag}", base_bt, f"sub_Base_to_{tag}",
+                                       f"@Base_with{tag}", skip))
+        feature_lines.append(f"    lookup chain_Base_to_{tag};")
+        if shared:
+            next_tag = next_sfx[1:].upper()
+            calt_blocks.append(_emit_chain(f"chain_{tag}_to_{next_tag}", f"@{tag}_all", f"sub_{tag}_to_{next_tag}",
+                                           f"@{tag}_with{next_tag}", skip))
+            feature_lines.append(f"    lookup chain_{tag}_to_{next_tag};")
+        calt_blocks.append(_emit_chain(f"chain_{tag}_to_Base", f"@{tag}_all", f"sub_{tag}_to_Base",
+                                       f"@{tag}_all", skip))
+        feature_lines.append(f"    lookup chain_{tag}_to_Base;")
+
+    features.append(("calt", "\n\n".join(calt_blocks) + "\n\n" + "\n".join(feature_lines)))
+    return classes, features, all_ss_suffixes
+
+
+# ── writing ──────────────────────────────────────────────────────────────────
+
+def write(font, classes, features, dry_run=False):
+    """Upsert classes and features in one commit. Returns (class names, feature tags) that changed.
+
+    With dry_run=True the font is left alone and the diff is printed.
+    """
+    index = FeatureIndex(font, dry_run=dry_run)
+    changed_classes = [name for name, members in classes if index.set_class(name, " ".join(members))]
+    changed_features = [tag for tag, code in features if index.set_feature(tag, code)]
+    index.commit()
+    return changed_classes, changed_features
+
+
+# ── incremental builds ───────────────────────────────────────────────────────
+
+def fingerprint(presence, **options):
+    """Hash of the sorted drawn names per master plus the builder options."""
+    digest = hashlib.sha1(repr((VERSION, sorted(options.items()))).encode("utf-8"))
+    for master_id in sorted(presence):
+        digest.update(f"\0{master_id}\0".encode("utf-8"))
+        digest.update("\n".join(sorted(presence[master_id])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _code_hash(code):
+    return hashlib.sha1(code.encode("utf-8")).hexdigest() if code is not None else None
+
+
+def is_current(font, fingerprint):
+    """True if the last build had this fingerprint and Font Info still holds its code unedited."""
+    stored = font.userData.get(USER_DATA_KEY)
+    if not stored or stored.get("fingerprint") != fingerprint:
+        return False
+    classes, features = stored.get("classes"), stored.get("features")
+    if not hasattr(classes, "items") or not hasattr(features, "items"):
+        return False  # stored before code hashes were kept
+    index = FeatureIndex(font)
+    return (all(_code_hash(index.class_code(name)) == digest for name, digest in classes.items())
+            and all(_code_hash(index.feature_code(tag)) == digest for tag, digest in features.items()))
+
+
+def write_changed(font, classes, features, fingerprint=None, dry_run=False):
+    """write() and remember the fingerprint and code hashes. Returns (class names, feature tags) written."""
+    changed = write(font, classes, features, dry_run)
+    if fingerprint is not None and not dry_run:
+        font.userData[USER_DATA_KEY] = {
+            "fingerprint": fingerprint,
+            "classes": {name: _code_hash(" ".join(members)) for name, members in classes},
+            "features": {tag: _code_hash(code) for tag, code in features},
+        }
+    return changed
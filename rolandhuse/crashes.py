@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Find glyph pairs whose outlines collide or come too close, kerning applied.
+
+For each pair the closest horizontal distance between the right edge of the
+left glyph and the left edge of the right glyph is taken from the glyphs'
+profiles (see rolandhuse.profiles), with the kerning Glyphs applies between
+them. Pairs closer than the margin get the kerning value that opens them to
+exactly the margin:
+
+    finder = CrashFinder(font, master.id, margin=10)
+    finder.gaps([("T", "o"), ("V", "A")])       # array of distances
+    for crash in finder.crashes(pairs):
+        print(crash.left, crash.right, crash.gap, crash.kerning, "→", crash.value)
+
+The applied kerning comes from KerningResolver, which finds exceptions that
+font.kerning keys by glyph id. Glyphs, and the left_key and right_key a crash
+is written to, are glyph names or group keys; snap.key_id() turns them into
+font.kerning keys.
+
+All gaps of a call are computed in one vectorized pass. Pairs can also come
+from text, as typed in an Edit tab:
+
+    pairs = text_pairs(font, font.currentTab.text)    # [("A", "V"), ("V", "A"), ...]
+"""
+
+import collections
+import math
+
+import numpy as np
+
+from rolandhuse.gsubsim import text_tokens
+from rolandhuse.kerningresolver import KerningResolver
+from rolandhuse.profiles import BAND, ProfileCache, ProfileTable
+from rolandhuse.snapshot import LEFT_PREFIX, RIGHT_PREFIX, snapshot
+
+Crash = collections.namedtuple("Crash", "left right gap kerning value left_key right_key")
+
+
+def kerning_keys(left_glyph, right_glyph):
+    """(left key, right key) a new pair between two glyphs is written to: their groups if any."""
+    left_group = left_glyph.rightKerningGroup
+    right_group = right_glyph.leftKerningGroup
+    return (LEFT_PREFIX + left_group if left_group else left_glyph.name,
+            RIGHT_PREFIX + right_group if right_group else right_glyph.name)
+
+
+def text_pairs(font, text):
+    """Unique (left, right) pairs of neighbouring glyphs in text, in order of appearance.
+
+    /name picks a glyph by name as in an Edit tab. Line breaks, unknown names
+    and characters without a glyph end a run, so no pair spans them.
+    """
+    snap = snapshot(font)
+    pairs = {}
+    for line in text.splitlines():
+        previous = None
+        for name, char in text_tokens(line):
+            if char is not None:
+                glyph = snap.glyph_for_unicode(f"{ord(char):04X}")
+            else:
+                glyph = snap.glyph(name)
+            name = glyph.name if glyph is not None else None
+            if previous and name:
+                pairs.setdefault((previous, name))
+            previous = name
+    return list(pairs)
+
+
+class CrashFinder(object):
+
+    def __init__(self, font, master_id, margin=10, band=BAND, profiles=None, resolver=None):
+        self.font = font
+        self.master_id = master_id
+        self.margin = margin
+        self.snap = snapshot(font)
+        self.profiles = profiles or ProfileCache(font, band)
+        self.resolver = resolver or KerningResolver(font, self.snap)
+
+    def _table(self, names):
+        ids = {}
+        for name in names:
+            ids.setdefault(name, len(ids))
+        table = ProfileTable(self.profiles.get(name, self.master_id) for name in ids)
+        return table, ids
+
+    def gaps(self, pairs, kerning=None):
+        """Closest distance between the outlines of each (left, right) glyph pair.
+
+        Uses the applied kerning unless `kerning` gives the values. Pairs that
+        share no height (or involve an empty glyph) get inf.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return np.empty(0, np.float32)
+        if kerning is None:
+            kerning = self.resolver.batch(pairs, self.master_id)
+        table, ids = self._table(name for pair in pairs for name in pair)
+        return table.gaps([ids[left] for left, _ in pairs], [ids[right] for _, right in pairs], kerning)
+
+    def crashes(self, pairs):
+        """Crash for every pair closer than the margin, in the given order."""
+        pairs = list(pairs)
+        # Value and source pair of the applied kerning in one resolver pass
+        lookups = [self.resolver.lookup(self.master_id, left, right) for left, right in pairs]
+        kerning = [value for value, _, _ in lookups]
+        gaps = self.gaps(pairs, kerning)
+        found = []
+        for index in np.flatnonzero(gaps < self.margin):
+            left, right = pairs[index]
+            gap, value = float(gaps[index]), kerning[index]
+            _, left_key, right_key = lookups[index]
+            if left_key is None:
+                left_key, right_key = kerning_keys(self.snap.glyph(left), self.snap.glyph(right))
+            found.append(Crash(left, right, gap, value, value + math.ceil(self.margin - gap),
+                               left_key, right_key))
+        return found
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Find every kerning pair of a master whose glyphs collide or come too close.
+
+Glyphs are sorted into kerning keys the way KernAwaySelectedCrashes.py
+writes pairs (their group, or the glyph itself without one). Each key
+gets an envelope of its members' profiles: per height band the rightmost
+right edge (left side) or the leftmost left edge (right side), so one
+comparison per key pair measures its worst member pair. The gap matrix of
+all left × right keys, with the master's kerning applied, is split across
+a process pool:
+
+    crashes = crash_map(font, master.id, margin=0)     # [Crash], closest first
+    print(format_report(crashes))
+    font.newTab(tab_text(crashes))
+
+or from the shell:
+
+    python -m rolandhuse.crashmap Family.glyphs --master Regular --margin 5 --report crashes.txt
+
+Each reported crash names the member glyphs that come closest. Kerning
+exceptions are measured separately with the value they apply; where one
+covers the closest members of a key pair, that key pair's other member
+pairs are measured one by one.
+"""
+
+import argparse
+import concurrent.futures
+import math
+import os
+import time
+
+import numpy as np
+
+from rolandhuse.crashes import Crash, kerning_keys
+from rolandhuse.profiles import DEFAULT_PATH, ProfileCache, ProfileTable
+from rolandhuse.snapshot import snapshot
+
+
+def _gap_rows(left_envelopes, right_envelopes, kerning):
+    """(gaps, band of the closest approach) for a block of left keys × all right keys."""
+    distances = right_envelopes[None, :, :] - left_envelopes[:, None, :]
+    bands = distances.argmin(axis=2)
+    gaps = np.take_along_axis(distances, bands[:, :, None], axis=2)[:, :, 0]
+    return gaps + kerning, bands
+
+
+def _envelopes(values, key_of, key_count, worst):
+    """Per key and band the worst member value (np.max or np.min) and which member it is."""
+    order = np.argsort(key_of, kind="stable")
+    starts = np.searchsorted(key_of[order], np.arange(key_count))
+    ends = np.append(starts[1:], len(order))
+    envelopes = np.empty((key_count, values.shape[1]), np.float32)
+    members = np.empty((key_count, values.shape[1]), np.int64)
+    pick = np.argmax if worst is np.max else np.argmin
+    for key, (start, end) in enumerate(zip(starts, ends)):
+        rows = order[start:end]
+        best = pick(values[rows], axis=0)
+        members[key] = rows[best]
+        envelopes[key] = values[rows[best], np.arange(values.shape[1])]
+    return envelopes, members
+
+
+def gap_matrix(left_envelopes, right_envelopes, kerning, processes=None, rows_per_job=32):
+    """Gaps and closest bands of all left × right keys, blocks of rows in a process pool."""
+    blocks = [slice(start, start + rows_per_job) for start in range(0, len(left_envelopes), rows_per_job)]
+    jobs = [(left_envelopes[block], right_envelopes, kerning[block]) for block in blocks]
+    processes = min(processes or os.cpu_count() or 1, len(jobs))
+    if processes <= 1:
+        results = [_gap_rows(*job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(_gap_rows, *zip(*jobs)))
+    if not results:
+        return np.empty((0, len(right_envelopes)), np.float32), np.empty((0, len(right_envelopes)), np.int64)
+    return np.concatenate([gaps for gaps, _ in results]), np.concatenate([bands for _, bands in results])
+
+
+def _covered(exceptions, glyph_ids, left_rows, right_rows, left_ids, right_ids):
+    """(sorted glyph pair codes, index of the exception applying to each) for exception pairs.
+
+    A pair of glyph rows i, j has the code i * len(glyph_ids) + j. Glyph–glyph
+    pairs win over glyph–group pairs, which win over group–glyph pairs, like
+    in Glyphs.
+    """
+    count = len(glyph_ids)
+    # Per level: (exception index, left glyph rows, right glyph rows) with one side a single glyph
+    found = ([], [], [])
+    for index, (left, right, _) in enumerate(exceptions):
+        if left in glyph_ids and right in glyph_ids:
+            found[0].append((index, glyph_ids[left], glyph_ids[right]))
+        elif left in glyph_ids and right in right_ids:
+            found[1].append((index, glyph_ids[left], right_rows[right_ids[right]]))
+        elif left in left_ids and right in glyph_ids:
+            found[2].append((index, left_rows[left_ids[left]], glyph_ids[right]))
+    codes, entries, levels = [], [], []
+    for level, items in enumerate(found):
+        if not items:
+            continue
+        indices, lefts, rights = zip(*items)
+        sizes = [np.size(side) for side in (rights if level == 1 else lefts)]
+        if level == 1:
+            lefts, rights = np.repeat(lefts, sizes), np.concatenate(rights)
+        elif level == 2:
+            lefts, rights = np.concatenate(lefts), np.repeat(rights, sizes)
+        codes.append(np.asarray(lefts, np.int64) * count + np.asarray(rights, np.int64))
+        entries.append(np.repeat(indices, sizes))
+        levels.append(np.full(len(codes[-1]), level, np.int8))
+    if not codes:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    codes, entries, levels = np.concatenate(codes), np.concatenate(entries), np.concatenate(levels)
+    order = np.lexsort((levels, codes))
+    codes, entries = codes[order], entries[order]
+    first = np.ones(len(codes), bool)
+    first[1:] = codes[1:] != codes[:-1]
+    return codes[first], entries[first]
+
+
+def crash_map(font, master_id, margin=0, processes=None, profiles=None):
+    """Crashes closer than `margin` between all kerning keys of a master, closest first."""
+    snap = snapshot(font)
+    profiles = profiles or ProfileCache(font)
+
+    # Glyphs with outlines, and the keys a pair between them is written to
+    glyphs, glyph_profiles = [], []
+    for name in snap.order:
+        profile = profiles.get(name, master_id)
+        if profile is not None and not profile.empty:
+            glyphs.append(snap.glyph(name))
+            glyph_profiles.append(profile)
+    if not glyphs:
+        return []
+    table = ProfileTable(glyph_profiles)
+    names = [glyph.name for glyph in glyphs]
+    glyph_ids = {name: index for index, name in enumerate(names)}
+    count = len(names)
+    left_ids, right_ids = {}, {}
+    left_of, right_of = [], []
+    for glyph in glyphs:
+        left_key, right_key = kerning_keys(glyph, glyph)
+        left_of.append(left_ids.setdefault(left_key, len(left_ids)))
+        right_of.append(right_ids.setdefault(right_key, len(right_ids)))
+    left_of, right_of = np.array(left_of), np.array(right_of)
+    left_rows = [np.flatnonzero(left_of == key) for key in range(len(left_ids))]
+    right_rows = [np.flatnonzero(right_of == key) for key in range(len(right_ids))]
+    left_envelopes, left_members = _envelopes(table.right - table.widths[:, None], left_of, len(left_ids), np.max)
+    right_envelopes, right_members = _envelopes(table.left, right_of, len(right_ids), np.min)
+
+    # Kerning between keys; pairs involving other keys are exceptions. Glyph
+    # keys in font.kerning are glyph ids, everything here uses names
+    kerning = np.zeros((len(left_ids), len(right_ids)), np.float32)
+    exceptions = []
+    for left, row in (font.kerning.get(master_id) or {}).items():
+        left = snap.key_name(left)
+        for right, value in row.items():
+            right = snap.key_name(right)
+            if left in left_ids and right in right_ids:
+                kerning[left_ids[left], right_ids[right]] = value
+            else:
+                exceptions.append((left, right, value))
+    covered, covered_by = _covered(exceptions, glyph_ids, left_rows, right_rows, left_ids, right_ids)
+
+    def is_covered(codes):
+        if not len(covered):
+            return np.zeros(len(codes), bool)
+        return covered[np.minimum(np.searchsorted(covered, codes), len(covered) - 1)] == codes
+
+    gaps, bands = gap_matrix(left_envelopes, right_envelopes, kerning, processes)
+    left_keys, right_keys = list(left_ids), list(right_ids)
+    rows, columns = np.nonzero(gaps < margin)
+    closest = bands[rows, columns]
+    lefts, rights = left_members[rows, closest], right_members[columns, closest]
+    redo = is_covered(lefts * count + rights)
+    found = {}
+    for i, j, left, right, gap, value in zip(rows[~redo].tolist(), columns[~redo].tolist(),
+                                              lefts[~redo].tolist(), rights[~redo].tolist(),
+                                              gaps[rows[~redo], columns[~redo]].tolist(),
+                                              kerning[rows[~redo], columns[~redo]].tolist()):
+        found[(left_keys[i], right_keys[j])] = Crash(
+            names[left], names[right], gap, value, value + math.ceil(margin - gap), left_keys[i], right_keys[j])
+    # An exception applies to the closest two glyphs: measure the key pair's other member pairs
+    left_sides = table.right - table.widths[:, None]
+    for i, j in zip(rows[redo].tolist(), columns[redo].tolist()):
+        member_lefts, member_rights = left_rows[i], right_rows[j]
+        member_gaps = (table.left[member_rights][None, :, :] - left_sides[member_lefts][:, None, :]).min(axis=2)
+        member_gaps[is_covered(np.add.outer(member_lefts * count, member_rights).ravel()).reshape(member_gaps.shape)] = np.inf
+        value = float(kerning[i, j])
+        left, right = np.unravel_index(member_gaps.argmin(), member_gaps.shape)
+        gap = float(member_gaps[left, right]) + value
+        if gap < margin:
+            found[(left_keys[i], right_keys[j])] = Crash(
+                names[member_lefts[left]], names[member_rights[right]], gap, value,
+                value + math.ceil(margin - gap), left_keys[i], right_keys[j])
+
+    # Exceptions: the glyph pairs they apply to, with their own value; the closest per exception
+    if len(covered):
+        values = np.array([value for _, _, value in exceptions], np.float32)
+        exception_gaps = table.gaps(covered // count, covered % count, values[covered_by])
+        crashing = np.flatnonzero(exception_gaps < margin)
+        crashing = crashing[np.argsort(exception_gaps[crashing], kind="stable")]
+        _, first = np.unique(covered_by[crashing], return_index=True)
+        for index in crashing[first].tolist():
+            left_key, right_key, value = exceptions[covered_by[index]]
+            gap = float(exception_gaps[index])
+            left, right = divmod(int(covered[index]), count)
+            found[(left_key, right_key)] = Crash(
+                names[left], names[right], gap, value, value + math.ceil(margin - gap), left_key, right_key)
+    return sorted(found.values(), key=lambda crash: (crash.gap, crash.left_key, crash.right_key))
+
+
+def format_report(crashes):
+    lines = [f"{'gap':>7}  {'left key':<24} {'right key':<24} glyphs  (kerning → needed)"]
+    for crash in crashes:
+        lines.append(f"{crash.gap:7.0f}  {crash.left_key:<24} {crash.right_key:<24} "
+                     f"{crash.left} {crash.right}  ({crash.kerning:g} → {crash.value:g})")
+    return "\n".join(lines)
+
+
+def tab_text(crashes):
+    """Edit-tab text with the closest glyph pair of every crash."""
+    return "  ".join(f"/{crash.left}/{crash.right}" for crash in crashes)
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("font", help=".glyphs file")
+    parser.add_argument("--master", help="master name (default: all masters)")
+    parser.add_argument("--margin", type=float, default=0, help="report pairs closer than this (default 0: overlaps)")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--report", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    font = GSFont(args.font)
+    masters = [master for master in font.masters if args.master in (None, master.name)]
+    if not masters:
+        parser.error(f"no master named {args.master}")
+    profiles = ProfileCache(font, path=DEFAULT_PATH)
+    sections = []
+    for master in masters:
+        start = time.perf_counter()
+        crashes = crash_map(font, master.id, args.margin, args.jobs, profiles)
+        print(f"▶ {master.name}: {len(crashes)} crash(es) in {time.perf_counter() - start:.2f}s")
+        if crashes:
+            sections.append(f"# {master.name}\n{format_report(crashes)}\n\n# tab\n{tab_text(crashes)}\n")
+    profiles.save()
+    text = "\n".join(sections)
+    print(text)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(text)
+        print(f"💾 Saved {args.report}")
+
+
+if __name__ == "__main__":
+    main()
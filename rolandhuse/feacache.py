@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Compile Font Info features with fontTools' feaLib to catch errors early.
+
+Each feature is compiled on its own, together with the feature prefixes,
+the classes it uses and the features defining lookups it references. The
+result is cached under a hash of exactly that code plus which of the glyphs
+it names exist, so a feature is only recompiled when something it depends
+on changed; with a cache file, other fonts of the family reuse it too:
+
+    cache = FeatureCache(DEFAULT_PATH)
+    results = cache.check(font, ["calt", "liga"])   # {tag: FeatureResult}
+    cache.save()
+
+    validate(font, ["calt"])    # the same, printed; what the builders call
+
+or from the shell:
+
+    python -m rolandhuse.feacache Family-*.glyphs
+"""
+
+import argparse
+import collections
+import hashlib
+import json
+import os
+import re
+
+try:
+    from fontTools import version as FONTTOOLS_VERSION
+    from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+    from fontTools.feaLib.error import FeatureLibError
+    from fontTools.ttLib import TTFont
+except ImportError:  # validation is skipped without fontTools
+    TTFont = None
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "rolandhuse", "features.json")
+MAX_ENTRIES = 5000  # least recently used results are dropped beyond this
+
+FeatureResult = collections.namedtuple("FeatureResult", "tag ok message lookups cached")
+
+_CLASS_REF = re.compile(r"@([A-Za-z0-9_.\-]+)")
+_LOOKUP_REF = re.compile(r"\blookup\s+([A-Za-z0-9_.\-]+)\s*;")
+_LOOKUP_DEF = re.compile(r"\blookup\s+([A-Za-z0-9_.\-]+)\s*(?:useExtension\s*)?\{")
+_WORD = re.compile(r"[^\s{}\[\];=',#@\\]+")
+_LOCATION = re.compile(r"<features>:(\d+):(\d+)")
+
+
+def _active(items):
+    return [item for item in items if getattr(item, "active", True)]
+
+
+class FeatureCache(object):
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                pass    # unreadable or cut off: start with an empty cache
+            if not isinstance(self.entries, dict):
+                self.entries = {}
+        self.compiled = 0       # features compiled (not from the cache) since creation
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        keys = list(self.entries)[-MAX_ENTRIES:]
+        # Write next to the cache and swap it in, so a crash never leaves half a file
+        temp = self.path + ".tmp"
+        with open(temp, "w") as f:
+            json.dump({key: self.entries[key] for key in keys}, f)
+        os.replace(temp, self.path)
+
+    def _source(self, font, tag):
+        """(feature file text, line where the feature's own code starts)."""
+        features = {item.name: item.code for item in _active(font.features)}
+        classes = {item.name: item.code for item in _active(font.classes)}
+        code = features[tag]
+
+        # Features defining lookups this one references
+        defined_here = set(_LOOKUP_DEF.findall(code))
+        owners = {}
+        for other, other_code in features.items():
+            for name in _LOOKUP_DEF.findall(other_code):
+                owners.setdefault(name, other)
+        borrowed = []
+        for name in _LOOKUP_REF.findall(code):
+            owner = owners.get(name)
+            if name not in defined_here and owner and owner != tag and owner not in borrowed:
+                borrowed.append(owner)
+
+        blocks = [item.code for item in _active(font.featurePrefixes)]
+        blocks += [f"feature {other} {{\n{features[other]}\n}} {other};" for other in borrowed]
+        # Classes used anywhere above, and the classes those use
+        wanted, pending = [], _CLASS_REF.findall("\n".join(blocks + [code]))
+        while pending:
+            name = pending.pop()
+            if name in classes and name not in wanted:
+                wanted.append(name)
+                pending += _CLASS_REF.findall(classes[name])
+        ordered = [f"@{name} = [{classes[name]}];" for name in classes if name in wanted]
+        header = "\n".join(ordered + blocks + [f"feature {tag} {{"])
+        return f"{header}\n{code}\n}} {tag};\n", header.count("\n") + 2
+
+    def _key(self, tag, source, glyph_names):
+        present = sorted(set(_WORD.findall(source)) & glyph_names)
+        digest = hashlib.sha1(f"{FONTTOOLS_VERSION}\0{tag}\0{source}\0".encode("utf-8"))
+        digest.update("\n".join(present).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _compile(self, tag, source, first_line, glyph_order):
+        tt = TTFont()
+        tt.setGlyphOrder(glyph_order)
+        try:
+            addOpenTypeFeaturesFromString(tt, source, tables={"GSUB", "GPOS"})
+        except FeatureLibError as error:
+            message = _LOCATION.sub(
+                lambda m: (f"{tag} line {int(m.group(1)) - first_line + 1}" if int(m.group(1)) >= first_line
+                           else f"line {m.group(1)} of its prefixes/classes") + f":{m.group(2)}",
+                str(error))
+            return {"ok": False, "message": message, "lookups": 0}
+        lookups = sum(len(tt[table].table.LookupList.Lookup) for table in ("GSUB", "GPOS")
+                      if table in tt and tt[table].table.LookupList)
+        return {"ok": True, "message": "", "lookups": lookups}
+
+    def check(self, font, tags=None):
+        """{tag: FeatureResult} for the given active features (all if None)."""
+        if TTFont is None:
+            raise RuntimeError("fontTools is needed to compile features")
+        glyph_order = [".notdef"] + [glyph.name for glyph in font.glyphs if glyph.name != ".notdef"]
+        glyph_names = frozenset(glyph_order)
+        active = [item.name for item in _active(font.features)]
+        results = {}
+        for tag in (tags if tags is not None else active):
+            if tag not in active:
+                continue
+            source, first_line = self._source(font, tag)
+            key = self._key(tag, source, glyph_names)
+            entry = self.entries.pop(key, None)   # re-inserted last: most recently used
+            cached = entry is not None
+            if cached:
+                self.entries[key] = entry
+            else:
+                entry = self.entries[key] = self._compile(tag, source, first_line, glyph_order)
+                self.compiled += 1
+            results[tag] = FeatureResult(tag, entry["ok"], entry["message"], entry["lookups"], cached)
+        return results
+
+
+def print_results(results):
+    for result in results.values():
+        source = " (cached)" if result.cached else ""
+        if result.ok:
+            print(f"  ✅ {result.tag}: compiles, {result.lookups} lookups{source}")
+        else:
+            print(f"  ❌ {result.tag}: {result.message}{source}")
+
+
+def validate(font, tags=None, path=None):
+    """Compile the features, print the results and update the cache file (DEFAULT_PATH if None).
+
+    Returns the results, or None if fontTools is not installed.
+    """
+    if TTFont is None:
+        print("ℹ️ fontTools is not installed, features were not validated.")
+        return None
+    cache = FeatureCache(path or DEFAULT_PATH)
+    results = cache.check(font, tags)
+    print("Feature check:")
+    print_results(results)
+    cache.save()
+    return results
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="+", help=".glyphs files")
+    parser.add_argument("--features", nargs="+", help="feature tags to check (default: all)")
+    parser.add_argument("--cache", default=DEFAULT_PATH, help=f"cache file (default {DEFAULT_PATH})")
+    parser.add_argument("--no-cache", action="store_true", help="compile everything, keep no cache file")
+    args = parser.parse_args(argv)
+
+    cache = FeatureCache(None if args.no_cache else args.cache)
+    failed = 0
+    for path in args.fonts:
+        font = GSFont(path)
+        print(f"▶ {path}")
+        results = cache.check(font, args.features)
+        print_results(results)
+        failed += sum(not result.ok for result in results.values())
+    cache.save()
+    print(f"{cache.compiled} feature(s) compiled, the rest from the cache.")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Look up and upsert Font Info classes, features and feature prefixes by name.
+
+The font's lists are indexed once; changes are queued and written in one
+go by commit(), with the interface updates switched off:
+
+    index = FeatureIndex(font)
+    index.set_class("AllBase", "a b c")          # True if the code changes
+    code = index.feature_code("ss01")            # None if there is no ss01
+    index.set_feature("ss01", (code or "") + "\\nsub a by a.ss01;")
+    index.commit()
+
+or as a context manager, which commits when the block ends without error:
+
+    with FeatureIndex(font) as index:
+        index.set_prefix("Languagesystems", "languagesystem DFLT dflt;")
+
+With dry_run=True, commit() prints a unified diff of the queued changes
+(classes one glyph per line) and the rule or glyph counts before and after
+instead of touching the font; diff() and summary() give the same without
+printing.
+"""
+
+import difflib
+import re
+
+# Font attribute → GlyphsApp class for new entries
+KINDS = {
+    "classes": "GSClass",
+    "features": "GSFeature",
+    "featurePrefixes": "GSFeaturePrefix",
+}
+
+_RULE = re.compile(r"\b(?:sub|substitute|pos|position)\b")
+
+
+def count_rules(code):
+    """Substitution and positioning rules in feature code (comments ignored)."""
+    return len(_RULE.findall(re.sub(r"#[^\n]*", "", code or "")))
+
+
+def _diff_lines(kind, code):
+    """Classes diff by member, everything else by line."""
+    return (code or "").split() if kind == "classes" else (code or "").splitlines()
+
+
+class FeatureIndex(object):
+
+    def __init__(self, font, dry_run=False):
+        self.font = font
+        self.dry_run = dry_run
+        self._items = {kind: {item.name: item for item in getattr(font, kind)} for kind in KINDS}
+        self._pending = {kind: {} for kind in KINDS}   # kind → {name: code}, in queue order
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+    # ── reading ──
+
+    def _code(self, kind, name):
+        pending = self._pending[kind]
+        if name in pending:
+            return pending[name]
+        item = self._items[kind].get(name)
+        return item.code if item is not None else None
+
+    def class_code(self, name):
+        """Code of a class, including queued changes; None if there is no such class."""
+        return self._code("classes", name)
+
+    def feature_code(self, tag):
+        """Code of a feature, including queued changes; None if there is no such feature."""
+        return self._code("features", tag)
+
+    def prefix_code(self, name):
+        """Code of a feature prefix, including queued changes; None if there is none."""
+        return self._code("featurePrefixes", name)
+
+    # ── writing ──
+
+    def _set(self, kind, name, code):
+        if self._code(kind, name) == code:
+            return False
+        self._pending[kind][name] = code
+        return True
+
+    def set_class(self, name, code):
+        """Queue a class's code. Returns False if it already has that code."""
+        return self._set("classes", name, code)
+
+    def set_feature(self, tag, code):
+        """Queue a feature's code. Returns False if it already has that code."""
+        return self._set("features", tag, code)
+
+    def set_prefix(self, name, code):
+        """Queue a feature prefix's code. Returns False if it already has that code."""
+        return self._set("featurePrefixes", name, code)
+
+    @property
+    def pending(self):
+        """Number of queued changes."""
+        return sum(len(pending) for pending in self._pending.values())
+
+    def summary(self):
+        """[(kind, name, old code or None, new code)] for the queued changes."""
+        return [(kind, name, self._items[kind][name].code if name in self._items[kind] else None, code)
+                for kind, pending in self._pending.items() for name, code in pending.items()]
+
+    def diff(self, context=3):
+        """Unified diff of the queued changes, one file per class/feature/prefix."""
+        lines = []
+        for kind, name, old, new in self.summary():
+            lines += difflib.unified_diff(
+                _diff_lines(kind, old), _diff_lines(kind, new),
+                f"a/{kind}/{name}" if old is not None else "/dev/null", f"b/{kind}/{name}",
+                n=context, lineterm="")
+        return "\n".join(lines)
+
+    def report(self):
+        """Print diff() and a line per change with its rule counts."""
+        changes = self.summary()
+        if not changes:
+            print("Font Info is up to date, nothing would change.")
+            return
+        print(self.diff())
+        print(f"\n{len(changes)} change(s) (dry run, font not modified):")
+        for kind, name, old, new in changes:
+            state = "new" if old is None else "changed"
+            if kind == "classes":
+                print(f"  {kind}/{name}: {state}, glyphs {len(_diff_lines(kind, old))} → {len(_diff_lines(kind, new))}")
+            else:
+                before = count_rules(old) if old is not None else 0
+                print(f"  {kind}/{name}: {state}, rules {before} → {count_rules(new)}")
+
+    def commit(self):
+        """Write all queued changes; new entries go at the end of their list.
+
+        In dry-run mode the changes are reported and stay queued.
+        """
+        if self.dry_run:
+            self.report()
+            return self.pending
+        if not self.pending:
+            return 0
+        import GlyphsApp
+
+        count = self.pending
+        self.font.disableUpdateInterface()
+        try:
+            for kind, pending in self._pending.items():
+                items, collection = self._items[kind], getattr(self.font, kind)
+                for name, code in pending.items():
+                    item = items.get(name)
+                    if item is None:
+                        item = items[name] = getattr(GlyphsApp, KINDS[kind])()
+                        item.name = name
+                        item.code = code
+                        collection.append(item)
+                    else:
+                        item.code = code
+                pending.clear()
+        finally:
+            self.font.enableUpdateInterface()
+        return count
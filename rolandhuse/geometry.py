@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Outline geometry for headless layers: segments, exact bounds, transforms.
+
+Works on anything with the GSPath/GSNode interface (nodes with x, y, type).
+"""
+
+import math
+
+LINE = "line"
+CURVE = "curve"
+OFFCURVE = "offcurve"
+QCURVE = "qcurve"
+
+IDENTITY = (1, 0, 0, 1, 0, 0)
+
+
+class Rect(object):
+    """NSRect look-alike: rect.origin.x, rect.size.width, …"""
+
+    class _Pair(object):
+        __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x=0, y=0, width=0, height=0):
+        self.origin = Rect._Pair()
+        self.origin.x, self.origin.y = x, y
+        self.size = Rect._Pair()
+        self.size.width, self.size.height = width, height
+
+    @property
+    def minX(self):
+        return self.origin.x
+
+    @property
+    def maxX(self):
+        return self.origin.x + self.size.width
+
+    @property
+    def minY(self):
+        return self.origin.y
+
+    @property
+    def maxY(self):
+        return self.origin.y + self.size.height
+
+    def __iter__(self):
+        return iter(((self.origin.x, self.origin.y), (self.size.width, self.size.height)))
+
+    def __repr__(self):
+        return f"<Rect x={self.origin.x} y={self.origin.y} w={self.size.width} h={self.size.height}>"
+
+
+def multiply(first, second):
+    """Affine product: apply `first`, then `second`."""
+    a1, b1, c1, d1, x1, y1 = first
+    a2, b2, c2, d2, x2, y2 = second
+    return (
+        a1 * a2 + b1 * c2, a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+        x1 * a2 + y1 * c2 + x2, x1 * b2 + y1 * d2 + y2,
+    )
+
+
+def apply(transform, x, y):
+    a, b, c, d, dx, dy = transform
+    return (a * x + c * y + dx, b * x + d * y + dy)
+
+
+def segments(nodes, closed=True):
+    """Yield the segments of a node list as tuples of points.
+
+    Lines are 2 points, cubic curves 4, quadratic curves 3. Points are (x, y).
+    """
+    count = len(nodes)
+    if count < 2:
+        return
+    # Start at an on-curve node so every segment ends on one
+    start = next((index for index, node in enumerate(nodes) if node.type != OFFCURVE), None)
+    if start is None:
+        return
+    points = [(node.x, node.y) for node in nodes]
+    order = list(range(start + 1, count)) + list(range(0, start + 1)) if closed else list(range(start + 1, count))
+    previous = points[start]
+    pending = []
+    for index in order:
+        node = nodes[index]
+        if node.type == OFFCURVE:
+            pending.append(points[index])
+            continue
+        if node.type == LINE or not pending:
+            yield (previous, points[index])
+        elif node.type == QCURVE or len(pending) == 1:
+            # Implied on-curve points between consecutive quadratic handles
+            for first, second in zip(pending, pending[1:]):
+                middle = ((first[0] + second[0]) / 2, (first[1] + second[1]) / 2)
+                yield (previous, first, middle)
+                previous = middle
+            yield (previous, pending[-1], points[index])
+        else:
+            yield (previous, pending[0], pending[-1], points[index])
+        previous = points[index]
+        pending = []
+
+
+def _cubic_roots_of_derivative(p0, p1, p2, p3):
+    """Parameters in (0, 1) where the cubic's derivative is zero (one axis)."""
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    if abs(a) < 1e-12:
+        return [-c / b] if abs(b) > 1e-12 and 0 < -c / b < 1 else []
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return []
+    root = math.sqrt(disc)
+    return [t for t in ((-b + root) / (2 * a), (-b - root) / (2 * a)) if 0 < t < 1]
+
+
+def point_on_segment(segment, t):
+    if len(segment) == 2:
+        (x0, y0), (x1, y1) = segment
+        return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+    if len(segment) == 3:
+        (x0, y0), (x1, y1), (x2, y2) = segment
+        u = 1 - t
+        return (u * u * x0 + 2 * u * t * x1 + t * t * x2,
+                u * u * y0 + 2 * u * t * y1 + t * t * y2)
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = segment
+    u = 1 - t
+    return (u ** 3 * x0 + 3 * u * u * t * x1 + 3 * u * t * t * x2 + t ** 3 * x3,
+            u ** 3 * y0 + 3 * u * u * t * y1 + 3 * u * t * t * y2 + t ** 3 * y3)
+
+
+def segment_extremes(segment):
+    """Points of a segment that can lie on its bounding box."""
+    points = [segment[0], segment[-1]]
+    if len(segment) == 3:
+        segment = (segment[0],
+                   tuple(segment[0][i] + 2 / 3 * (segment[1][i] - segment[0][i]) for i in (0, 1)),
+                   tuple(segment[2][i] + 2 / 3 * (segment[1][i] - segment[2][i]) for i in (0, 1)),
+                   segment[2])
+    if len(segment) == 4:
+        for axis in (0, 1):
+            for t in _cubic_roots_of_derivative(*(point[axis] for point in segment)):
+                points.append(point_on_segment(segment, t))
+    return points
+
+
+def bounds_of_points(points):
+    """(minX, minY, maxX, maxY) or None for no points."""
+    points = list(points)
+    if not points:
+        return None
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def transformed(nodes, transform):
+    """Nodes with their positions transformed (the same list for IDENTITY)."""
+    if transform == IDENTITY:
+        return nodes
+    return [_TransformedNode(node, transform) for node in nodes]
+
+
+def path_bounds(path, transform=IDENTITY):
+    """Exact (minX, minY, maxX, maxY) of a path, or None if it is empty."""
+    points = []
+    nodes = transformed(path.nodes, transform)
+    for segment in segments(nodes, path.closed):
+        points.extend(segment_extremes(segment))
+    if not points:
+        points = [(node.x, node.y) for node in nodes]
+    return bounds_of_points(points)
+
+
+def union(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return (min(first[0], second[0]), min(first[1], second[1]),
+            max(first[2], second[2]), max(first[3], second[3]))
+
+
+class _TransformedNode(object):
+    __slots__ = ("x", "y", "type")
+
+    def __init__(self, node, transform):
+        self.x, self.y = apply(transform, node.x, node.y)
+        self.type = node.type
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Find glyph and class names in feature code that the font does not have.
+
+Every class, feature prefix and feature is tokenized once; tokens are told
+apart by their place in the statement (keywords, lookup and feature names,
+script tags, numbers, anchors and tables other than GDEF are not glyphs)
+and looked up in a set of the font's glyph and class names:
+
+    for ref in check_font(font):
+        print(ref.source, ref.line, ref.name, ref.suggestion)
+
+    report(font, ["liga", "rtlm"])      # only these features, the prefixes and classes they use
+    scan("sub a by b.ss01;", names)     # a snippet against a set of glyph names
+
+Names that differ from an existing glyph only by - _ . or case get a
+suggestion (ten-rovas → ten.rovas). From the shell:
+
+    python -m rolandhuse.glyphrefs Family-*.glyphs
+"""
+
+import argparse
+import collections
+import re
+
+UnknownReference = collections.namedtuple("UnknownReference", "source line column name kind suggestion")
+
+_TOKEN = re.compile(r"""
+    (?P<newline>\n)
+  | [ \t\r]+
+  | \#[^\n]*
+  | "(?P<string>[^"]*)"
+  | \$\[[^\]]*\]
+  | (?P<punct>[{}\[\];=',<>()])
+  | (?P<word>[^\s{}\[\];=',<>()"\#]+)
+""", re.X)
+_NUMBER = re.compile(r"-?(?:0x[0-9A-Fa-f]+|\d+(?:\.\d+)?)$")
+
+KEYWORDS = frozenset("""
+    sub substitute rsub reversesub ignore by from pos position enum enumerate lookup lookupflag
+    feature script language languagesystem table subtable useExtension NULL anchor anchorDef
+    markClass mark base ligature ligComponent cursive valueRecordDef device contourpoint
+    include exclude_dflt include_dflt required excludeDFLT includeDFLT RightToLeft IgnoreBaseGlyphs
+    IgnoreLigatures IgnoreMarks MarkAttachmentType UseMarkFilteringSet parameters sizemenuname
+    featureNames cvParameters FeatUILabelNameID FeatUITooltipTextNameID SampleTextNameID
+    ParamUILabelNameID Character name nameid GlyphClassDef Attach LigatureCaretByPos LigatureCaretByIndex
+""".split())
+# Statements whose words are never glyphs (only @classes are checked); anchorDef and
+# valueRecordDef end in the name they define
+_SKIP_WORDS = frozenset(("lookup", "feature", "script", "language", "languagesystem", "lookupflag",
+                         "include", "subtable", "parameters", "sizemenuname", "name", "nameid",
+                         "anchorDef", "valueRecordDef",
+                         "Character", "FeatUILabelNameID", "FeatUITooltipTextNameID",
+                         "SampleTextNameID", "ParamUILabelNameID"))
+
+
+def _normalized(name):
+    return re.sub(r"[-_.]", ".", name).lower()
+
+
+class GlyphIndex(object):
+    """Glyph and class names of a font, for lookups and suggestions."""
+
+    def __init__(self, glyph_names, class_names=()):
+        self.glyphs = frozenset(glyph_names)
+        self.classes = set(class_names)
+        self._similar = None
+
+    @classmethod
+    def from_font(cls, font):
+        return cls((glyph.name for glyph in font.glyphs), (item.name for item in font.classes))
+
+    def suggest(self, name):
+        if self._similar is None:
+            self._similar = {}
+            for glyph in self.glyphs:
+                self._similar.setdefault(_normalized(glyph), glyph)
+        return self._similar.get(_normalized(name))
+
+
+def _tokens(code):
+    """(kind, text, line, column) for the tokens of some feature code."""
+    line, line_start = 1, 0
+    for match in _TOKEN.finditer(code):
+        if match.group("newline"):
+            line, line_start = line + 1, match.end()
+        elif match.group("punct"):
+            yield "punct", match.group("punct"), line, match.start() - line_start + 1
+        elif match.group("word"):
+            yield "word", match.group("word"), line, match.start() - line_start + 1
+        elif match.group("string") is not None and "\n" in match.group(0):
+            line += match.group(0).count("\n")
+            line_start = match.start() + match.group(0).rindex("\n") + 1
+
+
+def _references(code):
+    """(kind, name, line, column) of class and glyph references, kind "define" for @X = [...].
+
+    Hyphenated words inside [ ] come as kind "range", as a-z may be a range there.
+    """
+    tokens = list(_tokens(code))
+    blocks = [True]         # open { } blocks: whether plain words in them are glyph names
+    statement = []          # words of the current statement
+    depth = 0               # inside < > or ( )
+    bracket = False         # inside a [ ] class literal
+    for index, (kind, text, line, column) in enumerate(tokens):
+        following = tokens[index + 1][1] if index + 1 < len(tokens) else None
+        if kind == "punct":
+            if text in "<(":
+                depth += 1
+            elif text in ">)":
+                depth = max(0, depth - 1)
+            elif text == "{":
+                glyphs = blocks[-1]
+                if statement and statement[0] in ("table", "conditionset"):
+                    glyphs = statement[0] == "table" and statement[1:2] == ["GDEF"]
+                blocks.append(glyphs)
+                statement = []
+            elif text == "}":
+                if len(blocks) > 1:
+                    blocks.pop()
+                statement = ["}"]       # the block's closing label follows
+            elif text == ";":
+                statement = []
+            elif text in "[]":
+                bracket = text == "["
+            continue
+        if depth:
+            continue
+        statement.append(text)
+        if text.startswith("@"):
+            if following == "=" or (statement[0] == "markClass" and following == ";"):
+                yield "define", text[1:], line, column
+            else:
+                yield "class", text[1:], line, column
+        elif (statement[0] in _SKIP_WORDS or statement[0] in ("}", "table", "conditionset")
+              or (len(statement) > 1 and statement[-2] == "lookup")
+              or text in KEYWORDS or text.startswith("$") or _NUMBER.match(text) or not blocks[-1]):
+            continue
+        elif bracket and "-" in text:
+            if text != "-":     # [a - z]
+                yield "range", text.lstrip("\\"), line, column
+        else:
+            yield "glyph", text.lstrip("\\"), line, column
+
+
+def _resolve(refs, index, source, defined):
+    unknown = []
+    for kind, name, line, column in refs:
+        if kind in ("glyph", "range"):
+            if name in index.glyphs:
+                continue
+            if kind == "range" and all(part in index.glyphs for part in name.split("-", 1)):
+                continue    # a glyph range like [a-z]
+            unknown.append(UnknownReference(source, line, column, name, "glyph", index.suggest(name)))
+        elif kind == "class" and name not in index.classes and name not in defined:
+            unknown.append(UnknownReference(source, line, column, "@" + name, kind, None))
+    return unknown
+
+
+def scan(code, glyph_names, class_names=(), source=""):
+    """Unknown references in a piece of feature code."""
+    index = glyph_names if isinstance(glyph_names, GlyphIndex) else GlyphIndex(glyph_names, class_names)
+    refs = list(_references(code))
+    defined = {name for kind, name, _, _ in refs if kind == "define"}
+    return _resolve(refs, index, source, defined)
+
+
+def check_font(font, features=None, index=None):
+    """Unknown references in the font's classes, prefixes and features.
+
+    With a list of feature tags, only those features, the prefixes and the
+    classes they use.
+    """
+    index = index or GlyphIndex.from_font(font)
+    classes = {item.name: item.code for item in font.classes}
+    sources = []
+    if features is None:
+        sources += [(f"classes/{name}", code) for name, code in classes.items()]
+    sources += [(f"prefixes/{item.name}", item.code) for item in font.featurePrefixes]
+    sources += [(f"features/{item.name}", item.code) for item in font.features
+                if features is None or item.name in features]
+
+    parsed = [(source, list(_references(code))) for source, code in sources]
+    defined = {name for _, refs in parsed for kind, name, _, _ in refs if kind == "define"}
+    unknown = []
+    for source, refs in parsed:
+        unknown += _resolve(refs, index, source, defined)
+
+    if features is not None:
+        # Classes the features use, and the classes those use
+        pending = [name for _, refs in parsed for kind, name, _, _ in refs if kind == "class"]
+        seen = set()
+        while pending:
+            name = pending.pop()
+            if name in seen or name not in classes:
+                continue
+            seen.add(name)
+            refs = list(_references(classes[name]))
+            unknown += _resolve(refs, index, f"classes/{name}", defined)
+            pending += [each for kind, each, _, _ in refs if kind == "class"]
+    return unknown
+
+
+def report(font, features=None):
+    """Print unknown references (or that there are none) and return them."""
+    unknown = check_font(font, features)
+    print_references(unknown)
+    return unknown
+
+
+def print_references(unknown):
+    if not unknown:
+        print("✅ All glyph and class names in the feature code exist.")
+        return
+    print(f"⚠️ {len(unknown)} unknown names in the feature code:")
+    for ref in unknown:
+        hint = f" (did you mean {ref.suggestion}?)" if ref.suggestion else ""
+        print(f"  {ref.source} line {ref.line}:{ref.column}: {ref.kind} {ref.name}{hint}")
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="+", help=".glyphs files")
+    parser.add_argument("--features", nargs="+", help="feature tags to check (default: everything)")
+    args = parser.parse_args(argv)
+
+    found = 0
+    for path in args.fonts:
+        print(f"▶ {path}")
+        unknown = check_font(GSFont(path), args.features)
+        print_references(unknown)
+        found += len(unknown)
+    if found:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
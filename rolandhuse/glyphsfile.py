@@ -0,0 +1,1484 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Headless .glyphs file model with the GSFont/GSGlyph/GSLayer interface the
+scripts use in the Macro Panel.
+
+    from rolandhuse.glyphsfile import GSFont
+    font = GSFont("Family.glyphs")
+    font.setKerningForPair(font.masters[0].id, "@MMK_L_A", "@MMK_R_V", -40)
+    font.save()
+
+Glyph layers and their shapes stay undecoded until a script touches them, so
+kerning-only or feature-only jobs never parse outlines. Everything the model
+does not know about is kept as-is and written back unchanged.
+"""
+
+import copy
+import math
+import os
+import re
+import uuid
+from collections import namedtuple
+
+from rolandhuse import geometry, plist
+from rolandhuse.glyphsindex import GlyphsFileIndex
+
+LINE = "line"
+CURVE = "curve"
+OFFCURVE = "offcurve"
+QCURVE = "qcurve"
+
+_NODE_TYPES = {"l": LINE, "c": CURVE, "o": OFFCURVE, "q": QCURVE}
+_NODE_CODES = {value: key for key, value in _NODE_TYPES.items()}
+_G2_NODE_TYPES = {"LINE": LINE, "CURVE": CURVE, "OFFCURVE": OFFCURVE, "QCURVE": QCURVE}
+
+# Values that are decoded only when a script asks for them
+LAZY_KEYS = frozenset(("layers", "shapes", "paths", "components"))
+
+Point = namedtuple("Point", "x y")
+
+
+def _key_property(key, default=None, doc=None):
+    """Property backed by self._data[key]; setting None removes the key."""
+    def getter(self):
+        return self._data.get(key, default)
+
+    def setter(self, value):
+        if value is None:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = value
+    return property(getter, setter, doc=doc)
+
+
+def _flag_property(key, default, doc=None):
+    """Boolean stored as 0/1 and only written when it differs from `default`."""
+    def getter(self):
+        return bool(self._data.get(key, default))
+
+    def setter(self, value):
+        if bool(value) == default:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = int(bool(value))
+    return property(getter, setter, doc=doc)
+
+
+class _NamedList(list):
+    """List of Font Info entries that can also be indexed by name."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self:
+                if item.name == key:
+                    return item
+            return None
+        return list.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(item.name == key for item in self)
+        return list.__contains__(self, key)
+
+    def __delitem__(self, key):
+        if isinstance(key, str):
+            key = [item.name for item in self].index(key)
+        list.__delitem__(self, key)
+
+
+# ── Font Info entries ────────────────────────────────────────────────────────
+
+class GSCustomParameter(object):
+
+    def __init__(self, name=None, value=None, data=None):
+        self._data = data if data is not None else {}
+        if name is not None:
+            self._data["name"] = name
+        if value is not None:
+            self._data["value"] = value
+
+    name = _key_property("name")
+    value = _key_property("value")
+
+    @property
+    def active(self):
+        return not self._data.get("disabled")
+
+    @active.setter
+    def active(self, value):
+        if value:
+            self._data.pop("disabled", None)
+        else:
+            self._data["disabled"] = 1
+
+    def to_plist(self):
+        return self._data
+
+    def __repr__(self):
+        return f"<GSCustomParameter {self.name}: {self.value!r}>"
+
+
+class _CustomParameters(object):
+    """font.customParameters / master.customParameters."""
+
+    def __init__(self, owner_data):
+        self._owner_data = owner_data
+        self._items = [GSCustomParameter(data=item)
+                       for item in owner_data.get("customParameters", [])]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, name):
+        return any(item.name == name for item in self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._items[key]
+        for item in self._items:
+            if item.name == key and item.active:
+                return item.value
+        return None
+
+    def __setitem__(self, name, value):
+        for item in self._items:
+            if item.name == name:
+                item.value = value
+                break
+        else:
+            self.append(GSCustomParameter(name, value))
+        self._sync()
+
+    def __delitem__(self, name):
+        self._items = [item for item in self._items if item.name != name]
+        self._sync()
+
+    def append(self, parameter):
+        self._items.append(parameter)
+        self._sync()
+
+    def _sync(self):
+        if self._items:
+            self._owner_data["customParameters"] = [item.to_plist() for item in self._items]
+        else:
+            self._owner_data.pop("customParameters", None)
+
+
+class _FontInfoCode(object):
+    """Shared base of GSClass, GSFeature and GSFeaturePrefix."""
+
+    _name_key = "name"
+
+    def __init__(self, name=None, code="", data=None):
+        self._data = data if data is not None else {}
+        if name is not None:
+            self.name = name
+        if data is None:
+            self.code = code
+
+    @property
+    def name(self):
+        return self._data.get(self._name_key, self._data.get("name"))
+
+    @name.setter
+    def name(self, value):
+        self._data[self._name_key] = value
+
+    code = _key_property("code", "")
+    automatic = _flag_property("automatic", False)
+    notes = _key_property("notes")
+
+    @property
+    def active(self):
+        return not self._data.get("disabled")
+
+    @active.setter
+    def active(self, value):
+        if value:
+            self._data.pop("disabled", None)
+        else:
+            self._data["disabled"] = 1
+
+    def to_plist(self):
+        return self._data
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class GSClass(_FontInfoCode):
+    pass
+
+
+class GSFeaturePrefix(_FontInfoCode):
+    pass
+
+
+class GSFeature(_FontInfoCode):
+    _name_key = "tag"
+
+
+# ── outlines ─────────────────────────────────────────────────────────────────
+
+class GSNode(object):
+
+    def __init__(self, pt=(0, 0), type=LINE, smooth=False):
+        self.x, self.y = pt
+        self.type = type
+        self.smooth = smooth
+        self.userData = None
+        self.parent = None
+
+    @property
+    def position(self):
+        return Point(self.x, self.y)
+
+    @position.setter
+    def position(self, value):
+        self.x, self.y = value
+
+    @classmethod
+    def from_plist(cls, item):
+        if isinstance(item, str):  # Glyphs 2: "x y TYPE [SMOOTH]"
+            parts = item.split()
+            node = cls((float(parts[0]), float(parts[1])), _G2_NODE_TYPES[parts[2]],
+                       len(parts) > 3 and parts[3] == "SMOOTH")
+        else:
+            code = item[2]
+            node = cls((item[0], item[1]), _NODE_TYPES[code[0]], code.endswith("s"))
+            if len(item) > 3:
+                node.userData = item[3]
+        return node
+
+    def to_plist(self):
+        code = _NODE_CODES[self.type] + ("s" if self.smooth else "")
+        item = [self.x, self.y, code]
+        if self.userData:
+            item.append(self.userData)
+        return item
+
+    def copy(self):
+        node = GSNode((self.x, self.y), self.type, self.smooth)
+        node.userData = copy.deepcopy(self.userData)
+        return node
+
+    def __repr__(self):
+        return f"<GSNode {self.x} {self.y} {self.type}{' smooth' if self.smooth else ''}>"
+
+
+class GSPath(object):
+
+    def __init__(self, data=None):
+        self._data = data if data is not None else {"closed": 1}
+        self.nodes = [GSNode.from_plist(item) for item in self._data.pop("nodes", [])]
+        for node in self.nodes:
+            node.parent = self
+        self.parent = None
+
+    closed = _flag_property("closed", False)
+
+    def to_plist(self):
+        data = dict(self._data)
+        data["nodes"] = [node.to_plist() for node in self.nodes]
+        return data
+
+    def copy(self):
+        path = GSPath(copy.deepcopy(self._data))
+        path.nodes = [node.copy() for node in self.nodes]
+        for node in path.nodes:
+            node.parent = path
+        return path
+
+    def __repr__(self):
+        return f"<GSPath {len(self.nodes)} nodes {'closed' if self.closed else 'open'}>"
+
+
+class GSComponent(object):
+
+    def __init__(self, glyph=None, offset=None, data=None):
+        self._data = data if data is not None else {}
+        if glyph is not None:
+            self._data["ref"] = glyph if isinstance(glyph, str) else glyph.name
+        if offset is not None:
+            self.position = offset
+        self.parent = None
+
+    @property
+    def componentName(self):
+        return self._data.get("ref", self._data.get("name"))
+
+    @componentName.setter
+    def componentName(self, value):
+        self._data["ref"] = value
+
+    name = componentName
+
+    @property
+    def position(self):
+        x, y = self._data.get("pos", (0, 0))
+        return Point(x, y)
+
+    @position.setter
+    def position(self, value):
+        x, y = value
+        if x or y:
+            self._data["pos"] = [x, y]
+        else:
+            self._data.pop("pos", None)
+
+    @property
+    def scale(self):
+        x, y = self._data.get("scale", (1, 1))
+        return Point(x, y)
+
+    @scale.setter
+    def scale(self, value):
+        if isinstance(value, (int, float)):
+            value = (value, value)
+        x, y = value
+        if (x, y) == (1, 1):
+            self._data.pop("scale", None)
+        else:
+            self._data["scale"] = [x, y]
+
+    @property
+    def rotation(self):
+        return self._data.get("angle", 0)
+
+    @rotation.setter
+    def rotation(self, value):
+        if value:
+            self._data["angle"] = value
+        else:
+            self._data.pop("angle", None)
+
+    @property
+    def automaticAlignment(self):
+        return self._data.get("alignment", 0) != -1
+
+    @automaticAlignment.setter
+    def automaticAlignment(self, value):
+        if value:
+            self._data.pop("alignment", None)
+        else:
+            self._data["alignment"] = -1
+
+    @property
+    def transform(self):
+        """Affine (xx, xy, yx, yy, dx, dy) built from position, scale and angle."""
+        if "transform" in self._data:  # Glyphs 2: "{xx, xy, yx, yy, dx, dy}"
+            return tuple(float(value) for value in self._data["transform"].strip("{}").split(","))
+        sx, sy = self.scale
+        angle = math.radians(self.rotation)
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = self.position
+        return (sx * cos, sx * sin, -sy * sin, sy * cos, x, y)
+
+    @transform.setter
+    def transform(self, value):
+        xx, xy, yx, yy, dx, dy = value
+        self._data.pop("transform", None)
+        sx = math.hypot(xx, xy)
+        angle = math.degrees(math.atan2(xy, xx)) if sx else 0
+        sy = (xx * yy - xy * yx) / sx if sx else yy
+        if xx < 0 and xy == 0 and yx == 0:  # plain horizontal flip
+            sx, sy, angle = xx, yy, 0
+        self.scale = (sx, sy)
+        self.rotation = angle
+        self.position = (dx, dy)
+
+    @property
+    def component(self):
+        """The referenced GSGlyph, if the component sits in a font."""
+        font = self._font()
+        return font.glyphs[self.componentName] if font else None
+
+    @property
+    def layer(self):
+        """The referenced glyph's layer in the same master."""
+        glyph = self.component
+        layer = self.parent
+        if glyph is None or layer is None:
+            return None
+        return glyph.layers[layer.associatedMasterId]
+
+    def _font(self):
+        layer = self.parent
+        glyph = layer.parent if layer is not None else None
+        return glyph.parent if glyph is not None else None
+
+    def to_plist(self):
+        return self._data
+
+    def copy(self):
+        return GSComponent(data=copy.deepcopy(self._data))
+
+    def __repr__(self):
+        return f"<GSComponent {self.componentName} {tuple(self.position)}>"
+
+
+class GSAnchor(object):
+
+    def __init__(self, name=None, pt=(0, 0), data=None):
+        self._data = data if data is not None else {}
+        if name is not None:
+            self._data["name"] = name
+        if data is None:
+            self.position = pt
+        self.parent = None
+
+    name = _key_property("name")
+
+    @property
+    def position(self):
+        if "position" in self._data:  # Glyphs 2: "{x, y}"
+            x, y = self._data["position"].strip("{}").split(",")
+            return Point(float(x), float(y))
+        x, y = self._data.get("pos", (0, 0))
+        return Point(x, y)
+
+    @position.setter
+    def position(self, value):
+        x, y = value
+        self._data.pop("position", None)
+        if x or y:
+            self._data["pos"] = [x, y]
+        else:
+            self._data.pop("pos", None)
+
+    @property
+    def x(self):
+        return self.position.x
+
+    @x.setter
+    def x(self, value):
+        self.position = (value, self.position.y)
+
+    @property
+    def y(self):
+        return self.position.y
+
+    @y.setter
+    def y(self, value):
+        self.position = (self.position.x, value)
+
+    def to_plist(self):
+        return self._data
+
+    def copy(self):
+        return GSAnchor(data=copy.deepcopy(self._data))
+
+    def __repr__(self):
+        return f"<GSAnchor {self.name} {tuple(self.position)}>"
+
+
+def _shape_from_plist(item):
+    if "ref" in item or ("name" in item and "nodes" not in item):
+        return GSComponent(data=item)
+    return GSPath(data=item)
+
+
+class _LayerShapes(list):
+    """layer.shapes: a list that keeps each shape's parent pointing at the layer."""
+
+    def __init__(self, layer, shapes=()):
+        list.__init__(self, shapes)
+        self._layer = layer
+        for shape in self:
+            shape.parent = layer
+
+    def append(self, shape):
+        shape.parent = self._layer
+        list.append(self, shape)
+
+    def extend(self, shapes):
+        for shape in shapes:
+            self.append(shape)
+
+    def insert(self, index, shape):
+        shape.parent = self._layer
+        list.insert(self, index, shape)
+
+
+class _ShapeView(object):
+    """layer.paths / layer.components: a filtered, appendable view of shapes."""
+
+    def __init__(self, layer, kind):
+        self._layer = layer
+        self._kind = kind
+
+    def _items(self):
+        return [shape for shape in self._layer.shapes if isinstance(shape, self._kind)]
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __len__(self):
+        return len(self._items())
+
+    def __getitem__(self, index):
+        return self._items()[index]
+
+    def append(self, shape):
+        self._layer.shapes.append(shape)
+
+    def extend(self, shapes):
+        self._layer.shapes.extend(shapes)
+
+    def remove(self, shape):
+        self._layer.shapes.remove(shape)
+
+    def clear(self):
+        self._layer.shapes[:] = [shape for shape in self._layer.shapes
+                                 if not isinstance(shape, self._kind)]
+
+    def __repr__(self):
+        return repr(self._items())
+
+
+# ── layers and glyphs ────────────────────────────────────────────────────────
+
+class GSLayer(object):
+
+    def __init__(self, data=None):
+        self._data = data if data is not None else {"width": 600}
+        self._shapes = None
+        self._anchors = None
+        self._background = None
+        self.parent = None
+
+    layerId = _key_property("layerId")
+    width = _key_property("width", 0)
+    leftMetricsKey = _key_property("metricLeft")
+    rightMetricsKey = _key_property("metricRight")
+    widthMetricsKey = _key_property("metricWidth")
+
+    @property
+    def name(self):
+        if "name" in self._data:
+            return self._data["name"]
+        master = self.master
+        return master.name if master is not None else None
+
+    @name.setter
+    def name(self, value):
+        self._data["name"] = value
+
+    @property
+    def associatedMasterId(self):
+        return self._data.get("associatedMasterId", self._data.get("layerId"))
+
+    @associatedMasterId.setter
+    def associatedMasterId(self, value):
+        self._data["associatedMasterId"] = value
+
+    @property
+    def isMasterLayer(self):
+        return "associatedMasterId" not in self._data or \
+            self._data["associatedMasterId"] == self._data.get("layerId")
+
+    @property
+    def master(self):
+        glyph = self.parent
+        font = glyph.parent if glyph is not None else None
+        if font is None:
+            return None
+        return font.masters[self.associatedMasterId]
+
+    @property
+    def shapes(self):
+        if self._shapes is None:
+            if "shapes" in self._data:
+                items = plist.resolve(self._data["shapes"])
+            else:  # Glyphs 2 keeps paths and components apart
+                items = plist.resolve(self._data.pop("paths", []))
+                items = items + plist.resolve(self._data.pop("components", []))
+            self._shapes = _LayerShapes(self, [_shape_from_plist(item) for item in items])
+        return self._shapes
+
+    @shapes.setter
+    def shapes(self, value):
+        self._shapes = _LayerShapes(self, value)
+
+    @property
+    def paths(self):
+        return _ShapeView(self, GSPath)
+
+    @paths.setter
+    def paths(self, value):
+        self.shapes = [shape for shape in self.shapes if not isinstance(shape, GSPath)] + list(value)
+
+    @property
+    def components(self):
+        return _ShapeView(self, GSComponent)
+
+    @components.setter
+    def components(self, value):
+        self.shapes = [shape for shape in self.shapes if not isinstance(shape, GSComponent)] + list(value)
+
+    @property
+    def hasShapes(self):
+        """True if the layer has paths or components, without decoding them."""
+        if self._shapes is not None:
+            return bool(self._shapes)
+        for key in ("shapes", "paths", "components"):
+            value = self._data.get(key)
+            if isinstance(value, plist.Deferred):
+                if not value.is_empty():
+                    return True
+            elif value:
+                return True
+        return False
+
+    @property
+    def anchors(self):
+        if self._anchors is None:
+            self._anchors = _NamedList(GSAnchor(data=item) for item in self._data.get("anchors", []))
+            for anchor in self._anchors:
+                anchor.parent = self
+        return self._anchors
+
+    @anchors.setter
+    def anchors(self, value):
+        self._anchors = _NamedList(value)
+
+    @property
+    def background(self):
+        if self._background is None:
+            self._background = GSLayer(self._data.get("background", {}))
+            self._background.parent = self.parent
+            self._background._data.pop("width", None)
+        return self._background
+
+    # ── geometry ─────────────────────────────────────────────────────────────
+
+    def _box(self, transform=geometry.IDENTITY, depth=0):
+        """(minX, minY, maxX, maxY) of all shapes, components resolved."""
+        box = None
+        for shape in self.shapes:
+            if isinstance(shape, GSPath):
+                box = geometry.union(box, geometry.path_bounds(shape, transform))
+            elif depth < 16:
+                layer = shape.layer
+                if layer is not None:
+                    nested = geometry.multiply(shape.transform, transform)
+                    box = geometry.union(box, layer._box(nested, depth + 1))
+        return box
+
+    @property
+    def bounds(self):
+        box = self._box()
+        if box is None:
+            return geometry.Rect()
+        return geometry.Rect(box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+    @property
+    def LSB(self):
+        box = self._box()
+        return box[0] if box else 0
+
+    @LSB.setter
+    def LSB(self, value):
+        box = self._box()
+        if box is None:
+            return
+        delta = value - box[0]
+        self.applyTransform((1, 0, 0, 1, delta, 0))
+        self.width = self.width + delta
+
+    @property
+    def RSB(self):
+        box = self._box()
+        return self.width - box[2] if box else 0
+
+    @RSB.setter
+    def RSB(self, value):
+        box = self._box()
+        if box is not None:
+            self.width = box[2] + value
+
+    @property
+    def TSB(self):
+        box = self._box()
+        master = self.master
+        return (master.ascender - box[3]) if box and master else 0
+
+    @property
+    def BSB(self):
+        box = self._box()
+        master = self.master
+        return (box[1] - master.descender) if box and master else 0
+
+    def applyTransform(self, transform):
+        """Transform paths, components and anchors by an affine matrix."""
+        for shape in self.shapes:
+            if isinstance(shape, GSPath):
+                for node in shape.nodes:
+                    node.x, node.y = geometry.apply(transform, node.x, node.y)
+            else:
+                shape.transform = geometry.multiply(shape.transform, transform)
+        for anchor in self.anchors:
+            anchor.position = geometry.apply(transform, anchor.x, anchor.y)
+
+    def _metrics_key(self, side):
+        key = getattr(self, side + "MetricsKey")
+        if not key and self.parent is not None:
+            key = getattr(self.parent, side + "MetricsKey")
+        return key
+
+    def syncMetrics(self):
+        """Apply the layer's (or glyph's) metrics keys, like Glyphs does."""
+        for side in ("left", "right", "width"):
+            value = _resolve_metrics_key(self, self._metrics_key(side), side)
+            if value is None:
+                continue
+            if side == "left":
+                self.LSB = value
+            elif side == "right":
+                self.RSB = value
+            else:
+                self.width = value
+
+    def setValue_forKey_(self, value, key):
+        setattr(self, key, str(value) if isinstance(value, str) else value)
+
+    def copy(self):
+        layer = GSLayer(copy.deepcopy(self.to_plist()))
+        layer._data.pop("layerId", None)
+        return layer
+
+    def to_plist(self):
+        data = dict(self._data)
+        if self._anchors is not None:
+            data["anchors"] = [anchor.to_plist() for anchor in self._anchors]
+        if self._background is not None:
+            data["background"] = self._background.to_plist()
+        if self._shapes is not None:
+            data["shapes"] = [shape.to_plist() for shape in self._shapes]
+        for key in ("anchors", "background", "shapes"):
+            if key in data and not data[key]:
+                del data[key]
+        return data
+
+    def __repr__(self):
+        glyph = self.parent.name if self.parent is not None else None
+        return f"<GSLayer {glyph!r} {self.name!r}>"
+
+
+_METRICS_KEY = re.compile(r"=(\|?)(.*?)\s*(?:([-+*/])\s*([0-9.]+))?\Z")
+
+
+def _resolve_metrics_key(layer, key, side):
+    """Value a metrics key like "=H", "=|n", "=o+10" or "=80" stands for."""
+    if not key or not key.startswith("="):
+        return None
+    match = _METRICS_KEY.match(key.strip())
+    if not match:
+        return None
+    opposite, name, operator, operand = match.groups()
+    glyph = layer.parent
+    font = glyph.parent if glyph is not None else None
+    if font is not None and name and operator and font.glyphs[name + operator + operand]:
+        name, operator = name + operator + operand, None  # hyphenated glyph name
+    if not name:
+        if not opposite or side == "width":
+            return None
+        value = layer.LSB if side == "right" else layer.RSB
+    elif re.match(r"-?[0-9.]+\Z", name):
+        value = float(name)
+    else:
+        source = font.glyphs[name] if font is not None else None
+        source_layer = source.layers[layer.associatedMasterId] if source is not None else None
+        if source_layer is None:
+            return None
+        if side == "width":
+            value = source_layer.width
+        elif (side == "left") != bool(opposite):
+            value = source_layer.LSB
+        else:
+            value = source_layer.RSB
+    if operator:
+        operand = float(operand)
+        value = {"+": value + operand, "-": value - operand,
+                 "*": value * operand, "/": value / operand if operand else value}[operator]
+    return value
+
+
+class _GlyphLayers(object):
+    """glyph.layers: indexable by position or by master/layer id."""
+
+    def __init__(self, glyph, items):
+        self._glyph = glyph
+        self._items = list(items)
+        for layer in self._items:
+            layer.parent = glyph
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._items[key]
+        for layer in self._items:
+            if layer.layerId == key:
+                return layer
+        return None
+
+    def __setitem__(self, key, layer):
+        layer.parent = self._glyph
+        if isinstance(key, int):
+            self._items[key] = layer
+            return
+        if layer.layerId is None:
+            layer.layerId = key
+        if layer._data.get("associatedMasterId") == key:
+            del layer._data["associatedMasterId"]
+        for index, existing in enumerate(self._items):
+            if existing.layerId == key:
+                self._items[index] = layer
+                return
+        self._items.append(layer)
+
+    def append(self, layer):
+        layer.parent = self._glyph
+        if layer.layerId is None:
+            layer.layerId = str(uuid.uuid4()).upper()
+        self._items.append(layer)
+
+    def remove(self, layer):
+        self._items.remove(layer)
+
+    def __repr__(self):
+        return repr(self._items)
+
+
+class GSGlyph(object):
+
+    def __init__(self, name=None, data=None):
+        self._layers = None
+        self._id = None
+        self.parent = None
+        if isinstance(data, plist.Deferred):
+            # Still in the file: decoded on first access to anything but the name
+            self._source = data
+            self._decoded = None
+            self._name = name
+            return
+        self._source = None
+        self._decoded = data if data is not None else {}
+        if name is not None:
+            self._decoded["glyphname"] = name
+
+    @property
+    def _data(self):
+        if self._decoded is None:
+            self._decoded = self._source.resolve()
+            self._source = None
+        return self._decoded
+
+    @property
+    def name(self):
+        if self._decoded is None:
+            return self._name
+        return self._data.get("glyphname")
+
+    @name.setter
+    def name(self, value):
+        old = self._data.get("glyphname")
+        self._data["glyphname"] = value
+        if self.parent is not None and old != value:
+            self.parent.glyphs._renamed(self, old)
+
+    @property
+    def id(self):
+        """Headless fonts address glyphs by name, also in kerning (see GSFont.use_glyph_ids)."""
+        return self._id or self.name
+
+    export = _flag_property("export", True)
+    category = _key_property("category")
+    subCategory = _key_property("subCategory")
+    script = _key_property("script")
+    note = _key_property("note")
+    color = _key_property("color")
+    productionName = _key_property("production")
+    leftMetricsKey = _key_property("metricLeft")
+    rightMetricsKey = _key_property("metricRight")
+    widthMetricsKey = _key_property("metricWidth")
+
+    @property
+    def leftKerningGroup(self):
+        return self._data.get("kernLeft", self._data.get("leftKerningGroup"))
+
+    @leftKerningGroup.setter
+    def leftKerningGroup(self, value):
+        self._set_renamed_key("kernLeft", "leftKerningGroup", value)
+
+    @property
+    def rightKerningGroup(self):
+        return self._data.get("kernRight", self._data.get("rightKerningGroup"))
+
+    @rightKerningGroup.setter
+    def rightKerningGroup(self, value):
+        self._set_renamed_key("kernRight", "rightKerningGroup", value)
+
+    def _set_renamed_key(self, key, g2_key, value):
+        if self._format < 3:
+            key = g2_key
+        if value:
+            self._data[key] = value
+        else:
+            self._data.pop(key, None)
+
+    @property
+    def tags(self):
+        return list(self._data.get("tags", []))
+
+    @tags.setter
+    def tags(self, value):
+        if value:
+            self._data["tags"] = list(value)
+        else:
+            self._data.pop("tags", None)
+
+    @property
+    def _format(self):
+        return self.parent.formatVersion if self.parent is not None else 3
+
+    @property
+    def unicodes(self):
+        value = self._data.get("unicode")
+        if value is None:
+            return []
+        if self._format < 3:  # hex, comma separated
+            return [code.strip().upper() for code in str(value).split(",")]
+        values = value if isinstance(value, list) else [value]
+        return ["%04X" % code for code in values]
+
+    @unicodes.setter
+    def unicodes(self, value):
+        codes = [int(code, 16) for code in (value or [])]
+        if not codes:
+            self._data.pop("unicode", None)
+        elif self._format < 3:
+            self._data["unicode"] = ",".join("%04X" % code for code in codes)
+        else:
+            self._data["unicode"] = codes[0] if len(codes) == 1 else codes
+        if self.parent is not None:
+            self.parent.glyphs._unicodes_changed()
+
+    @property
+    def unicode(self):
+        codes = self.unicodes
+        return codes[0] if codes else None
+
+    @unicode.setter
+    def unicode(self, value):
+        self.unicodes = [value] if value else []
+
+    @property
+    def string(self):
+        code = self.unicode
+        return chr(int(code, 16)) if code else None
+
+    @property
+    def layers(self):
+        if self._layers is None:
+            items = plist.resolve(self._data.get("layers", []))
+            self._layers = _GlyphLayers(self, [GSLayer(item) for item in items])
+        return self._layers
+
+    @layers.setter
+    def layers(self, value):
+        self._layers = _GlyphLayers(self, value)
+
+    def updateGlyphInfo(self, changeName=True):
+        pass
+
+    def setValue_forKey_(self, value, key):
+        setattr(self, key, value)
+
+    def beginUndo(self):
+        pass
+
+    def endUndo(self):
+        pass
+
+    def copy(self):
+        return GSGlyph(data=copy.deepcopy(self.to_plist()))
+
+    def to_plist(self):
+        if self._decoded is None:
+            return self._source
+        data = dict(self._data)
+        if self._layers is not None:
+            data["layers"] = [layer.to_plist() for layer in self._layers]
+        return data
+
+    def __repr__(self):
+        return f"<GSGlyph {self.name!r}>"
+
+
+class _FontGlyphs(object):
+    """font.glyphs: indexable by position or glyph name."""
+
+    def __init__(self, font, glyphs):
+        self._font = font
+        self._items = []
+        self._by_name = {}
+        self._by_id = {}
+        self._by_unicode = None
+        for glyph in glyphs:
+            self._add(glyph)
+
+    def _add(self, glyph):
+        glyph.parent = self._font
+        if self._font._glyph_ids:
+            glyph._id = glyph._id or _new_id()
+            self._by_id[glyph._id] = glyph
+        self._items.append(glyph)
+        self._by_name[glyph.name] = glyph
+        self._by_unicode = None
+
+    def _renamed(self, glyph, old):
+        if self._by_name.get(old) is glyph:
+            del self._by_name[old]
+        self._by_name[glyph.name] = glyph
+
+    def _unicodes_changed(self):
+        self._by_unicode = None
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return key in self._by_name
+        return key in self._items
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._items[key]
+        glyph = self._by_name.get(key)
+        if glyph is None and isinstance(key, str) and len(key) == 1:
+            glyph = self.glyphForUnicode("%04X" % ord(key))
+        return glyph
+
+    def glyphForUnicode(self, code):
+        if self._by_unicode is None:
+            self._by_unicode = {}
+            for glyph in self._items:
+                for value in glyph.unicodes:
+                    self._by_unicode.setdefault(value, glyph)
+        return self._by_unicode.get(code.upper())
+
+    def append(self, glyph):
+        if glyph.name in self._by_name:
+            raise NameError(f"Glyph {glyph.name} already exists")
+        self._add(glyph)
+
+    def extend(self, glyphs):
+        for glyph in glyphs:
+            self.append(glyph)
+
+    def remove(self, glyph):
+        if isinstance(glyph, str):
+            glyph = self._by_name[glyph]
+        self._items.remove(glyph)
+        del self._by_name[glyph.name]
+        self._by_id.pop(glyph._id, None)
+        self._by_unicode = None
+        glyph.parent = None
+
+    def __delitem__(self, key):
+        self.remove(self[key])
+
+    def __repr__(self):
+        return f"<glyphs: {len(self._items)}>"
+
+
+# ── masters and font ─────────────────────────────────────────────────────────
+
+_METRIC_TYPES = {
+    "ascender": "ascender",
+    "capHeight": "cap height",
+    "xHeight": "x-height",
+    "descender": "descender",
+    "italicAngle": "italic angle",
+}
+
+
+def _metric_property(name):
+    type_name = _METRIC_TYPES[name]
+
+    def getter(self):
+        index = self._metric_index(type_name)
+        if index is None:
+            return self._data.get(name, 0)
+        values = self._data.get("metricValues", [])
+        value = values[index] if index < len(values) else {}
+        return value.get("pos", 0)
+
+    def setter(self, value):
+        index = self._metric_index(type_name, create=True)
+        if index is None:
+            self._data[name] = value
+            return
+        values = self._data.setdefault("metricValues", [])
+        while len(values) <= index:
+            values.append({})
+        values[index]["pos"] = value
+    return property(getter, setter)
+
+
+class GSFontMaster(object):
+
+    def __init__(self, data=None):
+        self._data = data if data is not None else {"id": str(uuid.uuid4()).upper()}
+        self.customParameters = _CustomParameters(self._data)
+        self.font = None
+
+    id = _key_property("id")
+    ascender = _metric_property("ascender")
+    capHeight = _metric_property("capHeight")
+    xHeight = _metric_property("xHeight")
+    descender = _metric_property("descender")
+    italicAngle = _metric_property("italicAngle")
+
+    @property
+    def name(self):
+        if "name" in self._data:
+            return self._data["name"]
+        parts = [self._data.get(key) for key in ("weight", "width", "custom")]
+        return " ".join(part for part in parts if part and part != "Regular") or "Regular"
+
+    @name.setter
+    def name(self, value):
+        self._data["name"] = value
+
+    @property
+    def axes(self):
+        return list(self._data.get("axesValues", []))
+
+    def _metric_index(self, type_name, create=False):
+        if self.font is None or self.font.formatVersion < 3:
+            return None
+        metrics = self.font._data.get("metrics", [])
+        for index, metric in enumerate(metrics):
+            if metric.get("type") == type_name and "filter" not in metric:
+                return index
+        if not create:
+            return None
+        self.font._data["metrics"] = metrics + [{"type": type_name}]
+        return len(metrics)
+
+    def to_plist(self):
+        return self._data
+
+    def __repr__(self):
+        return f"<GSFontMaster {self.name!r} id={self.id}>"
+
+
+class _FontMasters(list):
+    """font.masters: indexable by position or master id."""
+
+    def __init__(self, font, masters=()):
+        list.__init__(self, masters)
+        self._font = font
+        for master in self:
+            master.font = font
+
+    def append(self, master):
+        master.font = self._font
+        list.append(self, master)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for master in self:
+                if master.id == key:
+                    return master
+            return None
+        return list.__getitem__(self, key)
+
+
+class _GraphicView(object):
+    """Records the spacing/kerning toggles scripts set on a tab."""
+
+    def __init__(self):
+        self.doSpacing = 1
+        self.doKerning = 0
+
+    def setDoSpacing_(self, value):
+        self.doSpacing = value
+
+    def setDoKerning_(self, value):
+        self.doKerning = value
+
+
+class GSEditViewController(object):
+    """Stand-in for an Edit tab opened by font.newTab()."""
+
+    def __init__(self, font, text=""):
+        self.parent = font
+        self.text = text
+        self.layers = []
+        self.textCursor = 0
+        self.textRange = 0
+        self._view = _GraphicView()
+
+    def graphicView(self):
+        return self._view
+
+    def updateKerningButton(self):
+        pass
+
+    def __repr__(self):
+        return f"<GSEditViewController {self.text!r}>"
+
+
+class GSFont(object):
+
+    def __init__(self, path=None):
+        self.filepath = None
+        self._index = None
+        self._glyph_ids = False
+        self._data = {".formatVersion": 3, "unitsPerEm": 1000}
+        glyphs = []
+        if path is not None:
+            # The file is memory-mapped and indexed in one pass. Kerning and
+            # glyphs stay undecoded until used; the rest is small.
+            self.filepath = os.path.abspath(path)
+            self._index = GlyphsFileIndex(path, LAZY_KEYS)
+            self._data = {key: self._index.deferred(key) for key in self._index.keys()}
+            for key in self._data:
+                if key not in ("glyphs", "kerning", "kerningLTR", "kerningRTL", "kerningVertical"):
+                    self._data[key] = self._data[key].resolve()
+            glyphs = [GSGlyph(name, self._index.deferred_glyph(name))
+                      for name in self._index.glyph_spans]
+            self._data.pop("glyphs", None)
+        self._setup(glyphs)
+        self.selectedLayers = []
+        self.tabs = []
+        self.masterIndex = 0
+        self.tempData = {}      # not saved, as in Glyphs
+        self._interface_locks = 0
+
+    def _setup(self, glyphs):
+        data = self._data
+        self.masters = _FontMasters(self, (GSFontMaster(item) for item in data.pop("fontMaster", [])))
+        self.glyphs = _FontGlyphs(self, glyphs)
+        self.classes = _NamedList(GSClass(data=item) for item in data.pop("classes", []))
+        self.featurePrefixes = _NamedList(GSFeaturePrefix(data=item) for item in data.pop("featurePrefixes", []))
+        feature_type = GSFeature if self.formatVersion >= 3 else _G2Feature
+        self.features = _NamedList(feature_type(data=item) for item in data.pop("features", []))
+        self._kerning = data.pop(self._kerning_key, {})
+        self.customParameters = _CustomParameters(data)
+
+    @property
+    def formatVersion(self):
+        return self._data.get(".formatVersion", 2)
+
+    @property
+    def _kerning_key(self):
+        return "kerningLTR" if self.formatVersion >= 3 else "kerning"
+
+    familyName = _key_property("familyName")
+    unitsPerEm = _key_property("unitsPerEm", 1000)
+    versionMajor = _key_property("versionMajor", 1)
+    versionMinor = _key_property("versionMinor", 0)
+    copyright = _key_property("copyright")
+    designer = _key_property("designer")
+    date = _key_property("date")
+
+    @property
+    def userData(self):
+        """Free-form dict saved with the font; scripts keep their state here."""
+        return self._data.setdefault("userData", {})
+
+    @property
+    def features(self):
+        return self._features
+
+    @features.setter
+    def features(self, value):
+        self._features = _NamedList(value)
+
+    @property
+    def classes(self):
+        return self._classes
+
+    @classes.setter
+    def classes(self, value):
+        self._classes = _NamedList(value)
+
+    @property
+    def featurePrefixes(self):
+        return self._featurePrefixes
+
+    @featurePrefixes.setter
+    def featurePrefixes(self, value):
+        self._featurePrefixes = _NamedList(value)
+
+    @property
+    def selectedFontMaster(self):
+        return self.masters[self.masterIndex] if self.masters else None
+
+    @selectedFontMaster.setter
+    def selectedFontMaster(self, master):
+        self.masterIndex = list(self.masters).index(master)
+
+    @property
+    def currentTab(self):
+        return self.tabs[-1] if self.tabs else None
+
+    @property
+    def fontView(self):
+        return None
+
+    # ── kerning ──────────────────────────────────────────────────────────────
+
+    @property
+    def kerning(self):
+        """{master id: {left key: {right key: value}}}, decoded on first use."""
+        if isinstance(self._kerning, plist.Deferred):
+            self._kerning = self._kerning.resolve()
+        return self._kerning
+
+    @kerning.setter
+    def kerning(self, value):
+        self._kerning = value
+
+    def _pair_key(self, key):
+        """font.kerning key for a glyph name or group key (the pair calls take names)."""
+        if self._glyph_ids and not key.startswith("@"):
+            glyph = self.glyphs[key]
+            return glyph.id if glyph is not None else key
+        return key
+
+    def kerningForPair(self, masterId, leftKey, rightKey):
+        """Exact kerning value stored for the pair, or None."""
+        leftKey, rightKey = self._pair_key(leftKey), self._pair_key(rightKey)
+        return self.kerning.get(masterId, {}).get(leftKey, {}).get(rightKey)
+
+    def setKerningForPair(self, masterId, leftKey, rightKey, value):
+        leftKey, rightKey = self._pair_key(leftKey), self._pair_key(rightKey)
+        self.kerning.setdefault(masterId, {}).setdefault(leftKey, {})[rightKey] = value
+
+    def removeKerningForPair(self, masterId, leftKey, rightKey):
+        leftKey, rightKey = self._pair_key(leftKey), self._pair_key(rightKey)
+        row = self.kerning.get(masterId, {}).get(leftKey)
+        if row is None or rightKey not in row:
+            return
+        del row[rightKey]
+        if not row:
+            del self.kerning[masterId][leftKey]
+
+    def glyphForId_(self, glyph_id):
+        if self._glyph_ids:
+            return self.glyphs._by_id.get(glyph_id)
+        return self.glyphs[glyph_id]
+
+    def use_glyph_ids(self):
+        """Give every glyph a UUID and key glyph-level kerning by it, like Glyphs does.
+
+        Files store glyph names in kerning and get them back on saving. Scripts
+        that mix up glyph names and ids then fail headless as in the app.
+        """
+        if self._glyph_ids:
+            return self
+        self._glyph_ids = True
+        for glyph in self.glyphs:
+            glyph._id = _new_id()
+            self.glyphs._by_id[glyph._id] = glyph
+        self.kerning = _rekeyed(self.kerning, {glyph.name: glyph._id for glyph in self.glyphs})
+        return self
+
+    # ── interface no-ops ─────────────────────────────────────────────────────
+
+    def disableUpdateInterface(self):
+        self._interface_locks += 1
+
+    def enableUpdateInterface(self):
+        self._interface_locks = max(0, self._interface_locks - 1)
+
+    def newTab(self, text=""):
+        tab = GSEditViewController(self, text)
+        self.tabs.append(tab)
+        return tab
+
+    def updateFeatures(self):
+        """Glyphs regenerates automatic features here; files keep theirs."""
+
+    def compileFeatures(self):
+        pass
+
+    def close(self):
+        """Release the source file. Undecoded glyphs can no longer be read."""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    # ── saving ───────────────────────────────────────────────────────────────
+
+    def to_plist(self):
+        data = dict(self._data)
+        if not data.get("userData"):
+            data.pop("userData", None)
+        data["fontMaster"] = [master.to_plist() for master in self.masters]
+        data["glyphs"] = [glyph.to_plist() for glyph in self.glyphs]
+        for key, items in (("classes", self.classes),
+                           ("featurePrefixes", self.featurePrefixes),
+                           ("features", self.features)):
+            if items:
+                data[key] = [item.to_plist() for item in items]
+        if isinstance(self._kerning, plist.Deferred):
+            data[self._kerning_key] = self._kerning
+        else:
+            kerning = {master_id: pairs for master_id, pairs in self._kerning.items() if pairs}
+            if self._glyph_ids:
+                kerning = _rekeyed(kerning, {glyph._id: glyph.name for glyph in self.glyphs})
+            if kerning:
+                data[self._kerning_key] = kerning
+        return _sorted_font_keys(data)
+
+    def save(self, path=None):
+        path = path or self.filepath
+        if not path:
+            raise ValueError("No path given for an unsaved font")
+        # Write next to the target first: undecoded glyphs are copied
+        # straight out of the source file while writing.
+        temp = path + ".tmp"
+        plist.save(self.to_plist(), temp)
+        os.replace(temp, path)
+        self.filepath = os.path.abspath(path)
+
+    def __repr__(self):
+        return f"<GSFont {self.familyName!r} {len(self.masters)} masters, {len(self.glyphs)} glyphs>"
+
+
+def _new_id():
+    return str(uuid.uuid4()).upper()
+
+
+def _rekeyed(kerning, keys):
+    """Kerning with glyph-level keys replaced through `keys`; group keys stay."""
+    return {master_id: {keys.get(left, left): {keys.get(right, right): value for right, value in row.items()}
+                        for left, row in rows.items()}
+            for master_id, rows in kerning.items()}
+
+
+class _G2Feature(GSFeature):
+    _name_key = "name"
+
+
+def _sorted_font_keys(data):
+    """Glyphs writes dot keys first, then the rest alphabetically."""
+    return dict(sorted(data.items(), key=lambda item: (not item[0].startswith("."), item[0])))
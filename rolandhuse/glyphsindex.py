@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Byte-offset index of a .glyphs file, for files too big to load whole.
+
+One pass over a memory-mapped file records where every top-level section
+(kerning, features, classes, …) and every glyph starts and ends. Consumers
+then decode just the parts they need:
+
+    with GlyphsFileIndex("CJK.glyphs") as index:
+        kerning = index.section("kerningLTR")
+        for name, glyph in index.iter_glyphs():
+            ...
+
+The file itself stays in the OS page cache; Python only ever holds the
+decoded sections, so peak memory follows the largest glyph, not the file.
+"""
+
+import mmap
+
+from rolandhuse import plist
+
+
+class GlyphsFileIndex(object):
+
+    def __init__(self, path, lazy_keys=frozenset()):
+        self.path = path
+        self.lazy_keys = frozenset(lazy_keys)
+        self._file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self.buffer = b""
+        self.sections = {}
+        self.glyph_spans = {}
+        self._scan()
+
+    def _scan(self):
+        buffer = self.buffer
+        pos = plist.expect(buffer, 0, b"{")
+        while True:
+            pos = plist.skip_whitespace(buffer, pos)
+            if buffer[pos:pos + 1] == b"}":
+                break
+            key, pos = plist.parse_key(buffer, pos)
+            start = plist.skip_whitespace(buffer, plist.expect(buffer, pos, b"="))
+            if key == "glyphs":
+                end = self._scan_glyphs(start)
+            else:
+                end = plist.skip_value(buffer, start)
+            self.sections[key] = (start, end)
+            pos = plist.expect(buffer, end, b";")
+
+    def _scan_glyphs(self, pos):
+        buffer = self.buffer
+        pos = plist.expect(buffer, pos, b"(")
+        while True:
+            pos = plist.skip_whitespace(buffer, pos)
+            if buffer[pos:pos + 1] == b")":
+                return pos + 1
+            entries, end = plist.scan_dict(buffer, pos)
+            name = next((plist.parse_value(buffer, start)[0]
+                         for key, start, _ in entries if key == "glyphname"), None)
+            self.glyph_spans[name] = (pos, end)
+            pos = plist.skip_whitespace(buffer, end)
+            if buffer[pos:pos + 1] == b",":
+                pos += 1
+
+    # ── access ───────────────────────────────────────────────────────────────
+
+    def __contains__(self, key):
+        return key in self.sections
+
+    def keys(self):
+        return self.sections.keys()
+
+    def deferred(self, key):
+        """The section as an undecoded Deferred (None if absent)."""
+        span = self.sections.get(key)
+        if span is None:
+            return None
+        return plist.Deferred(self.buffer, span[0], span[1], self.lazy_keys)
+
+    def section(self, key, default=None):
+        """Decode and return one top-level section."""
+        value = self.deferred(key)
+        return default if value is None else value.resolve()
+
+    def raw_section(self, key):
+        """The undecoded bytes of one top-level section."""
+        start, end = self.sections[key]
+        return bytes(self.buffer[start:end])
+
+    @property
+    def glyph_names(self):
+        return list(self.glyph_spans)
+
+    def deferred_glyph(self, name):
+        span = self.glyph_spans.get(name)
+        if span is None:
+            return None
+        return plist.Deferred(self.buffer, span[0], span[1], self.lazy_keys)
+
+    def glyph(self, name):
+        """Decode and return the dictionary of one glyph (None if absent)."""
+        value = self.deferred_glyph(name)
+        return None if value is None else value.resolve()
+
+    def iter_glyphs(self, names=None):
+        """Yield (name, glyph dict), decoding one glyph at a time."""
+        for name in (self.glyph_spans if names is None else names):
+            glyph = self.glyph(name)
+            if glyph is not None:
+                yield name, glyph
+
+    # ── lifetime ─────────────────────────────────────────────────────────────
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
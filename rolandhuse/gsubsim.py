@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Run feature code on glyph sequences without compiling a font.
+
+Understands the part of the feature syntax the builders here write: glyph
+classes, lookup blocks and references, single, class, multiple and
+alternate (first alternate) substitutions, ligatures, and chained contexts
+with `lookup` references or `ignore`:
+
+    sim = GSUBSimulator.from_font(font, ["calt"])   # Font Info classes, prefixes, calt
+    sim.shape(["a", "b", "c"], ["calt"])        # → ["a", "b.ss01", "c"]
+    sim.shape(text_to_glyphs(font, "abc"), ["init", "fina", "calt"])
+    sim.stats                                   # {"glyphs": 3, "rules": 7}
+
+Given feature tags, only those features are read, so the rest of a real
+font's code (aalt, kern, mark) is never parsed. Positioning rules, aalt's
+`feature salt;` references and feature names are skipped anywhere; a
+lookupflag other than 0 is only an error where it applies to substitutions.
+
+Lookups apply the way a shaper applies them: those of all requested
+features in the order they were defined, each once across the glyph run.
+Lookups defined inside a feature block belong to that feature. stats counts
+the glyphs shaped and the rules tried on them (only rules whose first input
+glyph matches), a rough cost per glyph for comparing feature code.
+
+Shape a corpus and keep the result as a regression check:
+
+    python -m rolandhuse.gsubsim Family.glyphs corpus.txt --features calt --save calt.txt
+    python -m rolandhuse.gsubsim Family.glyphs corpus.txt --features calt --compare calt.txt
+"""
+
+import argparse
+import re
+import sys
+
+_TOKEN = re.compile(r"#[^\n]*|([{}\[\];=',])|([^\s{}\[\];=',#]+)")
+_IGNORED = {"languagesystem", "script", "language", "subtable", "markClass", "anchorDef", "valueRecordDef",
+            "pos", "position", "enum", "enumerate"}
+_IGNORED_BLOCKS = {"featureNames", "cvParameters", "parameters"}
+
+
+class FeaError(ValueError):
+    pass
+
+
+def _length(rule):
+    kind, _, data = rule
+    return len(data[0]) if kind == "ligature" else 0
+
+
+class _Lookup(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.rules = []         # (kind, first glyphs, rule)
+        self.index = {}         # glyph → [rule positions], built on first use
+
+    def add(self, kind, first, rule):
+        self.rules.append((kind, first, rule))
+        self.index = None
+
+    def candidates(self, glyph):
+        if self.index is None:
+            # Longer ligatures first, as in the compiled LigatureSet
+            order = sorted(range(len(self.rules)), key=lambda position: -_length(self.rules[position]))
+            index = {}
+            for position in order:
+                for name in self.rules[position][1]:
+                    index.setdefault(name, []).append(position)
+            self.index = index
+        return self.index.get(glyph, ())
+
+
+class _Parser(object):
+
+    def __init__(self, text):
+        self.tokens = [(m.group(1) or m.group(2)) for m in _TOKEN.finditer(text) if m.group(1) or m.group(2)]
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise FeaError("unexpected end of feature code")
+        self.pos += 1
+        return token
+
+    def expect(self, token):
+        found = self.next()
+        if found != token:
+            raise FeaError(f"expected {token!r}, found {found!r} ({' '.join(self.tokens[max(0, self.pos - 8):self.pos])})")
+
+    def until(self, token):
+        items = []
+        while self.peek() != token:
+            items.append(self.next())
+        self.next()
+        return items
+
+    def skip_block(self):
+        """Skip a {…} block, nested blocks included; the next token must be '{'."""
+        self.expect("{")
+        depth = 1
+        while depth:
+            item = self.next()
+            depth += (item == "{") - (item == "}")
+
+
+class GSUBSimulator(object):
+
+    def __init__(self, code="", features=None):
+        self.classes = {}
+        self.lookups = {}           # name → _Lookup
+        self.order = []             # all lookups in definition order
+        self.features = {}          # tag → [lookups]
+        self.flags = {}             # lookup or feature block → its lookupflag tokens, if not 0
+        self.stats = {"glyphs": 0, "rules": 0}
+        self._wanted = None
+        if code:
+            self.add(code, features)
+
+    @classmethod
+    def from_font(cls, font, features=None):
+        """Simulator for a font's Font Info classes, prefixes and active features (or only `features`)."""
+        parts = [f"@{item.name} = [{item.code}];" for item in font.classes if getattr(item, "active", True)]
+        parts += [item.code for item in font.featurePrefixes if getattr(item, "active", True)]
+        parts += [f"feature {item.name} {{\n{item.code}\n}} {item.name};"
+                  for item in font.features if getattr(item, "active", True)
+                  and (features is None or item.name in features)]
+        return cls("\n".join(parts), features)
+
+    def reset_stats(self):
+        self.stats = {"glyphs": 0, "rules": 0}
+
+    # ── parsing ──
+
+    def add(self, code, features=None):
+        """Parse feature code and add its classes, lookups and features (or only `features`)."""
+        self._wanted = None if features is None else set(features)
+        parser = _Parser(code)
+        while parser.peek() is not None:
+            self._statement(parser, feature=None, lookup=None)
+
+    def _glyphs(self, items):
+        """Glyph names for a list of tokens like ["a", "[", "b", "@C", "]"]."""
+        names = []
+        for item in items:
+            if item in "[]":
+                continue
+            if item.startswith("@"):
+                if item[1:] not in self.classes:
+                    raise FeaError(f"unknown class {item}")
+                names += self.classes[item[1:]]
+            else:
+                names.append(item.lstrip("\\"))
+        return names
+
+    def _sequence(self, tokens):
+        """Split rule tokens into positions: [(glyph names, marked, [lookup names])]."""
+        positions, i = [], 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token == "[":
+                end = tokens.index("]", i)
+                glyphs, i = self._glyphs(tokens[i + 1:end]), end + 1
+            else:
+                glyphs, i = self._glyphs([token]), i + 1
+            marked = i < len(tokens) and tokens[i] == "'"
+            if marked:
+                i += 1
+            lookups = []
+            while i < len(tokens) and tokens[i] == "lookup":
+                lookups.append(tokens[i + 1])
+                i += 2
+            positions.append((glyphs, marked, lookups))
+        return positions
+
+    def _define_lookup(self, name):
+        if name in self.lookups:
+            raise FeaError(f"lookup {name} is defined twice")
+        lookup = self.lookups[name] = _Lookup(name)
+        self.order.append(lookup)
+        return lookup
+
+    def _loose_lookup(self, feature, kind):
+        """The feature's unnamed lookup for rules of this kind, like feaLib groups them."""
+        lookups = self.features[feature]
+        if lookups and lookups[-1].name == (feature, kind):
+            return lookups[-1]
+        lookup = _Lookup((feature, kind))
+        self.order.append(lookup)
+        lookups.append(lookup)
+        return lookup
+
+    def _statement(self, parser, feature, lookup):
+        token = parser.next()
+        if token.startswith("@"):
+            parser.expect("=")
+            self.classes[token[1:]] = self._glyphs(parser.until(";"))
+        elif token == "lookup":
+            name = parser.next()
+            if parser.peek() == ";":
+                parser.next()
+                if feature is None or name not in self.lookups:
+                    raise FeaError(f"lookup {name} referenced outside a feature or before it is defined")
+                self.features[feature].append(self.lookups[name])
+                return
+            while parser.peek() != "{":
+                parser.next()           # useExtension
+            parser.next()
+            block = self._define_lookup(name)
+            if feature is not None:
+                self.features[feature].append(block)
+            while parser.peek() != "}":
+                self._statement(parser, feature, block)
+            parser.next()
+            parser.expect(name)
+            parser.expect(";")
+        elif token == "feature":
+            tag = parser.next()
+            if parser.peek() == ";":
+                parser.next()           # aalt: feature salt;
+                return
+            if self._wanted is not None and tag not in self._wanted:
+                parser.skip_block()
+                parser.expect(tag)
+                parser.expect(";")
+                return
+            parser.expect("{")
+            self.features.setdefault(tag, [])
+            while parser.peek() != "}":
+                self._statement(parser, tag, None)
+            parser.next()
+            parser.expect(tag)
+            parser.expect(";")
+        elif token in ("sub", "substitute", "ignore"):
+            if token == "ignore" and parser.peek() in ("sub", "substitute"):
+                parser.next()
+            self._rule(parser.until(";"), token == "ignore", feature, lookup)
+        elif token == "lookupflag":
+            flags = parser.until(";")
+            block = ("lookup", lookup.name) if lookup is not None else ("feature", feature)
+            if flags in (["0"], []):
+                self.flags.pop(block, None)
+            else:
+                self.flags[block] = flags
+        elif token == "table":
+            tag = parser.next()
+            depth = 0
+            while True:
+                item = parser.next()
+                depth += item == "{"
+                depth -= item == "}"
+                if item == "}" and depth == 0:
+                    break
+            parser.expect(tag)
+            parser.expect(";")
+        elif token in _IGNORED:
+            parser.until(";")
+        elif token in _IGNORED_BLOCKS:
+            parser.skip_block()
+            parser.expect(";")
+        else:
+            raise FeaError(f"unsupported statement {token!r}")
+
+    def _rule(self, tokens, ignore, feature, lookup):
+        flags = self.flags.get(("lookup", lookup.name) if lookup is not None else ("feature", feature))
+        if flags:
+            raise FeaError(f"lookupflag {' '.join(flags)} is not supported (sub {' '.join(tokens)})")
+        if "from" in tokens:
+            # sub a from [a.alt a.ss01];  →  the first alternate, as a shaper picks by default
+            split = tokens.index("from")
+            tokens = tokens[:split] + ["by", self._glyphs(tokens[split + 1:])[0]]
+        if "by" in tokens:
+            split = tokens.index("by")
+            before, after = tokens[:split], tokens[split + 1:]
+        else:
+            before, after = tokens, None
+        if ignore:
+            for context in _split(before, ","):
+                self._context_rule(self._sequence(context), None, feature, lookup)
+            return
+        positions = self._sequence(before)
+        if any(marked for _, marked, _ in positions):
+            self._context_rule(positions, after, feature, lookup)
+            return
+        if after is None:
+            raise FeaError(f"rule without 'by' or marked glyphs: sub {' '.join(tokens)}")
+        replacement = self._glyphs(after)
+        if len(positions) == 1 and len(positions[0][0]) == 1 and len(after) > 1 and "[" not in after:
+            kind, first, rule = "multiple", positions[0][0], replacement
+        elif len(positions) == 1:
+            kind, first = "single", positions[0][0]
+            if len(replacement) == 1:
+                replacement = replacement * len(first)
+            if len(replacement) != len(first):
+                raise FeaError(f"sub {' '.join(tokens)}: {len(first)} glyphs by {len(replacement)}")
+            rule = dict(zip(first, replacement))
+        else:
+            if len(replacement) != 1:
+                raise FeaError(f"sub {' '.join(tokens)}: only ligatures of one glyph are supported")
+            kind, first, rule = "ligature", positions[0][0], ([glyphs for glyphs, _, _ in positions], replacement[0])
+        target = lookup if lookup is not None else self._loose_lookup(feature, kind)
+        target.add(kind, first, rule)
+
+    def _context_rule(self, positions, replacement, feature, lookup):
+        marked = [index for index, (_, is_marked, _) in enumerate(positions) if is_marked]
+        if not marked and replacement is None:
+            raise FeaError("ignore rule without marked glyphs")
+        start, end = marked[0], marked[-1] + 1
+        backtrack = [frozenset(glyphs) for glyphs, _, _ in reversed(positions[:start])]
+        inputs = [frozenset(glyphs) for glyphs, _, _ in positions[start:end]]
+        lookahead = [frozenset(glyphs) for glyphs, _, _ in positions[end:]]
+        nested = []
+        for offset, (_, _, names) in enumerate(positions[start:end]):
+            for name in names:
+                if name not in self.lookups:
+                    raise FeaError(f"unknown lookup {name}")
+                nested.append((offset, self.lookups[name]))
+        if replacement is not None:
+            # sub a b' c by x;  →  a nested single substitution
+            inline = _Lookup(None)
+            glyphs, replaced = positions[start][0], self._glyphs(replacement)
+            inline.add("single", glyphs, dict(zip(glyphs, replaced * len(glyphs) if len(replaced) == 1 else replaced)))
+            nested.append((0, inline))
+        target = lookup if lookup is not None else self._loose_lookup(feature, "context")
+        target.add("context", inputs[0], (backtrack, inputs, lookahead, nested))
+
+    # ── shaping ──
+
+    def _apply_at(self, lookup, glyphs, i):
+        """Apply one lookup at glyph i. Returns the next position, or None if nothing matched."""
+        glyph = glyphs[i]
+        for position in lookup.candidates(glyph):
+            self.stats["rules"] += 1
+            kind, _, rule = lookup.rules[position]
+            if kind == "single":
+                glyphs[i] = rule[glyph]
+                return i + 1
+            if kind == "multiple":
+                glyphs[i:i + 1] = rule
+                return i + len(rule)
+            if kind == "ligature":
+                components, ligature = rule
+                if i + len(components) <= len(glyphs) and all(
+                        glyphs[i + j] in components[j] for j in range(1, len(components))):
+                    glyphs[i:i + len(components)] = [ligature]
+                    return i + 1
+                continue
+            backtrack, inputs, lookahead, nested = rule
+            if i < len(backtrack) or i + len(inputs) + len(lookahead) > len(glyphs):
+                continue
+            if (all(glyphs[i - 1 - j] in group for j, group in enumerate(backtrack))
+                    and all(glyphs[i + j] in group for j, group in enumerate(inputs))
+                    and all(glyphs[i + len(inputs) + j] in group for j, group in enumerate(lookahead))):
+                end = i + len(inputs)
+                for offset, inner in nested:
+                    before = len(glyphs)
+                    self._apply_at(inner, glyphs, i + offset)
+                    end -= before - len(glyphs)
+                return max(end, i + 1)
+        return None
+
+    def shape(self, glyphs, features=None):
+        """Glyph names after applying the given features (all if None)."""
+        glyphs = list(glyphs)
+        tags = list(self.features) if features is None else features
+        wanted = {id(lookup) for tag in tags for lookup in self.features.get(tag, ())}
+        self.stats["glyphs"] += len(glyphs)
+        for lookup in self.order:
+            if id(lookup) not in wanted:
+                continue
+            i = 0
+            while i < len(glyphs):
+                following = self._apply_at(lookup, glyphs, i)
+                i = following if following is not None else i + 1
+        return glyphs
+
+
+def _split(tokens, separator):
+    parts, current = [], []
+    for token in tokens:
+        if token == separator:
+            parts.append(current)
+            current = []
+        else:
+            current.append(token)
+    return parts + [current]
+
+
+_TEXT_TOKEN = re.compile(r"/([^\s/]+) ?|(.)", re.S)
+
+
+def text_tokens(text):
+    """(name, None) for each /name and (None, character) for other characters, as an Edit tab reads text."""
+    for match in _TEXT_TOKEN.finditer(text):
+        yield match.groups()
+
+
+def text_to_glyphs(font, text):
+    """Glyph names for text; /name picks a glyph by name, as in an Edit tab."""
+    cmap = {}
+    for glyph in font.glyphs:
+        for code in glyph.unicodes or ():
+            cmap.setdefault(chr(int(code, 16)), glyph.name)
+    glyphs = []
+    for name, char in text_tokens(text):
+        if name:
+            glyphs.append(name)
+        elif char in cmap:
+            glyphs.append(cmap[char])
+    return glyphs
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("font", help=".glyphs file")
+    parser.add_argument("corpus", help="text file, one run per line")
+    parser.add_argument("--features", nargs="+", help="features to apply (default: all)")
+    parser.add_argument("--save", help="write the shaped glyph names to this file")
+    parser.add_argument("--compare", help="earlier --save output; exit 1 if anything changed")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the statistics")
+    args = parser.parse_args(argv)
+
+    font = GSFont(args.font)
+    sim = GSUBSimulator.from_font(font, args.features)
+    with open(args.corpus, encoding="utf-8") as f:
+        lines = [line.rstrip("\n") for line in f]
+    output = [" ".join(sim.shape(text_to_glyphs(font, line), args.features)) for line in lines]
+    if not args.quiet:
+        print("\n".join(output))
+    glyphs = sim.stats["glyphs"]
+    print(f"{glyphs} glyphs, {sim.stats['rules']} rules tried, "
+          f"{sim.stats['rules'] / glyphs if glyphs else 0:.2f} per glyph", file=sys.stderr)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write("\n".join(output) + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            expected = f.read().splitlines()
+        changed = [number for number, (old, new) in enumerate(zip(expected, output), 1) if old != new]
+        if len(expected) != len(output):
+            changed.append(min(len(expected), len(output)) + 1)
+        if changed:
+            print(f"⚠️ {len(changed)} lines shape differently, first at line {changed[0]}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ Same output as " + args.compare, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Run the Macro Panel scripts of this repository against .glyphs files on disk.
+
+    python -m rolandhuse.headless RoundKerningby5inAllMasters.py Family-*.glyphs --in-place
+    python -m rolandhuse.headless GlyphsCaltBuilder.py Family.glyphs -o Out.glyphs --master Bold
+
+Scripts run unchanged: they get the same globals as in the Macro Panel
+(Glyphs, GSFont, GSGlyph, …) and `Glyphs.font` is the font read from disk.
+GlyphsApp, AppKit, vanilla and friends come from rolandhuse.standin.
+--profile FILE runs the scripts under cProfile. --glyph-ids gives glyphs
+UUIDs and keys glyph kerning by them as Glyphs does (files keep names), to
+catch scripts that look kerning up by glyph name.
+"""
+
+import argparse
+import cProfile
+import pstats
+import runpy
+import time
+
+from rolandhuse import glyphsfile, standin
+
+
+def install():
+    """Make GlyphsApp, AppKit, vanilla & co. importable. Returns the GlyphsApp module."""
+    return standin.install()
+
+
+def run_script(script_path, font, master=None, selection=None):
+    """Run a Macro Panel script with `font` as Glyphs.font. Returns its globals."""
+    app = install().Glyphs
+    app.fonts[:] = [font]
+    if master is not None:
+        font.selectedFontMaster = master
+    if selection:
+        master_id = font.selectedFontMaster.id
+        font.selectedLayers = [font.glyphs[name].layers[master_id]
+                               for name in selection if font.glyphs[name]]
+    return runpy.run_path(script_path, init_globals=standin.namespace(), run_name="__main__")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("script", help="Macro Panel script to run")
+    parser.add_argument("fonts", nargs="+", help=".glyphs files to run it on")
+    parser.add_argument("-o", "--output", help="where to save the result (one font only)")
+    parser.add_argument("--in-place", action="store_true", help="save each font over its source")
+    parser.add_argument("--master", help="name of the master to select (default: first)")
+    parser.add_argument("--select", help="comma separated glyph names to select")
+    parser.add_argument("--profile", metavar="FILE", help="profile the script runs, save pstats to FILE")
+    parser.add_argument("--glyph-ids", action="store_true", help="address glyphs by UUID in kerning, like Glyphs")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.fonts) > 1:
+        parser.error("--output needs exactly one font; use --in-place for batches")
+
+    selection = [name.strip() for name in args.select.split(",")] if args.select else None
+    profiler = cProfile.Profile() if args.profile else None
+    for path in args.fonts:
+        start = time.perf_counter()
+        font = glyphsfile.GSFont(path)
+        if args.glyph_ids:
+            font.use_glyph_ids()
+        master = None
+        if args.master:
+            master = next((m for m in font.masters if m.name == args.master), None)
+            if master is None:
+                print(f"⚠️ {path}: no master named {args.master}, skipping.")
+                continue
+        print(f"▶ {args.script} on {path}")
+        if profiler is not None:
+            profiler.enable()
+        run_script(args.script, font, master, selection)
+        if profiler is not None:
+            profiler.disable()
+        if args.output or args.in_place:
+            font.save(args.output or path)
+            print(f"💾 Saved {args.output or path}")
+        print(f"✅ {path} done in {time.perf_counter() - start:.2f}s")
+
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        print(f"💾 Saved profile to {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Find kerning pairs whose keys point nowhere.
+
+The valid keys are worked out once per font: every glyph name (and id),
+@MMK_L_ keys of right groups that have members and @MMK_R_ keys of left
+groups that have members. Checking a pair is then two set lookups, and
+find_orphans() checks every pair of every master as one array operation.
+
+    keys = KerningKeys(font)
+    keys.is_valid_left("@MMK_L_T")    # False if no glyph has right group T
+    for orphan in find_orphans(font):
+        print(orphan.master_id, orphan.left, orphan.right, orphan.reason)
+"""
+
+from collections import namedtuple
+
+from rolandhuse.snapshot import LEFT_PREFIX, RIGHT_PREFIX, FontSnapshot
+
+Orphan = namedtuple("Orphan", "master_id left right value reason")
+
+UNKNOWN_GLYPH = "unknown glyph"
+EMPTY_GROUP = "group without members"
+WRONG_SIDE = "group key on the wrong side"
+
+
+class KerningKeys(object):
+    """Sets of the keys that are valid on each side of a kerning pair."""
+
+    def __init__(self, font):
+        snap = FontSnapshot(font)
+        names = set(snap.glyphs) | set(snap.by_id)
+        self.glyphs = frozenset(names)
+        self.left = frozenset(names | {LEFT_PREFIX + group for group in snap.right_groups})
+        self.right = frozenset(names | {RIGHT_PREFIX + group for group in snap.left_groups})
+
+    def is_valid_left(self, key):
+        return key in self.left
+
+    def is_valid_right(self, key):
+        return key in self.right
+
+    def problem(self, key, first_side=True):
+        """Why `key` is not valid on that side of a pair, or None if it is."""
+        if key in (self.left if first_side else self.right):
+            return None
+        wrong, right = (RIGHT_PREFIX, LEFT_PREFIX) if first_side else (LEFT_PREFIX, RIGHT_PREFIX)
+        if key.startswith(wrong):
+            return WRONG_SIDE
+        if key.startswith(right):
+            return EMPTY_GROUP
+        return UNKNOWN_GLYPH
+
+
+def find_orphans(font, master_ids=None, keys=None):
+    """Orphan pairs of all masters (or `master_ids`), in kerning order."""
+    import numpy as np
+    from rolandhuse.kerningmatrix import FontKerning
+
+    keys = keys or KerningKeys(font)
+    kerning = FontKerning(font)
+    master_ids = master_ids or [master.id for master in font.masters]
+    matrices = [(master_id, kerning[master_id]) for master_id in master_ids]
+
+    # One check per distinct key, shared by all masters
+    left_problems = [keys.problem(key, True) for key in kerning.left.keys]
+    right_problems = [keys.problem(key, False) for key in kerning.right.keys]
+    left_bad = np.array([problem is not None for problem in left_problems], dtype=bool)
+    right_bad = np.array([problem is not None for problem in right_problems], dtype=bool)
+
+    orphans = []
+    for master_id, matrix in matrices:
+        if not len(matrix):
+            continue
+        left_ids = matrix.left_ids()
+        bad = np.flatnonzero(left_bad[left_ids] | right_bad[matrix.indices])
+        for left_id, right_id, value in zip(
+                left_ids[bad].tolist(), matrix.indices[bad].tolist(), matrix.values[bad].tolist()):
+            reason = left_problems[left_id] or right_problems[right_id]
+            side = "left" if left_problems[left_id] else "right"
+            orphans.append(Orphan(master_id, kerning.left[left_id], kerning.right[right_id],
+                                  int(value) if value == int(value) else value, f"{side}: {reason}"))
+    return orphans
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Write many kerning changes to a font at once.
+
+font.setKerningForPair() is one bridge call and one interface update per
+pair. commit_kerning() merges all changes into a copy of font.kerning and
+assigns it back in a single step, with the interface updates paused:
+
+    commit_kerning(font, {master.id: {"@MMK_L_T": {"@MMK_R_o": -60, "a": None}}})
+
+A value of None removes the pair. With replace=True the given kerning
+becomes the master's whole kerning. Keys are font.kerning keys, so glyph ids
+for glyph-level pairs inside Glyphs. If the font refuses the assignment the
+changes are applied pair by pair instead, with glyph ids turned back into
+the names setKerningForPair() expects.
+"""
+
+
+def kerning_delta(old, new):
+    """{left: {right: value}} changes that turn `old` into `new` (None = removed)."""
+    delta = {}
+    for left, row in new.items():
+        old_row = old.get(left) or {}
+        changed = {right: value for right, value in row.items() if old_row.get(right) != value}
+        removed = {right: None for right in old_row if right not in row}
+        if changed or removed:
+            delta[left] = {**changed, **removed}
+    for left, old_row in old.items():
+        if left not in new and old_row:
+            delta[left] = dict.fromkeys(old_row)
+    return delta
+
+
+def _merge(rows, changes):
+    merged = {left: dict(row) for left, row in rows.items()}
+    for left, row in changes.items():
+        target = merged.setdefault(left, {})
+        for right, value in row.items():
+            if value is None:
+                target.pop(right, None)
+            else:
+                target[right] = value
+        if not target:
+            del merged[left]
+    return merged
+
+
+def _pair_key(font, key):
+    if key.startswith("@"):
+        return key
+    glyph = font.glyphForId_(key)
+    return glyph.name if glyph is not None else key
+
+
+def _apply_pairwise(font, master_id, changes, replace):
+    if replace:
+        for left, row in list((font.kerning.get(master_id) or {}).items()):
+            for right in list(row):
+                if right not in changes.get(left, {}):
+                    font.removeKerningForPair(master_id, _pair_key(font, left), _pair_key(font, right))
+    for left, row in changes.items():
+        for right, value in row.items():
+            if value is None:
+                font.removeKerningForPair(master_id, _pair_key(font, left), _pair_key(font, right))
+            else:
+                font.setKerningForPair(master_id, _pair_key(font, left), _pair_key(font, right), value)
+
+
+def commit_kerning(font, changes, replace=False):
+    """Apply {master id: {left: {right: value or None}}} in one transaction.
+
+    Returns the number of pairs set or removed.
+    """
+    count = sum(len(row) for rows in changes.values() for row in rows.values())
+    if not count and not replace:
+        return 0
+    font.disableUpdateInterface()
+    try:
+        kerning = dict(font.kerning)
+        for master_id, rows in changes.items():
+            current = {} if replace else (kerning.get(master_id) or {})
+            kerning[master_id] = _merge(current, rows)
+        try:
+            font.kerning = kerning
+        except Exception as e:
+            print(f"⚠️ Bulk kerning assignment failed ({e}), setting pairs one by one.")
+            for master_id, rows in changes.items():
+                _apply_pairwise(font, master_id, rows, replace)
+    finally:
+        font.enableUpdateInterface()
+    return count
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Drop kerning pairs that do not change anything.
+
+A pair is redundant if removing it leaves every glyph pair it covers with
+the same value, in every master where it exists. Exceptions fall back to
+less specific pairs in Glyphs' order:
+
+    glyph–glyph → glyph–group → group–glyph → group–group → 0
+
+so an exception equal to the value it falls back to, or a group–group
+pair of 0, can go. Pairs are checked from least to most specific, each
+against the kerning as it is after the earlier removals, and a pair is
+only removed if it is redundant in all masters, so interpolation stays the
+same. Pairs with unknown keys are left alone (see kerningcheck). Glyph
+keys, which font.kerning holds as glyph ids inside Glyphs, are compared and
+reported as glyph names.
+
+    report = compact_kerning(font)
+    print(report["removed"], report["zeros"])
+    print(gpos_size(font, master.id))     # (bytes, subtables), needs fontTools
+
+or from the shell:
+
+    python -m rolandhuse.kerningcompact Family.glyphs --gpos --in-place
+"""
+
+import argparse
+import io
+
+from rolandhuse.kerningcheck import KerningKeys
+from rolandhuse.kerningcommit import commit_kerning
+from rolandhuse.snapshot import FontSnapshot
+
+try:
+    from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+    from fontTools.ttLib import TTFont
+except ImportError:  # GPOS sizes are optional
+    TTFont = None
+
+
+def _specificity(pair):
+    left, right = pair
+    return (not left.startswith("@")) * 2 + (not right.startswith("@"))
+
+
+class _Fallbacks(object):
+    """Answers "what would this glyph pair get without that kerning pair?"."""
+
+    def __init__(self, snap, rows):
+        self.snap = snap
+        self.rows = rows            # {master id: {left: {right: value}}}, edited live
+
+    def value(self, master_id, left, right):
+        if left is None or right is None:
+            return None
+        return self.rows[master_id].get(left, {}).get(right)
+
+    def _first(self, master_id, candidates):
+        for left, right in candidates:
+            value = self.value(master_id, left, right)
+            if value is not None:
+                return value
+        return 0
+
+    def _group_keys(self, left, right):
+        """(@MMK_L_ key of the left glyph, @MMK_R_ key of the right glyph) or None."""
+        left_group = self.snap.left_key(left) if not left.startswith("@") else left
+        right_group = self.snap.right_key(right) if not right.startswith("@") else right
+        return (left_group if left_group.startswith("@") else None,
+                right_group if right_group.startswith("@") else None)
+
+    def is_redundant(self, master_id, left, right):
+        value = self.rows[master_id][left][right]
+        left_is_group, right_is_group = left.startswith("@"), right.startswith("@")
+        if left_is_group and right_is_group:
+            return value == 0
+        if left_is_group:
+            _, right_group = self._group_keys(left, right)
+            return value == self._first(master_id, [(left, right_group)])
+        left_group, _ = self._group_keys(left, right)
+        if right_is_group:
+            # Glyph–group: every member without its own glyph–glyph pair
+            row = self.rows[master_id].get(left, {})
+            for member in self.snap.members(right):
+                if member in row:
+                    continue
+                if value != self._first(master_id, [(left_group, member), (left_group, right)]):
+                    return False
+            return True
+        left_group, right_group = self._group_keys(left, right)
+        return value == self._first(master_id, [(left, right_group), (left_group, right), (left_group, right_group)])
+
+
+def compact_kerning(font, master_ids=None, apply=True):
+    """Remove redundant pairs from all masters. Returns a report dict.
+
+    report["removed"] lists (left, right) pairs, report["zeros"] counts the
+    0 values among them per master. With apply=False nothing is changed.
+    """
+    snap = FontSnapshot(font)
+    keys = KerningKeys(font)
+    master_ids = list(master_ids or [master.id for master in font.masters])
+    # Rows by glyph name and group key; changes are written back under font.kerning keys
+    rows = {master_id: {snap.key_name(left): {snap.key_name(right): value for right, value in row.items()}
+                        for left, row in (font.kerning.get(master_id) or {}).items()}
+            for master_id in master_ids}
+    fallbacks = _Fallbacks(snap, rows)
+
+    pairs = {}
+    for master_id in master_ids:
+        for left, row in rows[master_id].items():
+            for right in row:
+                pairs[(left, right)] = None
+
+    removed, zeros, changes = [], dict.fromkeys(master_ids, 0), {master_id: {} for master_id in master_ids}
+    for left, right in sorted(pairs, key=_specificity):
+        if not (keys.is_valid_left(left) and keys.is_valid_right(right)):
+            continue
+        present = [master_id for master_id in master_ids if right in rows[master_id].get(left, ())]
+        if not all(fallbacks.is_redundant(master_id, left, right) for master_id in present):
+            continue
+        removed.append((left, right))
+        for master_id in present:
+            row = rows[master_id][left]
+            if row.pop(right) == 0:
+                zeros[master_id] += 1
+            changes[master_id].setdefault(snap.key_id(left), {})[snap.key_id(right)] = None
+
+    if apply and removed:
+        commit_kerning(font, changes)
+    return {
+        "removed": removed,
+        "zeros": zeros,
+        "pairs": {master_id: sum(len(row) for row in (font.kerning.get(master_id) or {}).values())
+                  for master_id in master_ids} if apply else None,
+    }
+
+
+# ── GPOS size ────────────────────────────────────────────────────────────────
+
+def _glyph(name):
+    return "\\" + name
+
+
+def kerning_fea(font, kerning):
+    """Feature code for one master's kerning, the way Glyphs orders it."""
+    snap = FontSnapshot(font)
+    keys = KerningKeys(font)
+    classes, lines = {}, {0: [], 1: [], 2: [], 3: []}
+    for left, row in kerning.items():
+        if not keys.is_valid_left(left):
+            continue
+        left = snap.key_name(left)
+        for right, value in row.items():
+            if not keys.is_valid_right(right):
+                continue
+            right = snap.key_name(right)
+            for key in (left, right):
+                if key.startswith("@") and key not in classes:
+                    classes[key] = f"{key} = [{' '.join(_glyph(name) for name in snap.members(key))}];"
+            level = _specificity((left, right))
+            first = left if left.startswith("@") else _glyph(left)
+            second = right if right.startswith("@") else _glyph(right)
+            enum = "enum " if level in (1, 2) else ""
+            lines[level].append(f"    {enum}pos {first} {second} {round(value)};")
+    body = lines[3] + lines[2] + lines[1] + lines[0]
+    return "\n".join(list(classes.values()) + ["feature kern {"] + body + ["} kern;"])
+
+
+def gpos_size(font, master_id, kerning=None):
+    """(bytes, subtables) of the GPOS table compiled from a master's kerning.
+
+    None if fontTools is not available.
+    """
+    if TTFont is None:
+        return None
+    if kerning is None:
+        kerning = font.kerning.get(master_id) or {}
+    tt = TTFont()
+    tt.setGlyphOrder([".notdef"] + [glyph.name for glyph in font.glyphs])
+    addOpenTypeFeaturesFromString(tt, kerning_fea(font, kerning), tables={"GPOS"})
+    if "GPOS" not in tt:
+        return (0, 0)
+    stream = io.BytesIO()
+    tt.save(stream)  # splits overflowing subtables the way a font build does
+    stream.seek(0)
+    data = TTFont(stream, lazy=True).reader["GPOS"]
+    subtables = sum(len(lookup.SubTable) for lookup in tt["GPOS"].table.LookupList.Lookup)
+    return (len(data), subtables)
+
+
+def print_report(font, report, sizes_before=None):
+    """Print what compact_kerning() removed and, if given, the GPOS savings."""
+    print(f"Removed {len(report['removed'])} redundant pairs.")
+    for master in font.masters:
+        if master.id not in report["zeros"]:
+            continue
+        line = f"  {master.name}: {report['zeros'][master.id]} of them 0"
+        before = (sizes_before or {}).get(master.id)
+        after = gpos_size(font, master.id) if before else None
+        if before and after:
+            line += (f", GPOS {before[0]} → {after[0]} bytes ({before[0] - after[0]} less),"
+                     f" {before[1]} → {after[1]} subtables")
+        print(line)
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="+", help=".glyphs files")
+    parser.add_argument("--gpos", action="store_true", help="report GPOS sizes (needs fontTools)")
+    parser.add_argument("-o", "--output", help="where to save the result (one font only)")
+    parser.add_argument("--in-place", action="store_true", help="save each font over its source")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.fonts) > 1:
+        parser.error("--output needs exactly one font; use --in-place for batches")
+
+    for path in args.fonts:
+        font = GSFont(path)
+        sizes = {master.id: gpos_size(font, master.id) for master in font.masters} if args.gpos else None
+        print(f"▶ {path}")
+        print_report(font, compact_kerning(font), sizes)
+        if args.output or args.in_place:
+            font.save(args.output or path)
+            print(f"💾 Saved {args.output or path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Run kerning transforms on all masters in parallel (headless runs only).
+
+The kerning of each master is independent, so every master becomes one job
+in a process pool. Transforms are (name, *arguments) tuples applied in order:
+
+    ("round", 5)                     round to multiples of 5
+    ("offset", -10)                  add to every value
+    ("scale", 0.9)                   multiply every value
+    ("clamp", -300, 300)             limit values
+    ("prune_zeros",)                 drop 0 pairs
+    ("validate", left, right)        drop pairs whose keys are not in the
+                                     given sets, report them as orphans
+
+    report = run_master_jobs(font, [("round", 5), ("prune_zeros",)])
+
+or from the shell:
+
+    python -m rolandhuse.kerningjobs Family.glyphs --round 5 --prune-zeros --in-place
+
+Results are merged back with one commit_kerning() call. Inside Glyphs, use
+the single-process path (processes=1).
+"""
+
+import argparse
+import concurrent.futures
+import os
+import time
+
+import numpy as np
+
+from rolandhuse.kerningcheck import KerningKeys
+from rolandhuse.kerningcommit import commit_kerning
+from rolandhuse.kerningmatrix import KerningMatrix
+
+
+def _round(matrix, report, step=5):
+    return matrix.rounded(step)
+
+
+def _offset(matrix, report, delta):
+    return matrix.offset(delta)
+
+
+def _scale(matrix, report, factor):
+    return matrix.scaled(factor)
+
+
+def _clamp(matrix, report, low=None, high=None):
+    return matrix.clamped(low, high)
+
+
+def _prune_zeros(matrix, report):
+    pruned = matrix.without_zeros()
+    report["zeros"] = report.get("zeros", 0) + len(matrix) - len(pruned)
+    return pruned
+
+
+def _validate(matrix, report, valid_left, valid_right):
+    left_ok = np.fromiter((key in valid_left for key in matrix.left.keys), bool, len(matrix.left))
+    right_ok = np.fromiter((key in valid_right for key in matrix.right.keys), bool, len(matrix.right))
+    keep = left_ok[matrix.left_ids()] & right_ok[matrix.indices]
+    orphans = matrix.where(~keep)
+    report.setdefault("orphans", []).extend(
+        (left, right, value) for left, right, value in orphans.pairs())
+    return matrix.where(keep)
+
+
+TRANSFORMS = {
+    "round": _round,
+    "offset": _offset,
+    "scale": _scale,
+    "clamp": _clamp,
+    "prune_zeros": _prune_zeros,
+    "validate": _validate,
+}
+
+
+def transform_kerning(kerning, transforms):
+    """Apply `transforms` to one master's {left: {right: value}}. Returns (kerning, report)."""
+    matrix = KerningMatrix.from_dict(kerning)
+    report = {"pairs": len(matrix)}
+    for name, *arguments in transforms:
+        if name not in TRANSFORMS:
+            raise ValueError(f"Unknown kerning transform: {name}")
+        matrix = TRANSFORMS[name](matrix, report, *arguments)
+    report["result"] = len(matrix)
+    return matrix.to_dict(), report
+
+
+def _job(master_id, kerning, transforms):
+    return master_id, transform_kerning(kerning, transforms)
+
+
+def run_master_jobs(font, transforms, master_ids=None, processes=None):
+    """Transform the kerning of every master (or `master_ids`) and write it back.
+
+    Returns {master id: report}. processes=None uses one worker per master up
+    to the number of CPUs; processes=1 runs in this process.
+    """
+    master_ids = list(master_ids or [master.id for master in font.masters])
+    jobs = [(master_id, font.kerning.get(master_id) or {}, transforms) for master_id in master_ids]
+    processes = min(processes or os.cpu_count() or 1, len(jobs))
+    if processes <= 1:
+        results = [_job(*job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(_job, *zip(*jobs)))
+    commit_kerning(font, {master_id: kerning for master_id, (kerning, _) in results}, replace=True)
+    return {master_id: report for master_id, (_, report) in results}
+
+
+def main(argv=None):
+    from rolandhuse.glyphsfile import GSFont
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="+", help=".glyphs files")
+    parser.add_argument("--round", type=float, metavar="STEP", help="round values to multiples of STEP")
+    parser.add_argument("--offset", type=float, help="add to every value")
+    parser.add_argument("--scale", type=float, help="multiply every value")
+    parser.add_argument("--clamp", type=float, nargs=2, metavar=("LOW", "HIGH"))
+    parser.add_argument("--prune-zeros", action="store_true", help="drop 0 pairs")
+    parser.add_argument("--validate", action="store_true", help="drop and report pairs with unknown keys")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per master)")
+    parser.add_argument("-o", "--output", help="where to save the result (one font only)")
+    parser.add_argument("--in-place", action="store_true", help="save each font over its source")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.fonts) > 1:
+        parser.error("--output needs exactly one font; use --in-place for batches")
+
+    for path in args.fonts:
+        start = time.perf_counter()
+        font = GSFont(path)
+        transforms = []
+        if args.validate:
+            keys = KerningKeys(font)
+            transforms.append(("validate", keys.left, keys.right))
+        for name in ("scale", "offset", "clamp", "round"):
+            value = getattr(args, name)
+            if value is not None:
+                transforms.append((name,) + (tuple(value) if isinstance(value, list) else (value,)))
+        if args.prune_zeros:
+            transforms.append(("prune_zeros",))
+
+        reports = run_master_jobs(font, transforms, processes=args.jobs)
+        for master in font.masters:
+            report = reports.get(master.id)
+            if report is None:
+                continue
+            print(f"{master.name}: {report['pairs']} → {report['result']} pairs")
+            for left, right, value in report.get("orphans", []):
+                print(f"  ⚠️ orphan {left} → {right}: {value}")
+        if args.output or args.in_place:
+            font.save(args.output or path)
+            print(f"💾 Saved {args.output or path}")
+        print(f"✅ {path} done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Master kerning as NumPy arrays, for operations over all pairs at once.
+
+font.kerning[master_id] is a dict of dicts; walking it pair by pair in Python
+is what makes rounding or scaling 100k+ pairs slow. A KerningMatrix holds one
+master in CSR form: kerning keys are interned to integers, each left key owns
+a slice of right-key ids and values.
+
+    kerning = FontKerning(font)
+    for master in font.masters:
+        kerning[master.id] = kerning[master.id].rounded(5).without_zeros()
+    kerning.write()                   # one assignment per changed master
+
+Matrices are immutable: operations return new matrices that share the key
+structure when they can. All masters of a FontKerning share one key index, so
+pair ids can be compared across masters.
+"""
+
+import numpy as np
+
+from rolandhuse.kerningcommit import commit_kerning
+
+
+class KeyIndex(object):
+    """Kerning keys interned to consecutive integers."""
+
+    def __init__(self, keys=()):
+        self.keys = []
+        self.ids = {}
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key):
+        key_id = self.ids.get(key)
+        if key_id is None:
+            key_id = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return key_id
+
+    def get(self, key):
+        return self.ids.get(key)
+
+    def __getitem__(self, key_id):
+        return self.keys[key_id]
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class KerningMatrix(object):
+    """One master's kerning: rows of left keys, each a slice of (right id, value).
+
+    row_keys[row] is the left key id of a row; indices[indptr[row]:indptr[row + 1]]
+    are its right key ids and values[...] the matching values.
+    """
+
+    def __init__(self, left, right, row_keys, indptr, indices, values):
+        self.left = left
+        self.right = right
+        self.row_keys = row_keys
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, kerning, left=None, right=None):
+        """Build from {left key: {right key: value}}, interning into `left`/`right`."""
+        left = left if left is not None else KeyIndex()
+        right = right if right is not None else KeyIndex()
+        intern_left, intern_right = left.intern, right.intern
+        row_keys, counts, indices, values = [], [], [], []
+        for left_key, row in kerning.items():
+            if not row:
+                continue
+            row_keys.append(intern_left(left_key))
+            counts.append(len(row))
+            indices.extend([intern_right(key) for key in row])
+            values.extend(row.values())
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(left, right,
+                   np.array(row_keys, dtype=np.int64), indptr,
+                   np.array(indices, dtype=np.int64), np.array(values, dtype=np.float64))
+
+    @classmethod
+    def empty(cls, left=None, right=None):
+        return cls.from_dict({}, left, right)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"<KerningMatrix {len(self.row_keys)} rows, {len(self)} pairs>"
+
+    # ── reading ──────────────────────────────────────────────────────────────
+
+    def left_ids(self):
+        """Left key id of every pair (the rows expanded)."""
+        return np.repeat(self.row_keys, np.diff(self.indptr))
+
+    def codes(self):
+        """One int64 per pair, unique for its (left id, right id)."""
+        return (self.left_ids() << 32) | self.indices
+
+    def get(self, left_key, right_key, default=None):
+        left_id, right_id = self.left.get(left_key), self.right.get(right_key)
+        if left_id is None or right_id is None:
+            return default
+        rows = np.flatnonzero(self.row_keys == left_id)
+        if not len(rows):
+            return default
+        start, end = self.indptr[rows[0]], self.indptr[rows[0] + 1]
+        hits = np.flatnonzero(self.indices[start:end] == right_id)
+        return _plain(self.values[start + hits[:1]])[0] if len(hits) else default
+
+    def pairs(self):
+        """Yield (left key, right key, value)."""
+        left_keys, right_keys = self.left.keys, self.right.keys
+        indices, values = self.indices.tolist(), _plain(self.values)
+        for row, left_id in enumerate(self.row_keys.tolist()):
+            left_key = left_keys[left_id]
+            for position in range(self.indptr[row], self.indptr[row + 1]):
+                yield left_key, right_keys[indices[position]], values[position]
+
+    def to_dict(self):
+        """{left key: {right key: value}} with ints for whole values."""
+        left_keys, right_keys = self.left.keys, self.right.keys
+        right_names = [right_keys[index] for index in self.indices.tolist()]
+        values = _plain(self.values)
+        bounds = self.indptr.tolist()
+        kerning = {}
+        for row, left_id in enumerate(self.row_keys.tolist()):
+            start, end = bounds[row], bounds[row + 1]
+            if start < end:
+                kerning[left_keys[left_id]] = dict(zip(right_names[start:end], values[start:end]))
+        return kerning
+
+    # ── vectorized operations ────────────────────────────────────────────────
+
+    def with_values(self, values):
+        """Same pairs, new values (array of len(self))."""
+        return KerningMatrix(self.left, self.right, self.row_keys, self.indptr, self.indices,
+                             np.asarray(values, dtype=np.float64))
+
+    def rounded(self, step=5):
+        """Values rounded to multiples of `step`, half to even like round()."""
+        return self.with_values(np.round(self.values / step) * step)
+
+    def scaled(self, factor):
+        return self.with_values(self.values * factor)
+
+    def offset(self, delta):
+        return self.with_values(self.values + delta)
+
+    def clamped(self, low=None, high=None):
+        return self.with_values(np.clip(self.values, low, high))
+
+    def where(self, mask):
+        """Only the pairs where `mask` (bool array of len(self)) is true."""
+        mask = np.asarray(mask, dtype=bool)
+        kept = np.concatenate(([0], np.cumsum(mask)))
+        indptr = kept[self.indptr]
+        rows = np.flatnonzero(np.diff(indptr))
+        return KerningMatrix(self.left, self.right, self.row_keys[rows],
+                             np.concatenate(([0], indptr[rows + 1])).astype(np.int64),
+                             self.indices[mask], self.values[mask])
+
+    def without_zeros(self):
+        return self.where(self.values != 0)
+
+    def changed(self, other):
+        """Mask of pairs whose value in `other` (same pairs) differs from ours."""
+        if other.indices is not self.indices and not np.array_equal(other.indices, self.indices):
+            raise ValueError("changed() needs two matrices with the same pairs")
+        return self.values != other.values
+
+    def copy(self):
+        return KerningMatrix(self.left, self.right, self.row_keys.copy(), self.indptr.copy(),
+                             self.indices.copy(), self.values.copy())
+
+
+class FontKerning(object):
+    """KerningMatrix per master of a font, loaded on first use, written back in one go."""
+
+    def __init__(self, font):
+        self.font = font
+        self.left = KeyIndex()
+        self.right = KeyIndex()
+        self._matrices = {}
+        self._changed = set()
+
+    def __getitem__(self, master_id):
+        matrix = self._matrices.get(master_id)
+        if matrix is None:
+            kerning = self.font.kerning.get(master_id) or {}
+            matrix = self._matrices[master_id] = KerningMatrix.from_dict(kerning, self.left, self.right)
+        return matrix
+
+    def __setitem__(self, master_id, matrix):
+        if matrix.left is not self.left or matrix.right is not self.right:
+            matrix = KerningMatrix.from_dict(matrix.to_dict(), self.left, self.right)
+        self._matrices[master_id] = matrix
+        self._changed.add(master_id)
+
+    def copy(self, source_id, target_id):
+        """Replace the kerning of master `target_id` with that of `source_id`."""
+        self[target_id] = self[source_id].copy()
+        return self[target_id]
+
+    def write(self):
+        """Write all changed masters back to font.kerning. Returns their ids."""
+        if not self._changed:
+            return []
+        commit_kerning(self.font, {master_id: self._matrices[master_id].to_dict()
+                                   for master_id in self._changed}, replace=True)
+        written, self._changed = sorted(self._changed), set()
+        return written
+
+
+def _plain(values):
+    """Python numbers for an array, ints for the whole values."""
+    if np.array_equal(values, np.trunc(values)):
+        return values.astype(np.int64).tolist()
+    return [int(value) if value.is_integer() else value for value in values.tolist()]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+The kerning value Glyphs actually applies between two glyphs.
+
+For glyphs L and R the first pair that exists wins:
+
+    L–R → L–@MMK_R_(R's left group) → @MMK_L_(L's right group)–R → group–group
+
+and no pair means 0. The kerning rows of a left glyph and of its group are
+looked up once per master and kept, so resolving many pairs is a few dict
+lookups each. Glyphs are passed and reported by name; font.kerning keys
+glyph-level pairs by glyph id, which the resolver translates:
+
+    resolver = KerningResolver(font)
+    resolver.value(master.id, "T", "o")             # -60
+    resolver.source(master.id, "T", "o")            # ("@MMK_L_T", "@MMK_R_o")
+    resolver.values("T", "o")                       # {master id: value}
+    resolver.batch([("T", "o"), ("V", "a")], master.id)
+
+Call clear() after changing kerning or groups.
+"""
+
+from rolandhuse.snapshot import LEFT_PREFIX, RIGHT_PREFIX, snapshot
+
+
+class KerningResolver(object):
+
+    def __init__(self, font, snap=None):
+        self.font = font
+        self.snap = snap or snapshot(font)
+        self._left = {}         # (master id, left glyph) → (glyph row, group row, group key)
+        self._right = {}        # right glyph → (its font.kerning key, @MMK_R_ key or None)
+
+    def clear(self):
+        self._left.clear()
+        self._right.clear()
+
+    def _left_rows(self, master_id, left):
+        cached = self._left.get((master_id, left))
+        if cached is None:
+            kerning = self.font.kerning.get(master_id) or {}
+            glyph = self.snap.glyph(left)
+            group = glyph.rightKerningGroup if glyph is not None else None
+            group_key = LEFT_PREFIX + group if group else None
+            cached = self._left[(master_id, left)] = (
+                kerning.get(glyph.id if glyph is not None else left) or {},
+                (kerning.get(group_key) or {}) if group_key else {},
+                group_key,
+            )
+        return cached
+
+    def _right_keys(self, right):
+        try:
+            return self._right[right]
+        except KeyError:
+            glyph = self.snap.glyph(right)
+            if glyph is None:
+                keys = self._right[right] = (right, None)
+            else:
+                group = glyph.leftKerningGroup
+                keys = self._right[right] = (glyph.id, RIGHT_PREFIX + group if group else None)
+            return keys
+
+    def lookup(self, master_id, left, right):
+        """(value, left key, right key) of the pair that applies, or (0, None, None).
+
+        Glyph-level keys come back as glyph names.
+        """
+        glyph_row, group_row, left_group = self._left_rows(master_id, left)
+        right_id, right_group = self._right_keys(right)
+        if glyph_row:
+            if right_id in glyph_row:
+                return glyph_row[right_id], left, right
+            if right_group is not None and right_group in glyph_row:
+                return glyph_row[right_group], left, right_group
+        if group_row:
+            if right_id in group_row:
+                return group_row[right_id], left_group, right
+            if right_group is not None and right_group in group_row:
+                return group_row[right_group], left_group, right_group
+        return 0, None, None
+
+    def value(self, master_id, left, right):
+        """Kerning applied between glyphs `left` and `right` in a master (0 if none)."""
+        return self.lookup(master_id, left, right)[0]
+
+    def source(self, master_id, left, right):
+        """(left key, right key) of the kerning pair that applies, or None."""
+        _, left_key, right_key = self.lookup(master_id, left, right)
+        return (left_key, right_key) if left_key is not None else None
+
+    def values(self, left, right):
+        """{master id: applied value} for all masters."""
+        return {master.id: self.lookup(master.id, left, right)[0] for master in self.font.masters}
+
+    def batch(self, pairs, master_id=None):
+        """Applied values for a list of (left, right) glyph pairs.
+
+        With a master id, a list of values; without, a list of {master id: value}.
+        """
+        if master_id is not None:
+            lookup = self.lookup
+            return [lookup(master_id, left, right)[0] for left, right in pairs]
+        master_ids = [master.id for master in self.font.masters]
+        return [{each: self.lookup(each, left, right)[0] for each in master_ids} for left, right in pairs]
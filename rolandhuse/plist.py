@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Reader and writer for the OpenStep property list dialect used by .glyphs files.
+
+Values map to plain Python types: dict, list, str, int, float and bytes.
+Keys listed in `lazy_keys` are not decoded while loading: their raw text is
+kept as a Deferred and only parsed when somebody asks for it. Deferred values
+that were never touched are written back byte for byte.
+"""
+
+import re
+
+_WHITESPACE = re.compile(rb"\s*")
+_BARE = re.compile(rb'[^\s{}()<>=;,"]+')
+_QUOTED = re.compile(rb'"((?:[^"\\]|\\.)*)"', re.S)
+_DATA = re.compile(rb"<([0-9A-Fa-f\s]*)>")
+_EMPTY = re.compile(rb"[({]\s*[)}]")
+# Everything up to the next bracket or string, including innermost "(…)"
+# groups such as nodes and points, so skipping a value only loops in Python
+# for the brackets that actually nest.
+_FLAT = re.compile(rb'(?:[^(){}"<]+|\([^(){}"<]*\))*')
+
+_INT = re.compile(r"-?(?:0|[1-9][0-9]*)\Z")
+_FLOAT = re.compile(r"-?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?\Z")
+_SAFE = re.compile(r"[A-Za-z0-9_.]+\Z")
+_ESCAPE = re.compile(r'\\(?:U([0-9A-Fa-f]{4})|([0-7]{3})|(.))', re.S)
+_NEEDS_ESCAPE = re.compile(r'[\\"]')
+_SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+class PlistError(ValueError):
+    """Raised for malformed property list text."""
+
+    def __init__(self, message, buffer=None, pos=None):
+        if buffer is not None and pos is not None:
+            line = buffer[:pos].count(b"\n") + 1
+            message = f"{message} (line {line}, offset {pos})"
+        super().__init__(message)
+        self.pos = pos
+
+
+class Deferred(object):
+    """A value that has not been decoded yet: a slice of the source buffer."""
+
+    __slots__ = ("buffer", "start", "end", "lazy_keys")
+
+    def __init__(self, buffer, start, end, lazy_keys=frozenset()):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.lazy_keys = lazy_keys
+
+    def resolve(self):
+        """Parse and return the value."""
+        value, _ = parse_value(self.buffer, self.start, self.lazy_keys)
+        return value
+
+    def raw(self):
+        """Return the undecoded source bytes."""
+        return bytes(self.buffer[self.start:self.end])
+
+    def is_empty(self):
+        """True for an empty list or dictionary, checked without decoding."""
+        match = _EMPTY.match(self.buffer, self.start)
+        return match is not None and match.end() == self.end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"<Deferred {self.start}:{self.end}>"
+
+
+def resolve(value):
+    """Return `value` decoded if it is a Deferred, unchanged otherwise."""
+    if isinstance(value, Deferred):
+        return value.resolve()
+    return value
+
+
+# ── reading ──────────────────────────────────────────────────────────────────
+
+def loads(buffer, lazy_keys=frozenset()):
+    """Parse a whole property list from bytes (or any buffer, e.g. mmap)."""
+    if isinstance(buffer, str):
+        buffer = buffer.encode("utf-8")
+    value, pos = parse_value(buffer, 0, frozenset(lazy_keys))
+    pos = _WHITESPACE.match(buffer, pos).end()
+    if pos != len(buffer):
+        raise PlistError("Unexpected trailing data", buffer, pos)
+    return value
+
+
+def load(path, lazy_keys=frozenset()):
+    """Parse the property list stored at `path`."""
+    with open(path, "rb") as f:
+        return loads(f.read(), lazy_keys)
+
+
+def parse_value(buffer, pos, lazy_keys=frozenset()):
+    """Parse one value starting at `pos`. Returns (value, end position)."""
+    pos = _WHITESPACE.match(buffer, pos).end()
+    char = buffer[pos:pos + 1]
+    if char == b"{":
+        return _parse_dict(buffer, pos + 1, lazy_keys)
+    if char == b"(":
+        return _parse_list(buffer, pos + 1, lazy_keys)
+    if char == b"<":
+        match = _DATA.match(buffer, pos)
+        if not match:
+            raise PlistError("Malformed data value", buffer, pos)
+        return bytes.fromhex(match.group(1).decode("ascii")), match.end()
+    if char == b'"':
+        return _parse_quoted(buffer, pos)
+    match = _BARE.match(buffer, pos)
+    if not match:
+        raise PlistError("Unexpected character %r" % char, buffer, pos)
+    return _bare_value(match.group().decode("utf-8")), match.end()
+
+
+def parse_key(buffer, pos):
+    """Parse a dictionary key (quoted or bare). Returns (key, end position)."""
+    pos = _WHITESPACE.match(buffer, pos).end()
+    if buffer[pos:pos + 1] == b'"':
+        return _parse_quoted(buffer, pos)
+    match = _BARE.match(buffer, pos)
+    if not match:
+        raise PlistError("Expected a key", buffer, pos)
+    return match.group().decode("utf-8"), match.end()
+
+
+def skip_whitespace(buffer, pos):
+    """Return the position of the next non-whitespace byte."""
+    return _WHITESPACE.match(buffer, pos).end()
+
+
+def expect(buffer, pos, token):
+    """Skip whitespace and the single-byte `token`; return the next position."""
+    pos = _WHITESPACE.match(buffer, pos).end()
+    if buffer[pos:pos + 1] != token:
+        raise PlistError("Expected %r" % token.decode(), buffer, pos)
+    return pos + 1
+
+
+def skip_value(buffer, pos):
+    """Return the end position of the value at `pos` without decoding it."""
+    pos = _WHITESPACE.match(buffer, pos).end()
+    char = buffer[pos:pos + 1]
+    if char == b'"':
+        return _match_or_fail(_QUOTED, buffer, pos, "Unterminated string")
+    if char == b"<":
+        return _match_or_fail(_DATA, buffer, pos, "Malformed data value")
+    if char not in (b"{", b"("):
+        return _match_or_fail(_BARE, buffer, pos, "Expected a value")
+    depth = 0
+    while True:
+        char = buffer[pos:pos + 1]
+        if not char:
+            raise PlistError("Unterminated container", buffer, pos)
+        if char == b"{" or char == b"(":
+            depth += 1
+            pos += 1
+        elif char == b"}" or char == b")":
+            depth -= 1
+            pos += 1
+            if depth == 0:
+                return pos
+        elif char == b'"':
+            pos = _match_or_fail(_QUOTED, buffer, pos, "Unterminated string")
+        else:
+            pos = _match_or_fail(_DATA, buffer, pos, "Malformed data value")
+        pos = _FLAT.match(buffer, pos).end()
+
+
+def scan_dict(buffer, pos):
+    """Index the dictionary at `pos` without decoding its values.
+
+    Returns ([(key, value start, value end), ...], end position).
+    """
+    pos = expect(buffer, pos, b"{")
+    entries = []
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b"}":
+            return entries, pos + 1
+        key, pos = parse_key(buffer, pos)
+        start = _WHITESPACE.match(buffer, expect(buffer, pos, b"=")).end()
+        pos = skip_value(buffer, start)
+        entries.append((key, start, pos))
+        pos = expect(buffer, pos, b";")
+
+
+def scan_list(buffer, pos):
+    """Index the list at `pos` without decoding its items.
+
+    Returns ([(item start, item end), ...], end position).
+    """
+    pos = expect(buffer, pos, b"(")
+    items = []
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b")":
+            return items, pos + 1
+        end = skip_value(buffer, pos)
+        items.append((pos, end))
+        pos = _WHITESPACE.match(buffer, end).end()
+        char = buffer[pos:pos + 1]
+        if char == b",":
+            pos += 1
+        elif char != b")":
+            raise PlistError("Expected ',' or ')'", buffer, pos)
+
+
+def _match_or_fail(pattern, buffer, pos, message):
+    match = pattern.match(buffer, pos)
+    if not match:
+        raise PlistError(message, buffer, pos)
+    return match.end()
+
+
+def _parse_dict(buffer, pos, lazy_keys):
+    result = {}
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b"}":
+            return result, pos + 1
+        key, pos = parse_key(buffer, pos)
+        pos = expect(buffer, pos, b"=")
+        if key in lazy_keys:
+            start = _WHITESPACE.match(buffer, pos).end()
+            pos = skip_value(buffer, start)
+            result[key] = Deferred(buffer, start, pos, lazy_keys)
+        else:
+            result[key], pos = parse_value(buffer, pos, lazy_keys)
+        pos = expect(buffer, pos, b";")
+
+
+def _parse_list(buffer, pos, lazy_keys):
+    result = []
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b")":
+            return result, pos + 1
+        value, pos = parse_value(buffer, pos, lazy_keys)
+        result.append(value)
+        pos = _WHITESPACE.match(buffer, pos).end()
+        char = buffer[pos:pos + 1]
+        if char == b",":
+            pos += 1
+        elif char != b")":
+            raise PlistError("Expected ',' or ')'", buffer, pos)
+
+
+def _parse_quoted(buffer, pos):
+    match = _QUOTED.match(buffer, pos)
+    if not match:
+        raise PlistError("Unterminated string", buffer, pos)
+    raw = match.group(1)
+    text = raw.decode("utf-8")
+    if b"\\" in raw:
+        text = _unescape(text)
+    return text, match.end()
+
+
+def _unescape(text):
+    def replace(match):
+        hex_code, octal, char = match.groups()
+        if hex_code:
+            return chr(int(hex_code, 16))
+        if octal:
+            return chr(int(octal, 8))
+        return _SIMPLE_ESCAPES.get(char, char)
+
+    text = _ESCAPE.sub(replace, text)
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        # \U escapes of astral characters come as surrogate pairs
+        text = text.encode("utf-16", "surrogatepass").decode("utf-16")
+    return text
+
+
+def _bare_value(token):
+    if _INT.match(token):
+        return int(token)
+    if _FLOAT.match(token):
+        return float(token)
+    return token
+
+
+# ── writing ──────────────────────────────────────────────────────────────────
+
+def dumps(value):
+    """Serialize `value` to property list text."""
+    chunks = []
+    _write(value, lambda data: chunks.append(data))
+    return b"".join(chunks).decode("utf-8") + "\n"
+
+
+def dump(value, fp):
+    """Serialize `value` into the binary file object `fp`."""
+    _write(value, fp.write)
+    fp.write(b"\n")
+
+
+def save(value, path):
+    """Serialize `value` to `path`."""
+    with open(path, "wb") as f:
+        dump(value, f)
+
+
+def quote(text):
+    """Return `text` as a plist string token, quoted only when needed."""
+    if _SAFE.match(text) and not (_INT.match(text) or _FLOAT.match(text)):
+        return text
+    if _NEEDS_ESCAPE.search(text):
+        text = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def format_number(value):
+    """Format a number the way Glyphs writes it."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if value == int(value):
+        return str(int(value))
+    text = ("%.5f" % value).rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _is_inline(items):
+    if not items or len(items) > 4:
+        return False
+    has_number = False
+    for item in items:
+        if isinstance(item, (int, float)):
+            has_number = True
+        elif not (isinstance(item, str) and _SAFE.match(item)):
+            return False
+    return has_number
+
+
+def _write(value, write):
+    if isinstance(value, dict):
+        write(b"{\n")
+        for key, item in value.items():
+            write(quote(key).encode("utf-8"))
+            write(b" = ")
+            _write(item, write)
+            write(b";\n")
+        write(b"}")
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            write(b"(\n)")
+            return
+        if _is_inline(value):
+            write(("(" + ",".join(
+                quote(item) if isinstance(item, str) else format_number(item)
+                for item in value) + ")").encode("utf-8"))
+            return
+        write(b"(\n")
+        for index, item in enumerate(value):
+            if index:
+                write(b",\n")
+            _write(item, write)
+        write(b"\n)")
+    elif isinstance(value, Deferred):
+        write(value.raw())
+    elif isinstance(value, (int, float)):
+        write(format_number(value).encode("ascii"))
+    elif isinstance(value, bytes):
+        write(b"<" + value.hex().encode("ascii") + b">")
+    elif value is None:
+        raise TypeError("None cannot be written to a property list")
+    else:
+        write(quote(str(value)).encode("utf-8"))
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Left and right edges of glyph outlines per height band, as NumPy arrays.
+
+A layer's outline (components resolved through their transforms) is cut
+into horizontal bands of BAND units; per band the profile keeps the
+leftmost and rightmost x of the outline. Curves are flattened first, the
+edges within a band are exact for the flattened outline. The outline's
+exact bounds come along:
+
+    cache = ProfileCache(font, path=DEFAULT_PATH)
+    profile = cache.get("T", master.id)
+    profile.left, profile.right        # float32 arrays, inf/-inf where empty
+    profile.bottom                     # index of the first band (y // BAND)
+    profile.bounds                     # (minX, minY, maxX, maxY) or None
+    cache.save()
+
+    table = ProfileTable([cache.get(name, master.id) for name in names])
+    table.gaps([0, 1], [1, 2], [-40, 0])   # closest horizontal distances
+
+Profiles are stored under a hash of the layer's content (width, nodes and
+components, nested component layers included), so an edited glyph gets a
+new profile and everything else is reused. With a path the store is kept
+in an .npz file, so a second run over the same fonts computes nothing; call
+clear() after editing outlines within a run.
+"""
+
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+from rolandhuse import geometry
+
+VERSION = 1         # bump when the sampling changes, to ignore stored profiles
+BAND = 10           # band height in units
+CURVE_STEPS = 8     # line segments per flattened curve
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "rolandhuse", "profiles.npz")
+MAX_ENTRIES = 200000  # least recently used profiles are dropped from the file beyond this
+
+
+class Profile(object):
+    __slots__ = ("bottom", "left", "right", "width", "bounds")
+
+    def __init__(self, bottom, left, right, width, bounds=None):
+        self.bottom = bottom
+        self.left = left
+        self.right = right
+        self.width = width
+        self.bounds = bounds
+
+    @property
+    def empty(self):
+        return not len(self.left)
+
+    @property
+    def top(self):
+        """Index after the last band."""
+        return self.bottom + len(self.left)
+
+    def __repr__(self):
+        return f"<Profile bands {self.bottom}–{self.top} width {self.width}>"
+
+
+def _cubic_points(curves, t):
+    """Points at parameters t along cubic segments (n, 4, 2); t is (steps,) or (n, steps)."""
+    t = np.broadcast_to(t, (len(curves), np.shape(t)[-1]))[:, :, None]
+    u = 1 - t
+    p0, p1, p2, p3 = (curves[:, index, None, :] for index in range(4))
+    return u ** 3 * p0 + 3 * u * u * t * p1 + 3 * u * t * t * p2 + t ** 3 * p3
+
+
+def _cubic_extremes(curves):
+    """Points where x or y of each cubic segment turns, start points where it does not."""
+    p0, p1, p2, p3 = (curves[:, index] for index in range(4))
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(np.maximum(b * b - 4 * a * c, 0))
+        quadratic = np.abs(a) > 1e-12
+        t1 = np.where(quadratic, (-b + root) / (2 * a), -c / b)
+        t2 = np.where(quadratic, (-b - root) / (2 * a), np.nan)
+        t1 = np.where(quadratic & (b * b - 4 * a * c < 0), np.nan, t1)
+    t = np.concatenate((t1, t2), axis=1)        # (n, 4): two per axis
+    t = np.where((t > 0) & (t < 1), t, 0)
+    return _cubic_points(curves, t)
+
+
+def _segments(layer, master_id, glyphs, transform=geometry.IDENTITY, depth=0):
+    """Segments of a layer's paths and of its components' layers, transformed."""
+    for shape in layer.shapes:
+        name = getattr(shape, "componentName", None)
+        if name is None:
+            yield from geometry.segments(geometry.transformed(shape.nodes, transform), shape.closed)
+        elif depth < 16:
+            glyph = glyphs.get(name)
+            if glyph is not None:
+                nested = geometry.multiply(shape.transform, transform)
+                yield from _segments(glyph.layers[master_id], master_id, glyphs, nested, depth + 1)
+
+
+def _edges(segments):
+    """(x0, y0, x1, y1) arrays of the flattened outline's edges, and its exact bounds."""
+    lines, curves = [], []
+    for segment in segments:
+        if len(segment) == 2:
+            lines.append(segment)
+        elif len(segment) == 3:     # quadratic → cubic
+            (x0, y0), (x1, y1), (x2, y2) = segment
+            curves.append(((x0, y0), (x0 + 2 / 3 * (x1 - x0), y0 + 2 / 3 * (y1 - y0)),
+                           (x2 + 2 / 3 * (x1 - x2), y2 + 2 / 3 * (y1 - y2)), (x2, y2)))
+        else:
+            curves.append(segment)
+    parts = [np.array(lines, dtype=float).reshape(-1, 4)]
+    extremes = [parts[0].reshape(-1, 2)]
+    if curves:
+        curves = np.array(curves, dtype=float)
+        points = _cubic_points(curves, np.linspace(0, 1, CURVE_STEPS + 1))
+        parts.append(np.concatenate((points[:, :-1], points[:, 1:]), axis=2).reshape(-1, 4))
+        extremes += [curves[:, 3], _cubic_extremes(curves).reshape(-1, 2)]
+    edges = np.concatenate(parts)
+    extremes = np.concatenate(extremes)
+    bounds = None
+    if len(extremes):
+        low, high = extremes.min(axis=0), extremes.max(axis=0)
+        bounds = (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+    return (edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]), bounds
+
+
+def outline_profile(segments, width=0, band=BAND):
+    """Profile of an outline given as segments (tuples of points)."""
+    (x0, y0, x1, y1), bounds = _edges(segments)
+    if not len(x0):
+        return Profile(0, np.empty(0, np.float32), np.empty(0, np.float32), width, bounds)
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+    first = np.floor(low / band).astype(np.int64)
+    counts = np.floor(high / band).astype(np.int64) - first + 1
+
+    # One row per (edge, band it crosses)
+    rows = np.repeat(np.arange(len(x0)), counts)
+    bands = first[rows] + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    ex0, ey0, dx, dy = x0[rows], y0[rows], (x1 - x0)[rows], (y1 - y0)[rows]
+    flat = dy == 0
+    safe_dy = np.where(flat, 1, dy)
+    # The edge's x where it enters and leaves the band; horizontal edges span both ends
+    ta = np.where(flat, 0, (np.clip(bands * band, low[rows], high[rows]) - ey0) / safe_dy)
+    tb = np.where(flat, 1, (np.clip((bands + 1) * band, low[rows], high[rows]) - ey0) / safe_dy)
+    xa, xb = ex0 + dx * ta, ex0 + dx * tb
+
+    bottom = int(bands.min())
+    size = int(bands.max()) - bottom + 1
+    left = np.full(size, np.inf)
+    right = np.full(size, -np.inf)
+    np.minimum.at(left, bands - bottom, np.minimum(xa, xb))
+    np.maximum.at(right, bands - bottom, np.maximum(xa, xb))
+    return Profile(bottom, left.astype(np.float32), right.astype(np.float32), width, bounds)
+
+
+def layer_profile(layer, master_id, glyphs, band=BAND):
+    """Profile of a layer; `glyphs` maps names to glyphs for resolving components."""
+    return outline_profile(_segments(layer, master_id, glyphs), layer.width, band)
+
+
+class ProfileCache(object):
+    """Profiles of a font's master layers by content hash, optionally kept on disk."""
+
+    def __init__(self, font, band=BAND, path=None):
+        self.font = font
+        self.band = band
+        self.path = path
+        self.computed = 0       # profiles computed (not found in the store) since creation
+        self._glyphs = None
+        self._hashes = {}       # (name, master id) → content hash
+        self._store = {}        # content hash → Profile, most recently used last
+        self._stored = {}       # content hash → row in the loaded file, not used yet
+        self._arrays = None
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def clear(self):
+        """Forget which layer has which content; stored profiles stay."""
+        self._glyphs = None
+        self._hashes.clear()
+
+    # ── content hashes ──
+
+    def _hash(self, name, master_id, depth=0):
+        key = (name, master_id)
+        digest = self._hashes.get(key)
+        if digest is not None:
+            return digest
+        glyph = self._glyphs.get(name)
+        if glyph is None:
+            return None
+        layer = glyph.layers[master_id]
+        sha = hashlib.sha1(f"{VERSION} {CURVE_STEPS} {self.band} {layer.width}".encode())
+        for shape in layer.shapes:
+            component = getattr(shape, "componentName", None)
+            if component is None:
+                sha.update(repr((shape.closed, [(node.x, node.y, node.type) for node in shape.nodes])).encode())
+            else:
+                nested = self._hash(component, master_id, depth + 1) if depth < 16 else None
+                sha.update(repr((component, tuple(shape.transform), nested)).encode())
+        digest = self._hashes[key] = sha.hexdigest()
+        return digest
+
+    def get(self, name, master_id):
+        """Profile of a glyph's master layer, None if there is no such glyph."""
+        if self._glyphs is None:
+            self._glyphs = {glyph.name: glyph for glyph in self.font.glyphs}
+        digest = self._hash(name, master_id)
+        if digest is None:
+            return None
+        profile = self._store.pop(digest, None)     # re-inserted last: most recently used
+        if profile is None:
+            row = self._stored.pop(digest, None)
+            if row is not None:
+                profile = self._from_row(row)
+            else:
+                profile = layer_profile(self._glyphs[name].layers[master_id], master_id, self._glyphs, self.band)
+                self.computed += 1
+        self._store[digest] = profile
+        return profile
+
+    # ── file ──
+
+    def _load(self, path):
+        try:
+            with np.load(path) as data:
+                if int(data["band"]) != self.band:
+                    return
+                self._arrays = {key: data[key] for key in data.files}
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            self._arrays = None     # unreadable or cut off: start with an empty cache
+            return
+        self._stored = {digest.decode("ascii"): row for row, digest in enumerate(self._arrays["hashes"])}
+
+    def _from_row(self, row):
+        arrays = self._arrays
+        start, end = arrays["offsets"][row], arrays["offsets"][row + 1]
+        bounds = arrays["bounds"][row]
+        return Profile(int(arrays["bottoms"][row]), arrays["left"][start:end], arrays["right"][start:end],
+                       float(arrays["widths"][row]), None if np.isnan(bounds[0]) else tuple(map(float, bounds)))
+
+    def save(self):
+        """Write the store to the file (if there is a path and anything new)."""
+        if not self.path or not self.computed:
+            return
+        # Unused stored profiles first, so the ones used now are the last to be dropped
+        entries = [(digest, self._from_row(row)) for digest, row in self._stored.items()]
+        entries = (entries + list(self._store.items()))[-MAX_ENTRIES:]
+        lengths = [len(profile.left) for _, profile in entries]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = self.path + ".tmp.npz"
+        np.savez(
+            temporary,
+            band=self.band,
+            hashes=np.array([digest for digest, _ in entries], dtype="S40"),
+            bottoms=np.array([profile.bottom for _, profile in entries], np.int32),
+            widths=np.array([profile.width for _, profile in entries], np.float32),
+            bounds=np.array([profile.bounds or (np.nan,) * 4 for _, profile in entries], np.float64).reshape(-1, 4),
+            offsets=np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))),
+            left=np.concatenate([profile.left for _, profile in entries] or [np.empty(0, np.float32)]),
+            right=np.concatenate([profile.right for _, profile in entries] or [np.empty(0, np.float32)]),
+        )
+        os.replace(temporary, self.path)
+
+
+class ProfileTable(object):
+    """Profiles on one band grid, for gap computations over many pairs at once."""
+
+    def __init__(self, profiles):
+        profiles = list(profiles)
+        used = [profile for profile in profiles if profile is not None and not profile.empty]
+        self.bottom = min((profile.bottom for profile in used), default=0)
+        bands = max((profile.top for profile in used), default=0) - self.bottom
+        self.left = np.full((len(profiles), bands), np.inf, np.float32)
+        self.right = np.full((len(profiles), bands), -np.inf, np.float32)
+        self.widths = np.zeros(len(profiles), np.float32)
+        for index, profile in enumerate(profiles):
+            if profile is None:
+                continue
+            self.widths[index] = profile.width
+            if not profile.empty:
+                start = profile.bottom - self.bottom
+                self.left[index, start:start + len(profile.left)] = profile.left
+                self.right[index, start:start + len(profile.right)] = profile.right
+
+    def __len__(self):
+        return len(self.widths)
+
+    def gaps(self, left_ids, right_ids, kerning=0, chunk=8192):
+        """Closest horizontal distance between the outlines of each pair.
+
+        Rows `left_ids` are set before rows `right_ids`, `kerning` (scalar or
+        per pair) apart. Negative means the outlines overlap; inf means they
+        share no band.
+        """
+        left_ids = np.asarray(left_ids, dtype=np.int64)
+        right_ids = np.asarray(right_ids, dtype=np.int64)
+        gaps = np.empty(len(left_ids), np.float32)
+        for start in range(0, len(left_ids), chunk):
+            left = left_ids[start:start + chunk]
+            right = right_ids[start:start + chunk]
+            gaps[start:start + chunk] = (self.left[right] - self.right[left]).min(axis=1, initial=np.inf)
+        return gaps + self.widths[left_ids] + np.asarray(kerning, dtype=np.float32)
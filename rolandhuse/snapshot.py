@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Indexed snapshot of a font's glyph set, shared by the scripts.
+
+Looking glyphs up with font.glyphs[name] inside loops means one ObjC bridge
+call per lookup. A snapshot walks font.glyphs once and answers the same
+questions from plain dicts:
+
+    snap = snapshot(font)
+    snap.glyph("a.ss01")              # name → GSGlyph (or None)
+    snap.glyph_for_unicode("0061")    # unicode → GSGlyph
+    snap.members("@MMK_R_o")          # kerning group key → glyph names
+    snap.split("a.ss01.init")         # ("a", ".ss01.init")
+    snap.dependents("acutecomb")      # glyphs using it as a component
+
+The snapshot is kept in font.tempData, so it lives as long as the font and
+is shared by all scripts run on it. snapshot(font) reuses it while the
+glyphs' names, ids, unicodes and kerning groups are the same, checked with
+one pass over the glyphs, and builds a new one when any of them changed:
+
+    resolver = KerningResolver(font)        # builds the snapshot
+    finder = CrashFinder(font, master.id)   # and reuses it
+    font.glyphs["a"].rightKerningGroup = "o"
+    snapshot(font).members("@MMK_L_o")      # rebuilt, includes "a"
+
+Component edits are not part of that check: call invalidate(font) after
+changing components if snap.users()/dependents() were used before.
+"""
+
+LEFT_PREFIX = "@MMK_L_"
+RIGHT_PREFIX = "@MMK_R_"
+TEMP_DATA_KEY = "com.rolandhuse.snapshot"
+
+_generation = 0     # bumped by invalidate(): older snapshots are rebuilt
+
+
+def split_name(name):
+    """Split a glyph name into base and suffix at the first dot: ("a", ".ss01")."""
+    dot = name.find(".", 1)
+    if dot < 0:
+        return name, ""
+    return name[:dot], name[dot:]
+
+
+def _entry(glyph):
+    """What a snapshot indexes of a glyph: name, id, unicodes and kerning groups."""
+    return (glyph.name, getattr(glyph, "id", None), tuple(glyph.unicodes or ()),
+            glyph.leftKerningGroup, glyph.rightKerningGroup)
+
+
+def signature(font):
+    """Hash of the names, ids, unicodes and kerning groups of the font's glyphs."""
+    return hash(tuple(_entry(glyph) for glyph in font.glyphs))
+
+
+class FontSnapshot(object):
+
+    def __init__(self, font):
+        self.generation = _generation
+        self.glyphs = {}            # name → glyph
+        self.by_id = {}             # glyph id → glyph (kerning keys may be ids)
+        self.by_unicode = {}        # "0061" → glyph
+        self.left_groups = {}       # glyph.leftKerningGroup → [names]
+        self.right_groups = {}      # glyph.rightKerningGroup → [names]
+        self.bases = {}             # name → (base, suffix)
+        self.suffixes = {}          # base → {suffix: name}
+        self.order = []             # names in font order
+        self._component_users = None
+
+        entries = []
+        for glyph in font.glyphs:
+            entry = name, glyph_id, unicodes, left_group, right_group = _entry(glyph)
+            entries.append(entry)
+            self.order.append(name)
+            self.glyphs[name] = glyph
+            if glyph_id:
+                self.by_id[glyph_id] = glyph
+            for code in unicodes:
+                self.by_unicode.setdefault(code, glyph)
+            if left_group:
+                self.left_groups.setdefault(left_group, []).append(name)
+            if right_group:
+                self.right_groups.setdefault(right_group, []).append(name)
+            base, suffix = split_name(name)
+            self.bases[name] = (base, suffix)
+            if suffix:
+                self.suffixes.setdefault(base, {})[suffix] = name
+        self.glyph_count = len(self.order)
+        self.signature = hash(tuple(entries))
+
+    # ── lookups ──────────────────────────────────────────────────────────────
+
+    def __contains__(self, name):
+        return name in self.glyphs
+
+    def __len__(self):
+        return self.glyph_count
+
+    def glyph(self, name):
+        return self.glyphs.get(name)
+
+    def glyph_for_key(self, key):
+        """Glyph for a glyph-level kerning key (name or id)."""
+        return self.glyphs.get(key) or self.by_id.get(key)
+
+    def key_id(self, key):
+        """font.kerning key for a pair side given as glyph name or group key.
+
+        Glyphs keys glyph-level pairs in font.kerning by glyph id, not name.
+        """
+        glyph = self.glyphs.get(key)
+        return glyph.id if glyph is not None else key
+
+    def key_name(self, key):
+        """Glyph name (or the group key itself) for a font.kerning key."""
+        glyph = self.by_id.get(key)
+        return glyph.name if glyph is not None else key
+
+    def glyph_for_unicode(self, code):
+        return self.by_unicode.get(code.upper())
+
+    def split(self, name):
+        return self.bases.get(name) or split_name(name)
+
+    def variants(self, base):
+        """{suffix: glyph name} of all dotted variants of `base`."""
+        return self.suffixes.get(base, {})
+
+    # ── kerning groups ───────────────────────────────────────────────────────
+
+    def is_group_key(self, key):
+        """True if `key` is an @MMK_L_/@MMK_R_ key of a group that has members."""
+        if key.startswith(LEFT_PREFIX):
+            return key[len(LEFT_PREFIX):] in self.right_groups
+        if key.startswith(RIGHT_PREFIX):
+            return key[len(RIGHT_PREFIX):] in self.left_groups
+        return False
+
+    def members(self, key):
+        """Glyph names in the kerning group `key` (@MMK_L_… or @MMK_R_…).
+
+        The first side of a pair uses the glyphs' right groups, the second
+        side their left groups.
+        """
+        if key.startswith(LEFT_PREFIX):
+            return self.right_groups.get(key[len(LEFT_PREFIX):], [])
+        if key.startswith(RIGHT_PREFIX):
+            return self.left_groups.get(key[len(RIGHT_PREFIX):], [])
+        return [key] if key in self.glyphs else []
+
+    def left_key(self, name):
+        """Kerning key for `name` on the first side of a pair."""
+        glyph = self.glyphs[name]
+        group = glyph.rightKerningGroup
+        return LEFT_PREFIX + group if group else name
+
+    def right_key(self, name):
+        """Kerning key for `name` on the second side of a pair."""
+        glyph = self.glyphs[name]
+        group = glyph.leftKerningGroup
+        return RIGHT_PREFIX + group if group else name
+
+    # ── components ───────────────────────────────────────────────────────────
+
+    def _build_component_users(self):
+        # Built on first use only: it has to look into every layer.
+        users = {}
+        for name in self.order:
+            for layer in self.glyphs[name].layers:
+                for component in layer.components:
+                    users.setdefault(component.componentName, set()).add(name)
+        self._component_users = users
+
+    def users(self, name):
+        """Names of glyphs that use `name` directly as a component."""
+        if self._component_users is None:
+            self._build_component_users()
+        return self._component_users.get(name, set())
+
+    def dependents(self, name):
+        """Names of all glyphs that use `name`, directly or through nesting."""
+        found = set()
+        pending = [name]
+        while pending:
+            for user in self.users(pending.pop()):
+                if user not in found:
+                    found.add(user)
+                    pending.append(user)
+        return found
+
+
+def snapshot(font):
+    """FontSnapshot of `font`, kept in font.tempData while the font's signature() is unchanged.
+
+    Fonts without tempData get a new snapshot on every call.
+    """
+    store = getattr(font, "tempData", None)
+    cached = store.get(TEMP_DATA_KEY) if store is not None else None
+    if cached is not None and cached.generation == _generation and cached.signature == signature(font):
+        return cached
+    cached = FontSnapshot(font)
+    if store is not None:
+        store[TEMP_DATA_KEY] = cached
+    return cached
+
+
+def invalidate(font=None):
+    """Drop the cached snapshot of `font` (or of all fonts)."""
+    global _generation
+    if font is None:
+        _generation += 1
+        return
+    store = getattr(font, "tempData", None)
+    if store is not None and TEMP_DATA_KEY in store:
+        del store[TEMP_DATA_KEY]
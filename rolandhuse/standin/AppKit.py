@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for the few AppKit classes the scripts use.
+
+NSAlert.runModal() does not block: it returns the next response queued with
+queue_response(), or the first button if none is queued. A queued text is put
+into the alert's accessory NSTextField first.
+"""
+
+NSAlertFirstButtonReturn = 1000
+NSAlertSecondButtonReturn = 1001
+NSAlertThirdButtonReturn = 1002
+NSAlertStyleWarning = 0
+NSAlertStyleInformational = 1
+NSAlertStyleCritical = 2
+
+
+def queue_response(button=NSAlertFirstButtonReturn, text=None):
+    """Answer the next NSAlert with `button`, typing `text` into its text field."""
+    NSAlert.responses.append((button, text))
+
+
+class _Object(object):
+    """alloc().init() and friends, as PyObjC spells them."""
+
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def init(self):
+        return self
+
+
+class NSAlert(_Object):
+    responses = []
+
+    def __init__(self):
+        self.messageText = ""
+        self.informativeText = ""
+        self.alertStyle = NSAlertStyleWarning
+        self.buttons = []
+        self.accessoryView = None
+
+    def setMessageText_(self, text):
+        self.messageText = text
+
+    def setInformativeText_(self, text):
+        self.informativeText = text
+
+    def setAlertStyle_(self, style):
+        self.alertStyle = style
+
+    def addButtonWithTitle_(self, title):
+        self.buttons.append(title)
+
+    def setAccessoryView_(self, view):
+        self.accessoryView = view
+
+    def runModal(self):
+        button, text = NSAlert.responses.pop(0) if NSAlert.responses else (NSAlertFirstButtonReturn, None)
+        if text is not None and self.accessoryView is not None:
+            self.accessoryView.setStringValue_(text)
+        return button
+
+
+class NSTextField(_Object):
+
+    def __init__(self):
+        self._value = ""
+        self.toolTip = None
+
+    def initWithFrame_(self, frame):
+        self.frame = frame
+        return self
+
+    def setStringValue_(self, value):
+        self._value = str(value)
+
+    def stringValue(self):
+        return self._value
+
+    def setToolTip_(self, text):
+        self.toolTip = text
+
+
+class _NSApplication(object):
+
+    def updateWindows(self):
+        pass
+
+
+NSApp = _NSApplication()
+
+
+class _Unavailable(object):
+    """Placeholder for other AppKit names: importable, but unusable."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        raise RuntimeError(f"AppKit.{self._name} is not part of the stand-in")
+
+    def __call__(self, *args, **kwargs):
+        raise RuntimeError(f"AppKit.{self._name} is not part of the stand-in")
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return _Unavailable(name)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for the GlyphsApp module, backed by rolandhuse.glyphsfile.
+"""
+
+from rolandhuse.glyphsfile import (
+    CURVE, LINE, OFFCURVE, QCURVE, GSAnchor, GSClass, GSComponent, GSCustomParameter,
+    GSEditViewController, GSFeature, GSFeaturePrefix, GSFont, GSFontMaster, GSGlyph,
+    GSLayer, GSNode, GSPath,
+)
+from rolandhuse.geometry import Rect as NSRect
+
+GSOFFCURVE, GSCURVE, GSLINE, GSQCURVE = OFFCURVE, CURVE, LINE, QCURVE
+LTR, RTL = 0, 1
+
+
+class GSApplication(object):
+    """The `Glyphs` object: open fonts, defaults and the Macro Panel calls."""
+
+    versionNumber = 3.2
+    buildNumber = 3260
+    headless = True  # scripts can check getattr(Glyphs, "headless", False)
+
+    def __init__(self):
+        self.fonts = []
+        self.defaults = {}
+        self.notifications = []
+
+    @property
+    def font(self):
+        return self.fonts[0] if self.fonts else None
+
+    def open(self, path, showInterface=True):
+        font = GSFont(path)
+        self.fonts.insert(0, font)
+        return font
+
+    def clearLog(self):
+        pass
+
+    def showMacroWindow(self):
+        pass
+
+    def redraw(self):
+        pass
+
+    def showNotification(self, title, message):
+        self.notifications.append((title, message))
+        print(f"🔔 {title}: {message}")
+
+
+def Message(message="", title="Alert", OKButton=None):
+    print(f"[{title}] {message}" if title else message)
+
+
+Glyphs = GSApplication()
+
+__all__ = [
+    "Glyphs", "Message", "GSApplication", "NSRect",
+    "GSFont", "GSFontMaster", "GSGlyph", "GSLayer", "GSPath", "GSNode", "GSComponent",
+    "GSAnchor", "GSClass", "GSFeature", "GSFeaturePrefix", "GSCustomParameter",
+    "GSEditViewController",
+    "LINE", "CURVE", "OFFCURVE", "QCURVE", "GSLINE", "GSCURVE", "GSOFFCURVE", "GSQCURVE",
+    "LTR", "RTL",
+]
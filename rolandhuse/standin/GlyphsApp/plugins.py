@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for GlyphsApp.plugins. The scripts only star-import it.
+"""
+
+__all__ = []
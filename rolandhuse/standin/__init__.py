@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Importable stand-ins for the modules the scripts expect inside Glyphs:
+GlyphsApp, GlyphsApp.plugins, AppKit, objc, vanilla, mekkablue and sampleText.
+
+    from rolandhuse import standin
+    standin.install()
+    import GlyphsApp                      # now works on any OS
+    GlyphsApp.Glyphs.open("Family.glyphs")
+
+GSFont and friends are the headless file model (rolandhuse.glyphsfile), so a
+font is either built in memory or read from a .glyphs file. Dialogs do not
+block: NSAlert answers with queued responses (AppKit.queue_response) and
+vanilla windows are recorded in vanilla.windows, where a test can fill in
+fields and press buttons.
+
+Headless glyph ids are the glyph names. font.use_glyph_ids() switches a font
+to UUIDs with glyph-level kerning keyed by them, as inside Glyphs.
+"""
+
+import os
+import sys
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+MODULES = ("GlyphsApp", "GlyphsApp.plugins", "AppKit", "objc", "vanilla", "mekkablue", "sampleText")
+
+
+def install():
+    """Put the stand-in modules first on sys.path. Returns the GlyphsApp module."""
+    if PATH not in sys.path:
+        sys.path.insert(0, PATH)
+    import GlyphsApp
+    return GlyphsApp
+
+
+def namespace():
+    """The globals a Macro Panel script starts with (Glyphs, GSFont, …)."""
+    GlyphsApp = install()
+    return {name: getattr(GlyphsApp, name) for name in GlyphsApp.__all__}
+
+
+def reset():
+    """Close fonts, forget windows, queued alert answers and defaults."""
+    GlyphsApp = install()
+    import AppKit
+    import vanilla
+    GlyphsApp.Glyphs.fonts[:] = []
+    GlyphsApp.Glyphs.defaults.clear()
+    GlyphsApp.Glyphs.notifications[:] = []
+    AppKit.NSAlert.responses[:] = []
+    vanilla.windows[:] = []
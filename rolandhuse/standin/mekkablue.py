@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for the parts of mekkablue's helper module the scripts use.
+"""
+
+from GlyphsApp import Glyphs
+from vanilla import Button
+
+
+class mekkaObject(object):
+    """Preferences in Glyphs.defaults, mirrored into the controls of self.w."""
+
+    prefDict = {}
+
+    def domain(self, prefName):
+        return f"com.mekkablue.{self.__class__.__name__}.{prefName.strip()}"
+
+    def pref(self, prefName):
+        return Glyphs.defaults.get(self.domain(prefName), self.prefDict.get(prefName))
+
+    def setPref(self, prefName, value):
+        Glyphs.defaults[self.domain(prefName)] = value
+
+    def LoadPreferences(self):
+        for prefName in self.prefDict:
+            control = getattr(self.w, prefName, None)
+            if control is not None:
+                control.set(self.pref(prefName))
+
+    def SavePreferences(self, sender=None):
+        for prefName in self.prefDict:
+            control = getattr(self.w, prefName, None)
+            if control is not None:
+                self.setPref(prefName, control.get())
+
+
+class UpdateButton(Button):
+
+    def __init__(self, posSize, callback=None, **kwargs):
+        super().__init__(posSize, "↺", callback=callback, **kwargs)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for PyObjC's objc module: lookUpClass() for the classes scripts use.
+"""
+
+
+class NSString(str):
+    """Plain str; Glyphs treats it as a literal, never as a formula."""
+
+    @classmethod
+    def stringWithString_(cls, text):
+        return cls(text)
+
+
+_CLASSES = {"NSString": NSString}
+
+
+class nosuchclass_error(Exception):
+    pass
+
+
+def lookUpClass(name):
+    try:
+        return _CLASSES[name]
+    except KeyError:
+        raise nosuchclass_error(name)
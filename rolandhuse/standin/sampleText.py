@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for mekkablue's sampleText module. Sample texts live in
+Glyphs.defaults["SampleTextsList"], like in the app.
+"""
+
+from GlyphsApp import Glyphs
+
+SAMPLE_TEXTS = "SampleTextsList"
+
+
+def buildKernStrings(listOfLeftGlyphNames, listOfRightGlyphNames, thisFont=None, linePrefix="nonn", linePostfix="noon", mirrorPair=False):
+    """One line per left glyph, each right glyph in turn placed after it."""
+    if thisFont is None:
+        thisFont = Glyphs.font
+    kernStrings = []
+    for leftName in listOfLeftGlyphNames:
+        left = "/" + leftName
+        line = linePrefix
+        for rightName in listOfRightGlyphNames:
+            right = "/" + rightName
+            line += left + right + (left if mirrorPair else "") + " "
+        kernStrings.append(line.rstrip() + linePostfix)
+    return kernStrings
+
+
+def executeAndReport(kernStrings):
+    texts = Glyphs.defaults.setdefault(SAMPLE_TEXTS, [])
+    texts.extend(kernStrings)
+    print(f"Added {len(kernStrings)} kern strings to the sample texts.")
+
+
+def setSelectSampleTextIndex(thisFont, tab=None, marker=None):
+    texts = Glyphs.defaults.get(SAMPLE_TEXTS, [])
+    index = len(texts) - 1
+    if marker is not None:
+        index = next((i for i, text in enumerate(texts) if marker in text), index)
+    if tab is not None and texts:
+        tab.text = texts[index]
+    return index
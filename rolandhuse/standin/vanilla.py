@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Stand-in for vanilla: windows and controls without a screen.
+
+Opened windows are appended to `windows`. A test or batch run drives them
+like a user would:
+
+    window = vanilla.windows[-1]
+    window.kernValue.set("20")
+    window.applyButton.trigger()      # calls the button's callback
+"""
+
+windows = []
+
+
+class _NSView(object):
+    """What getNSButton() & co. return: accepts tooltips and is otherwise inert."""
+
+    def __init__(self):
+        self.toolTip = None
+
+    def setToolTip_(self, text):
+        self.toolTip = text
+
+    def __getattr__(self, attribute):
+        return lambda *args, **kwargs: None
+
+
+class _Control(object):
+
+    def __init__(self, posSize, value=None, callback=None, sizeStyle="regular", **kwargs):
+        self.posSize = posSize
+        self._value = value
+        self._callback = callback
+        self.sizeStyle = sizeStyle
+        self.options = kwargs
+        self.enabled = True
+        self.visible = True
+        self._view = _NSView()
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def enable(self, onOff):
+        self.enabled = bool(onOff)
+
+    def show(self, onOff):
+        self.visible = bool(onOff)
+
+    def trigger(self):
+        """Act as if the user clicked or edited the control."""
+        if self._callback is not None:
+            return self._callback(self)
+
+    def getNSView(self):
+        return self._view
+
+    getNSButton = getNSTextField = getNSPopUpButton = getNSView
+
+
+class TextBox(_Control):
+
+    def __init__(self, posSize, text="", **kwargs):
+        super().__init__(posSize, text, **kwargs)
+
+
+class EditText(_Control):
+
+    def __init__(self, posSize, text="", callback=None, **kwargs):
+        super().__init__(posSize, text, callback, **kwargs)
+
+
+class TextEditor(EditText):
+    pass
+
+
+class CheckBox(_Control):
+
+    def __init__(self, posSize, title, value=False, callback=None, **kwargs):
+        super().__init__(posSize, bool(value), callback, **kwargs)
+        self.title = title
+
+    def set(self, value):
+        self._value = bool(value)
+
+
+class Button(_Control):
+
+    def __init__(self, posSize, title, callback=None, **kwargs):
+        super().__init__(posSize, None, callback, **kwargs)
+        self.title = title
+
+
+SquareButton = Button
+
+
+class PopUpButton(_Control):
+
+    def __init__(self, posSize, items, callback=None, **kwargs):
+        super().__init__(posSize, 0, callback, **kwargs)
+        self._items = list(items)
+
+    def getItems(self):
+        return self._items
+
+    def setItems(self, items):
+        self._items = list(items)
+
+
+class Slider(_Control):
+
+    def __init__(self, posSize, minValue=0, maxValue=100, value=50, callback=None, **kwargs):
+        super().__init__(posSize, value, callback, **kwargs)
+        self.minValue, self.maxValue = minValue, maxValue
+
+
+class RadioGroup(_Control):
+
+    def __init__(self, posSize, titles, callback=None, **kwargs):
+        super().__init__(posSize, 0, callback, **kwargs)
+        self.titles = list(titles)
+
+
+class HorizontalLine(_Control):
+
+    def __init__(self, posSize, **kwargs):
+        super().__init__(posSize, **kwargs)
+
+
+class Window(object):
+
+    def __init__(self, posSize, title="", minSize=None, maxSize=None, autosaveName=None, **kwargs):
+        self.posSize = posSize
+        self.title = title
+        self.autosaveName = autosaveName
+        self.isOpen = False
+        self.defaultButton = None
+
+    def open(self):
+        self.isOpen = True
+        windows.append(self)
+
+    def close(self):
+        self.isOpen = False
+
+    def makeKey(self):
+        pass
+
+    def center(self):
+        pass
+
+    def setDefaultButton(self, button):
+        self.defaultButton = button
+
+    def controls(self):
+        """{attribute name: control} of everything added to the window."""
+        return {name: value for name, value in vars(self).items() if isinstance(value, _Control)}
+
+
+class FloatingWindow(Window):
+    pass
+
+
+__all__ = [
+    "Window", "FloatingWindow", "TextBox", "EditText", "TextEditor", "CheckBox", "Button",
+    "SquareButton", "PopUpButton", "Slider", "RadioGroup", "HorizontalLine",
+]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Glyph names as a graph of base glyphs and their suffixed variants.
+
+Each name is split once into a base and its ordered suffixes:
+
+    a            → ("a", ())
+    a.ss01       → ("a", ("ss01",))
+    a.ss01.init  → ("a", ("ss01", "init"))
+
+Suffixes that match one of the cycling families are the levels a base
+cycles through, ordered by family and then by number. Positional forms
+(.init, .fina) hang off the base or off any of its cycling forms:
+
+    graph = SuffixGraph(names, families=("ss", "cv", "alt"))
+    graph.levels                     # [".ss01", ".ss02", ".cv01", ".alt"]
+    graph.form("a", ".ss01")         # "a.ss01" or None
+    graph.positional(".init")        # [("a", "a.init"), ("a.ss01", "a.ss01.init")]
+
+All families are matched with one combined regex, so building the graph
+is one pass over the names however many families there are.
+"""
+
+import re
+
+# Family name → regex for one suffix (without the dot)
+FAMILIES = {
+    "ss": r"ss\d{2}",
+    "cv": r"cv\d{2}",
+    "salt": r"salt\d*",
+    "alt": r"alt\d*",
+}
+DEFAULT_FAMILIES = ("ss",)
+POSITIONAL = ("init", "fina")
+
+_NUMBER = re.compile(r"(\d*)$")
+
+
+def _number(suffix):
+    digits = _NUMBER.search(suffix).group(1)
+    return int(digits) if digits else 0
+
+
+class SuffixGraph(object):
+
+    def __init__(self, names, families=DEFAULT_FAMILIES):
+        self.names = list(names)
+        self.families = tuple(families)
+        patterns = [f"(?P<f{index}>{FAMILIES.get(family, family)})" for index, family in enumerate(self.families)]
+        pattern = re.compile("|".join(patterns)) if patterns else None
+
+        self.parsed = []        # (name, base, suffix tuple), in order
+        self.variants = {}      # base → {suffix tuple: name}
+        self.bases = []         # names without a suffix, in order
+        levels = {}             # ".ss01" → sort key
+        for name in self.names:
+            base, _, rest = name.partition(".")
+            suffixes = tuple(rest.split(".")) if rest else ()
+            self.parsed.append((name, base, suffixes))
+            self.variants.setdefault(base, {})[suffixes] = name
+            if not suffixes:
+                self.bases.append(name)
+            elif len(suffixes) == 1 and pattern is not None:
+                match = pattern.fullmatch(suffixes[0])
+                if match:
+                    levels["." + suffixes[0]] = (int(match.lastgroup[1:]), _number(suffixes[0]), suffixes[0])
+        self.levels = sorted(levels, key=levels.get)
+        self._rank = {level[1:]: rank for rank, level in enumerate(self.levels)}
+
+    def form(self, base, *suffixes):
+        """Name of `base` with the given suffixes (".ss01", ".init"), or None."""
+        key = tuple(suffix.lstrip(".") for suffix in suffixes)
+        variants = self.variants.get(base)
+        if not variants or () not in variants:
+            return None
+        return variants.get(key)
+
+    def cycling(self, base):
+        """Levels `base` has a form for, in cycling order."""
+        rank = self._rank
+        found = [key[0] for key in self.variants.get(base, ()) if len(key) == 1 and key[0] in rank]
+        return ["." + suffix for suffix in sorted(found, key=rank.get)]
+
+    def cycling_forms(self):
+        """Names of all cycling forms of existing bases, by base and then level."""
+        return [base + level for base in self.bases for level in self.cycling(base)]
+
+    def positional(self, suffix):
+        """[(form, positional form)] for `suffix` (".init"), on bases and their cycling forms, in name order."""
+        suffix = suffix.lstrip(".")
+        pairs = []
+        for name, base, key in self.parsed:
+            if len(key) > 1 or (key and key[0] not in self._rank):
+                continue
+            variants = self.variants[base]
+            if () in variants and (key + (suffix,)) in variants:
+                pairs.append((name, variants[key + (suffix,)]))
+        return pairs
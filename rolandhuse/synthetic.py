@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Synthetic fonts for benchmarks and profiling.
+
+    font = make_font(glyphs=5000, masters=4, pairs=100000, ss_levels=20, groups=300)
+
+Fonts are reproducible for a given seed. Every base letter gets kerning
+groups, some get .ssNN/.init/.fina variants, a few are composites, and the
+kerning mixes group-group pairs with glyph exceptions, with values that are
+mostly not multiples of 5.
+"""
+
+import random
+
+from rolandhuse.glyphsfile import (
+    CURVE, LINE, OFFCURVE, GSAnchor, GSComponent, GSFont, GSFontMaster, GSGlyph,
+    GSLayer, GSNode, GSPath,
+)
+
+MASTER_NAMES = ("Thin", "Light", "Regular", "Medium", "Bold", "Black")
+PUNCTUATION = ("space", "period", "comma", "hyphen", "colon", "quotesingle")
+
+SIZES = {
+    "tiny": dict(glyphs=200, masters=2, pairs=1000, ss_levels=3, groups=20),
+    "small": dict(glyphs=1000, masters=2, pairs=10000, ss_levels=5, groups=60),
+    "medium": dict(glyphs=5000, masters=4, pairs=50000, ss_levels=10, groups=150),
+    "large": dict(glyphs=20000, masters=6, pairs=200000, ss_levels=20, groups=300),
+}
+
+
+def _base_names(count):
+    letters = [chr(code) for code in range(ord("a"), ord("z") + 1)]
+    letters += [chr(code) for code in range(ord("A"), ord("Z") + 1)]
+    for index in range(count):
+        yield letters[index] if index < len(letters) else f"uni{0xE000 + index:04X}"
+
+
+def _outline(rng, width, weight):
+    """A closed contour with straight and curved segments."""
+    left, right = 40 + weight, width - 40 - weight
+    top = rng.choice((500, 700, 720))
+    path = GSPath()
+    for x, y, node_type in (
+        (left, 0, LINE), (right, 0, LINE), (right, top * 0.55, LINE),
+        (right, top * 0.85, OFFCURVE), (right - 60, top, OFFCURVE), ((left + right) / 2, top, CURVE),
+        (left + 60, top, OFFCURVE), (left, top * 0.85, OFFCURVE), (left, top * 0.55, CURVE),
+    ):
+        path.nodes.append(GSNode((round(x), round(y)), node_type))
+    return path
+
+
+def make_font(glyphs=500, masters=2, pairs=2000, ss_levels=3, groups=40, seed=1):
+    """Build an in-memory GSFont with the given dimensions."""
+    rng = random.Random(seed)
+    font = GSFont()
+    font.familyName = "Synthetic"
+    for index in range(masters):
+        master = GSFontMaster()
+        master.id = f"m{index + 1:02d}"
+        master.name = MASTER_NAMES[index] if index < len(MASTER_NAMES) else f"Master {index + 1}"
+        font.masters.append(master)
+        master.ascender, master.capHeight, master.xHeight, master.descender = 800, 700, 500, -200
+
+    names = list(PUNCTUATION)
+    variants = {}
+    for base in _base_names(glyphs):
+        if len(names) >= glyphs:
+            break
+        names.append(base)
+        forms = []
+        if ss_levels and rng.random() < 0.6:
+            forms += [f".ss{level:02d}" for level in range(1, rng.randint(1, ss_levels) + 1)]
+        if rng.random() < 0.1:
+            forms.append(".init")
+        if rng.random() < 0.1:
+            forms.append(".fina")
+        for suffix in forms:
+            if len(names) >= glyphs:
+                break
+            names.append(base + suffix)
+        variants[base] = forms
+
+    bases = [name for name in names if "." not in name and name not in PUNCTUATION]
+    group_of = {base: (f"grp{rng.randrange(groups)}", f"grp{rng.randrange(groups)}")
+                for base in bases} if groups else {}
+    for name in names:
+        base = name.split(".")[0]
+        glyph = GSGlyph(name)
+        if name == base and name not in PUNCTUATION:
+            glyph.unicode = "%04X" % (ord(name) if len(name) == 1 else int(name[3:], 16))
+        if base in group_of:
+            glyph.leftKerningGroup, glyph.rightKerningGroup = group_of[base]
+        composite = name != base and rng.random() < 0.2
+        for weight, master in enumerate(font.masters):
+            layer = GSLayer()
+            layer.width = rng.randrange(400, 700)
+            if composite:
+                layer.shapes.append(GSComponent(base))
+            else:
+                layer.shapes.append(_outline(rng, layer.width, weight * 10))
+            layer.anchors.append(GSAnchor("top", (layer.width // 2, 700)))
+            glyph.layers[master.id] = layer
+        font.glyphs.append(glyph)
+
+    left_keys = [f"@MMK_L_grp{index}" for index in range(groups)] or bases
+    right_keys = [f"@MMK_R_grp{index}" for index in range(groups)] or bases
+    pair_keys = set()
+    attempts = 0
+    while len(pair_keys) < pairs and attempts < pairs * 4:
+        attempts += 1
+        roll = rng.random()
+        left = rng.choice(left_keys) if roll < 0.9 else rng.choice(bases)
+        right = rng.choice(right_keys) if roll < 0.6 or roll >= 0.9 else rng.choice(bases)
+        pair_keys.add((left, right))
+    for master in font.masters:
+        kerning = font.kerning.setdefault(master.id, {})
+        for left, right in sorted(pair_keys):
+            kerning.setdefault(left, {})[right] = rng.randint(-120, 60)
+    return font
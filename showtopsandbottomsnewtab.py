@@ -2,11 +2,13 @@
 __doc__="""
 Lists from selected glyphs with deviating tops
 and bottoms in current master .
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 
 import GlyphsApp
 from GlyphsApp import *
 from collections import defaultdict
+from rolandhuse.profiles import DEFAULT_PATH, ProfileCache
 
 def run():
     # Get current font and selected master
@@ -34,19 +36,30 @@ def run():
     deviations = defaultdict(list)
     values = {}
     
+    # Inside Glyphs the native layer.bounds (with corners, caps and smart components) is used.
+    # Headless, bounds come from the profile cache; unchanged glyphs are not measured again
+    profiles = ProfileCache(font, path=DEFAULT_PATH) if getattr(Glyphs, "headless", False) else None
+
     # Check each selected glyph
     for layer in font.selectedLayers:
         glyph = layer.parent
         if not glyph:
             continue
         
-        master_layer = glyph.layers[master.id]
-        if not master_layer.bounds:
-            continue
-            
-        # Calculate boundaries
-        top = master_layer.bounds.origin.y + master_layer.bounds.size.height
-        bottom = master_layer.bounds.origin.y
+        if profiles is not None:
+            bounds = profiles.get(glyph.name, master.id).bounds
+            if not bounds:
+                continue
+            top = bounds[3]
+            bottom = bounds[1]
+        else:
+            master_layer = glyph.layers[master.id]
+            if not master_layer.bounds:
+                continue
+
+            # Calculate boundaries
+            top = master_layer.bounds.origin.y + master_layer.bounds.size.height
+            bottom = master_layer.bounds.origin.y
         
         # Check top metrics
         top_deviates = True
@@ -77,6 +90,8 @@ def run():
                 dev_info.append(f"Bottom: {bottom:.1f} (vs {bottom_values})")
             
             values[glyph.name] = dev_info
+    if profiles is not None:
+        profiles.save()
     
     # Print results
     print(f"\n🔍 Vertical Metrics in {master.name}:")
@@ -3,11 +3,13 @@
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
 Presents a dialog to choose source and target masters and adjustment percentage, then copies LSB, RSB, and kerning from source to target master for selected glyphs, adjusting based on (percentage / 100) * half the weight difference.
+Needs the rolandhuse package from this repository on the Python path (see README, Installing).
 """
 import GlyphsApp
 from GlyphsApp import Glyphs, Message
 from AppKit import NSTextField, NSAlert, NSAlertStyleInformational, NSAlertFirstButtonReturn
 import traceback
+from rolandhuse.kerningresolver import KerningResolver
 
 def get_master_weight_value(master):
     """Get weight value from master name or custom parameters"""
@@ -101,12 +103,6 @@ def get_percentage(default=50):
             return None
     return None
 
-def get_glyph_groups(font, glyph):
-    """Get left and right kerning groups for a glyph"""
-    left_group = glyph.leftKerningGroup
-    right_group = glyph.rightKerningGroup
-    return left_group, right_group
-
 def adjust_kerning(font, source_master_id, target_master_id, glyphs, adjustment):
     """Copy and adjust kerning pairs for selected glyphs"""
     processed_pairs = 0
@@ -117,28 +113,30 @@ def adjust_kerning(font, source_master_id, target_master_id, glyphs, adjustment)
         if not target_kerning:
             font.kerning[target_master_id] = {}
             target_kerning = font.kerning[target_master_id]
+        resolver = KerningResolver(font)
+        snap = resolver.snap
 
         for layer in glyphs:
             glyph = layer.parent
             if not glyph:
                 continue
             glyph_name = glyph.name
-            left_group, right_group = get_glyph_groups(font, glyph)
+            group_key = snap.left_key(glyph_name)
 
-            # Check kerning pairs involving this glyph or its groups
-            for left_key in [glyph_name, f"@MMK_L_{left_group}" if left_group else None]:
+            # Check kerning pairs of this glyph (keyed by its id) and of its kerning group (first side)
+            for left_key in [glyph.id, group_key if group_key != glyph_name else None]:
                 if not left_key or left_key not in source_kerning:
                     continue
                 for right_key in source_kerning[left_key]:
                     if right_key.startswith("@MMK_R_"):
                         # Group-to-group or glyph-to-group
                         right_glyph_or_group = right_key
+                    elif snap.glyph_for_key(right_key) and resolver.source(
+                            source_master_id, glyph_name, snap.key_name(right_key)) == (
+                            snap.key_name(left_key), snap.key_name(right_key)):
+                        # Pair with a glyph on the right, and it is the one Glyphs applies
+                        right_glyph_or_group = right_key
                     else:
-                        # Glyph-to-glyph
-                        right_glyph = font.glyphs[right_key]
-                        right_glyph_group = right_glyph.rightKerningGroup if right_glyph else None
-                        right_glyph_or_group = right_key if right_glyph and (not right_glyph_group or f"@MMK_R_{right_glyph_group}" not in source_kerning[left_key]) else None
-                    if not right_glyph_or_group:
                         continue
 
                     # Get source kerning value
@@ -148,15 +146,16 @@ def adjust_kerning(font, source_master_id, target_master_id, glyphs, adjustment)
 
                     # Adjust kerning value
                     new_kerning = kerning_value + adjustment
+                    pair_name = f"{snap.key_name(left_key)} -> {snap.key_name(right_glyph_or_group)}"
                     # Warn if kerning is extreme (e.g., > 200 or < -200)
                     if abs(new_kerning) > 200:
-                        extreme_kerning_pairs.append(f"{left_key} -> {right_glyph_or_group}: {new_kerning:.2f}")
+                        extreme_kerning_pairs.append(f"{pair_name}: {new_kerning:.2f}")
 
                     # Apply to target master
                     if left_key not in target_kerning:
                         target_kerning[left_key] = {}
                     target_kerning[left_key][right_glyph_or_group] = new_kerning
-                    print(f"Adjusted kerning {left_key} -> {right_glyph_or_group}: {kerning_value:.2f} to {new_kerning:.2f}")
+                    print(f"Adjusted kerning {pair_name}: {kerning_value:.2f} to {new_kerning:.2f}")
                     processed_pairs += 1
 
         return processed_pairs, extreme_kerning_pairs
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rolandhuse import feacache, profiles, snapshot, standin, synthetic  # noqa: E402
+
+standin.install()
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """Caches go to a temporary folder; no snapshot, window or font survives a test."""
+    monkeypatch.setattr(profiles, "DEFAULT_PATH", str(tmp_path / "profiles.npz"))
+    monkeypatch.setattr(feacache, "DEFAULT_PATH", str(tmp_path / "features.json"))
+    snapshot.invalidate()
+    standin.reset()
+    yield
+    snapshot.invalidate()
+
+
+@pytest.fixture(params=[False, True], ids=["names", "glyph-ids"])
+def make_font(request):
+    """synthetic.make_font, run once with glyphs addressed by name (headless) and once by UUID (as in Glyphs)."""
+    def make(**kwargs):
+        font = synthetic.make_font(**kwargs)
+        if request.param:
+            font.use_glyph_ids()
+        return font
+    return make
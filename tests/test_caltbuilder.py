@@ -0,0 +1,112 @@
+import pytest
+
+from rolandhuse import caltbuilder
+from rolandhuse.featureindex import FeatureIndex
+from rolandhuse.glyphsfile import GSFont
+from rolandhuse.gsubsim import GSUBSimulator
+
+
+def _build(font, **options):
+    presence = caltbuilder.scan_masters(font)
+    fingerprint = caltbuilder.fingerprint(presence, **options)
+    classes, features, _ = caltbuilder.build(caltbuilder.combine(presence), **options)
+    return classes, features, fingerprint
+
+
+def test_rebuild_skips_only_untouched_output(make_font):
+    font = make_font(glyphs=80, masters=2, pairs=0)
+    classes, features, fingerprint = _build(font)
+    assert not caltbuilder.is_current(font, fingerprint)
+    assert caltbuilder.write_changed(font, classes, features, fingerprint) == (
+        [name for name, _ in classes], [tag for tag, _ in features])
+    assert caltbuilder.is_current(font, fingerprint)
+    assert caltbuilder.write_changed(font, classes, features, fingerprint) == ([], [])
+
+    # A hand edit of the generated code makes the next run rebuild and restore it
+    font.features["calt"].code += "\nsub a by b;"
+    assert not caltbuilder.is_current(font, fingerprint)
+    assert caltbuilder.write_changed(font, classes, features, fingerprint) == ([], ["calt"])
+    font.classes["NotLetter"].code = "period"
+    assert not caltbuilder.is_current(font, fingerprint)
+    assert caltbuilder.write_changed(font, classes, features, fingerprint) == (["NotLetter"], [])
+    assert caltbuilder.is_current(font, fingerprint)
+
+    # and so does another option
+    assert not caltbuilder.is_current(font, _build(font, families=("ss", "cv"))[2])
+
+
+def test_old_fingerprints_rebuild(make_font):
+    font = make_font(glyphs=80, masters=1, pairs=0)
+    classes, features, fingerprint = _build(font)
+    caltbuilder.write_changed(font, classes, features, fingerprint)
+    stored = font.userData[caltbuilder.USER_DATA_KEY]
+    stored["classes"], stored["features"] = list(stored["classes"]), list(stored["features"])
+    assert not caltbuilder.is_current(font, fingerprint)
+    assert FeatureIndex(font).feature_code("calt") == dict(features)["calt"]
+
+
+def _presence_font(make_font):
+    font = make_font(glyphs=80, masters=2, pairs=0)
+    first, second = font.masters[0].id, font.masters[1].id
+    font.glyphs["b"].layers[second].shapes[:] = []      # drawn in the first master only
+    font.glyphs["c"].export = False
+    for layer in font.glyphs["space"].layers:
+        layer.shapes[:] = []
+    return font, first, second
+
+
+def test_present_names(make_font):
+    font, first, second = _presence_font(make_font)
+    names = caltbuilder.present_names(font, first)
+    assert "b" in names and "c" not in names and "space" not in names
+    assert names == [glyph.name for glyph in font.glyphs if glyph.name in set(names)]
+    assert "b" not in caltbuilder.present_names(font, second)
+
+
+def test_all_masters(make_font):
+    font, first, second = _presence_font(make_font)
+    presence = caltbuilder.scan_masters(font)
+    assert presence == {first: caltbuilder.present_names(font, first),
+                        second: caltbuilder.present_names(font, second)}
+    assert caltbuilder.inconsistencies(presence) == {"b": [first]}
+    assert "b" not in caltbuilder.combine(presence, "intersection")
+    assert caltbuilder.combine(presence, "union") == presence[first]
+    with pytest.raises(ValueError):
+        caltbuilder.combine(presence, "majority")
+
+
+def test_parallel_scan_reads_the_saved_file(make_font, tmp_path):
+    path = str(tmp_path / "Font.glyphs")
+    make_font(glyphs=80, masters=2, pairs=0).save(path)
+    font = GSFont(path)
+    assert caltbuilder.scan_masters(font, processes=2) == caltbuilder.scan_masters(GSFont(path))
+    # an edited font is scanned in memory, not from the stale file
+    font.glyphs["a"].layers[font.masters[0].id].shapes[:] = []
+    assert "a" not in caltbuilder.scan_masters(font, processes=2)[font.masters[0].id]
+
+
+def _fea(classes, features):
+    return "\n".join([f"@{name} = [{' '.join(members)}];" for name, members in classes]
+                     + [f"feature {tag} {{\n{code}\n}} {tag};" for tag, code in features])
+
+
+def test_chains_take_only_the_glyphs_they_change():
+    names = ["a", "a.ss01", "a.ss02", "b", "b.ss01", "c", "period.case", "colon.case"]
+    classes, features, suffixes = caltbuilder.build(names)
+    calt = dict(features)["calt"]
+    assert suffixes == [".ss01", ".ss02"]
+    assert "@AllCycling'" not in calt
+    assert "sub @AllBase @NotLetter @Base_withSS01' lookup sub_Base_to_SS01;" in calt
+    assert "sub @SS01_all @SS01_withSS02' lookup sub_SS01_to_SS02;" in calt
+
+    # same glyphs as chains over every cycling glyph
+    wide = [(tag, code.replace("@Base_withSS01'", "@AllCycling'").replace("@SS01_withSS02'", "@AllCycling'")
+             .replace("@SS01_all'", "@AllCycling'").replace("@SS02_all'", "@AllCycling'")) for tag, code in features]
+    text = "a a b a c a period.case a a b colon.case b a period.case colon.case a".split()
+    shaped = GSUBSimulator(_fea(classes, features)).shape(text, ["calt"])
+    assert shaped == GSUBSimulator(_fea(classes, wide)).shape(text, ["calt"])
+    assert shaped[:2] == ["a", "a.ss01"] and shaped != text
+
+    # no NotLetter glyphs: no skip rules, as an empty class does not compile
+    classes, features, _ = caltbuilder.build(["a", "a.ss01", "b"])
+    assert "@NotLetter" not in dict(features)["calt"]
@@ -0,0 +1,31 @@
+from itertools import product
+
+import numpy as np
+
+from rolandhuse.crashes import CrashFinder
+
+
+def test_crash_values_open_pairs_to_the_margin(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=300, groups=10)
+    master_id = font.masters[0].id
+    names = [glyph.name for glyph in font.glyphs][6:]
+    margin = 80
+    crashes = CrashFinder(font, master_id, margin).crashes(product(names, names))
+    assert crashes
+
+    # Written to their keys one by one, each value opens its pair to at least the margin
+    crash = crashes[0]
+    font.setKerningForPair(master_id, crash.left_key, crash.right_key, crash.value)
+    finder = CrashFinder(font, master_id, margin)
+    gap = finder.gaps([(crash.left, crash.right)])[0]
+    assert margin <= gap < margin + 1
+    assert finder.crashes([(crash.left, crash.right)]) == []
+
+
+def test_gaps_follow_the_kerning(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=300)
+    finder = CrashFinder(font, font.masters[0].id)
+    pairs = [("a", "b"), ("o", "v")]
+    plain = finder.gaps(pairs, [0, 0])
+    assert np.isfinite(plain).all()
+    np.testing.assert_allclose(finder.gaps(pairs, [-30, 15]), plain + [-30, 15])
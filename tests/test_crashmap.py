@@ -0,0 +1,43 @@
+from itertools import product
+
+import pytest
+
+from rolandhuse.crashes import CrashFinder, text_pairs
+from rolandhuse.crashmap import crash_map
+
+
+def _brute_force(font, master_id, margin):
+    """Closest crash per kerning pair, checking every glyph pair one by one."""
+    names = [glyph.name for glyph in font.glyphs]
+    closest = {}
+    for crash in CrashFinder(font, master_id, margin).crashes(product(names, names)):
+        key = (crash.left_key, crash.right_key)
+        if key not in closest or crash.gap < closest[key].gap:
+            closest[key] = crash
+    return closest
+
+
+@pytest.mark.parametrize("margin", [0, 60])
+def test_matches_brute_force(make_font, margin):
+    font = make_font(glyphs=120, masters=2, pairs=1500, groups=20)
+    for master in font.masters:
+        expected = _brute_force(font, master.id, margin)
+        found = {(crash.left_key, crash.right_key): crash for crash in crash_map(font, master.id, margin, processes=1)}
+        assert expected
+        assert found.keys() == expected.keys()
+        for key, crash in found.items():
+            assert crash.gap == pytest.approx(expected[key].gap, abs=1e-3)
+            assert crash.kerning == expected[key].kerning
+
+
+def test_keys_are_names(make_font):
+    font = make_font(glyphs=120, masters=1, pairs=1500, groups=20)
+    crashes = crash_map(font, font.masters[0].id, 60, processes=1)
+    glyph_keys = {key for crash in crashes for key in (crash.left_key, crash.right_key) if not key.startswith("@")}
+    assert glyph_keys and all(font.glyphs[key] is not None for key in glyph_keys)
+
+
+def test_text_pairs(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    assert text_pairs(font, "ab/a.ss01 c\nde/missing f") == [
+        ("a", "b"), ("b", "a.ss01"), ("a.ss01", "c"), ("d", "e")]
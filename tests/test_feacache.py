@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from rolandhuse.featureindex import FeatureIndex
+from rolandhuse.feacache import FeatureCache
+
+pytest.importorskip("fontTools")
+
+
+def _font(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    with FeatureIndex(font) as index:
+        index.set_class("Vowels", "a e")
+        index.set_feature("ss01", "lookup vowels {\n    sub @Vowels by [a.ss01 e.ss01];\n} vowels;")
+        index.set_feature("calt", "sub b @Vowels' lookup vowels;")
+        index.set_feature("liga", "sub f i by a;")
+    return font
+
+
+def test_only_changed_features_recompile(make_font, tmp_path):
+    font = _font(make_font)
+    path = str(tmp_path / "features.json")
+    cache = FeatureCache(path)
+    results = cache.check(font)
+    assert all(result.ok for result in results.values()) and cache.compiled == 3
+    assert results["calt"].lookups == 2     # its own and the borrowed ss01 lookup
+    cache.save()
+
+    cache = FeatureCache(path)
+    assert all(result.cached for result in cache.check(font).values())
+    font.features["liga"].code = "sub f l by a;"
+    results = cache.check(font)
+    assert [tag for tag, result in results.items() if not result.cached] == ["liga"]
+    # a class change reaches the features that use it, and only those
+    font.classes["Vowels"].code = "a"
+    results = cache.check(font)
+    assert sorted(tag for tag, result in results.items() if not result.cached) == ["calt", "ss01"]
+
+
+def test_errors_point_into_the_feature(make_font):
+    font = _font(make_font)
+    font.features["liga"].code = "sub f i by a;\nsub x y by nothing_here;"
+    result = FeatureCache().check(font, ["liga"])["liga"]
+    assert not result.ok and "liga line 2" in result.message
+
+
+@pytest.mark.parametrize("content", [b"", b'{"abc": {"ok": tr', b"[1, 2]", b"\xff\xfe"])
+def test_unreadable_cache_files_start_over(make_font, tmp_path, content):
+    path = tmp_path / "features.json"
+    path.write_bytes(content)
+    cache = FeatureCache(str(path))
+    assert cache.entries == {}
+    cache.check(_font(make_font), ["liga"])
+    cache.save()
+    assert len(FeatureCache(str(path)).entries) == 1
+    assert os.listdir(tmp_path) == ["features.json"]
@@ -0,0 +1,60 @@
+from rolandhuse.featureindex import FeatureIndex, count_rules
+
+
+def test_upserts_are_queued_and_written_once(make_font):
+    font = make_font(glyphs=40, masters=1, pairs=0)
+    with FeatureIndex(font) as index:
+        assert index.set_class("Vowels", "a e")
+        assert index.set_feature("ss01", "sub a by a.ss01;")
+        assert index.set_feature("liga", "sub f i by f_i;")
+        assert index.pending == 3
+        assert index.feature_code("ss01") == "sub a by a.ss01;"
+        assert not font.features["ss01"]
+    assert [feature.name for feature in font.features] == ["ss01", "liga"]
+    assert font.classes["Vowels"].code == "a e"
+
+    index = FeatureIndex(font)
+    assert not index.set_class("Vowels", "a e")
+    assert index.set_feature("ss01", index.feature_code("ss01") + "\nsub e by e.ss01;")
+    assert index.commit() == 1 and index.pending == 0
+    assert font.features["ss01"].code == "sub a by a.ss01;\nsub e by e.ss01;"
+    assert [feature.name for feature in font.features] == ["ss01", "liga"]
+
+
+def test_failed_block_writes_nothing(make_font):
+    font = make_font(glyphs=40, masters=1, pairs=0)
+    try:
+        with FeatureIndex(font) as index:
+            index.set_prefix("Languagesystems", "languagesystem DFLT dflt;")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert not font.featurePrefixes["Languagesystems"]
+
+
+def test_count_rules():
+    assert count_rules("sub a by b; # sub c by d;\npos a b -10;\nsubstitute x by y;") == 3
+
+
+def test_dry_run_prints_a_diff_and_leaves_the_font(make_font, capsys):
+    font = make_font(glyphs=40, masters=1, pairs=0)
+    with FeatureIndex(font) as index:
+        index.set_class("Vowels", "a e")
+        index.set_feature("ss01", "sub a by a.ss01;")
+
+    index = FeatureIndex(font, dry_run=True)
+    index.set_class("Vowels", "a e o")
+    index.set_feature("ss01", "sub a by a.ss01;\nsub e by e.ss01;")
+    index.set_feature("liga", "sub f i by f_i;")
+    assert index.commit() == 3
+    out = capsys.readouterr().out
+    assert "--- a/classes/Vowels\n+++ b/classes/Vowels" in out
+    assert "\n+o\n" in out and "\n+sub e by e.ss01;" in out
+    assert "--- /dev/null\n+++ b/features/liga" in out
+    assert "classes/Vowels: changed, glyphs 2 → 3" in out
+    assert "features/ss01: changed, rules 1 → 2" in out
+    assert "features/liga: new, rules 0 → 1" in out
+    assert font.classes["Vowels"].code == "a e" and not font.features["liga"]
+
+    assert FeatureIndex(font, dry_run=True).commit() == 0
+    assert "up to date" in capsys.readouterr().out
@@ -0,0 +1,24 @@
+from rolandhuse.glyphrefs import scan
+
+
+def test_unknown_glyphs_and_suggestions():
+    refs = scan("sub a by b.ss01;\nsub ten-rovas by c;", {"a", "b", "ten.rovas", "c"})
+    assert [(ref.line, ref.name, ref.suggestion) for ref in refs] == [
+        (1, "b.ss01", None), (2, "ten-rovas", "ten.rovas")]
+
+
+def test_definition_names_are_not_glyphs():
+    code = ("anchorDef 120 -20 ANCHOR_1;\n"
+            "valueRecordDef <0 0 10 0> KERN_A;\n"
+            "pos a <valueRecord KERN_A>;\n"
+            "pos base x <anchor ANCHOR_1> mark @TOP;")
+    assert [ref.name for ref in scan(code, {"a"}, {"TOP"})] == ["x"]
+
+
+def test_ranges_only_inside_brackets():
+    glyphs = {"a", "z", "f", "ten-rovas", "x"}
+    code = ("@lc = [a-z a - z];\n"
+            "sub f-f by x;\n"
+            "sub [f ten-rovas] by x;\n"
+            "sub a-z by x;")
+    assert [(ref.line, ref.name) for ref in scan(code, glyphs)] == [(2, "f-f"), (4, "a-z")]
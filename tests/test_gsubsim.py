@@ -0,0 +1,73 @@
+import pytest
+
+from rolandhuse import caltbuilder
+from rolandhuse.featureindex import FeatureIndex
+from rolandhuse.gsubsim import FeaError, GSUBSimulator, text_to_glyphs
+
+# Code Glyphs generates or users write next to the builders' features
+REAL_FONT_CODE = [
+    ("aalt", "feature locl;\nfeature salt;\nfeature ss01;"),
+    ("ccmp", "lookup ccmp_1 {\n    sub a_b by a b;\n} ccmp_1;"),
+    ("salt", "sub a from [a.ss01 a.ss02];"),
+    ("ss01", 'featureNames {\n    name "Single-storey a";\n};\nsub a by a.ss01;'),
+    ("kern", "lookupflag IgnoreMarks;\npos @MMK_L_a b -20;\nenum pos a [b c] -10;\npos a <0 0 -5 0>;"),
+    ("mark", "markClass [acutecomb] <anchor 0 500> @TOP;\npos base [a b] <anchor 250 500> mark @TOP;"),
+]
+
+
+def _font(make_font):
+    font = make_font(glyphs=80, masters=1, pairs=0)
+    presence = caltbuilder.scan_masters(font)
+    classes, features, _ = caltbuilder.build(caltbuilder.combine(presence))
+    caltbuilder.write(font, classes + [("MMK_L_a", ["a"])], REAL_FONT_CODE + features)
+    with FeatureIndex(font) as index:
+        index.set_prefix("Languagesystems", "languagesystem DFLT dflt;\nlanguagesystem latn dflt;")
+        index.set_prefix("kerning", "lookup kern_extra {\n    lookupflag IgnoreMarks;\n    pos a a -5;\n} kern_extra;")
+    return font
+
+
+def test_only_the_requested_features_are_read(make_font):
+    font = _font(make_font)
+    sim = GSUBSimulator.from_font(font, ["calt"])
+    assert list(sim.features) == ["calt"]
+    shaped = sim.shape(["a", "a", "a", "a"], ["calt"])
+    assert shaped[:2] == ["a", "a.ss01"]
+
+
+def test_whole_fonts_parse(make_font):
+    sim = GSUBSimulator.from_font(_font(make_font))
+    assert {"aalt", "ccmp", "salt", "ss01", "kern", "mark", "calt"} <= set(sim.features)
+    assert sim.shape(["a_b", "c"], ["ccmp"]) == ["a", "b", "c"]
+    assert sim.shape(["a", "b"], ["salt"]) == ["a.ss01", "b"]
+    assert sim.shape(["a", "b"], ["kern", "mark", "aalt"]) == ["a", "b"]
+
+
+def test_lookupflags_on_substitutions_are_reported():
+    with pytest.raises(FeaError, match="IgnoreMarks"):
+        GSUBSimulator("feature liga {\n    lookupflag IgnoreMarks;\n    sub f i by f_i;\n} liga;")
+    sim = GSUBSimulator("feature liga {\n    lookupflag IgnoreMarks;\n    lookupflag 0;\n    sub f i by f_i;\n} liga;")
+    assert sim.shape(["f", "i", "x"]) == ["f_i", "x"]
+    # a feature nobody asked for is not read at all
+    GSUBSimulator("feature liga { lookupflag IgnoreMarks; sub f i by f_i; } liga;", ["calt"])
+
+
+def test_contexts_ligatures_and_stats():
+    sim = GSUBSimulator("""
+        @Vowel = [a e];
+        lookup to_alt { sub @Vowel by [a.alt e.alt]; } to_alt;
+        feature calt {
+            ignore sub x @Vowel';
+            sub [b c] @Vowel' lookup to_alt;
+        } calt;
+        feature liga { sub f f i by f_f_i; sub f i by f_i; } liga;
+    """)
+    assert sim.shape(["b", "e", "x", "a", "c", "a"], ["calt"]) == ["b", "e.alt", "x", "a", "c", "a.alt"]
+    assert sim.shape(["f", "f", "i", "f", "i"], ["liga"]) == ["f_f_i", "f_i"]
+    assert sim.stats["glyphs"] == 11 and sim.stats["rules"] > 0
+    with pytest.raises(FeaError, match="unknown class"):
+        GSUBSimulator("feature calt { sub @Nothing' lookup x; } calt;")
+
+
+def test_text_to_glyphs(make_font):
+    font = make_font(glyphs=80, masters=1, pairs=0)
+    assert text_to_glyphs(font, "ab/a.ss01 c?") == ["a", "b", "a.ss01", "c"]
@@ -0,0 +1,33 @@
+import os
+
+import vanilla
+
+from rolandhuse.crashes import CrashFinder, text_pairs
+from rolandhuse.headless import run_script
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "KernAwaySelectedCrashes.py")
+
+
+def test_shared_keys_get_one_pair(make_font, capsys):
+    font = make_font(glyphs=60, masters=1, pairs=0, groups=10)
+    master_id = font.masters[0].id
+    text = "dogoko\ndo ko"      # d, g and k share a right group: do, go and ko are one pair
+    pairs = text_pairs(font, text)
+    needed = {}
+    for crash in CrashFinder(font, master_id, 200).crashes(pairs):
+        key = (crash.left_key, crash.right_key)
+        needed[key] = max(needed.get(key, crash.value), crash.value)
+    assert len(pairs) == 5 and len(needed) < len(pairs)
+
+    run_script(SCRIPT, font)
+    window = vanilla.windows[-1]
+    window.input.set("200")
+    window.source.set(2)
+    window.text.set(text)
+    window.applyButton.trigger()
+
+    assert "5 glyph pair(s) from text below" in capsys.readouterr().out
+    assert len(font.currentTab.text.split()) == len(needed)
+    for (left_key, right_key), value in needed.items():
+        assert font.kerningForPair(master_id, left_key, right_key) == value
+    assert CrashFinder(font, master_id, 200).crashes(pairs) == []
@@ -0,0 +1,21 @@
+from rolandhuse.kerningcheck import EMPTY_GROUP, UNKNOWN_GLYPH, WRONG_SIDE, KerningKeys, find_orphans
+
+
+def test_orphans(make_font):
+    font = make_font(glyphs=80, masters=2, pairs=0)
+    a, b = font.glyphs["a"], font.glyphs["b"]
+    left_group, right_group = "@MMK_L_" + a.rightKerningGroup, "@MMK_R_" + b.leftKerningGroup
+    font.kerning[font.masters[0].id] = {
+        a.id: {b.id: -10, "ghost": -20, "@MMK_R_nobody": -30},
+        left_group: {right_group: -40, "@MMK_L_" + b.leftKerningGroup: -50},
+    }
+    found = {(orphan.left, orphan.right): orphan.reason for orphan in find_orphans(font)}
+    assert found == {
+        (a.id, "ghost"): "right: " + UNKNOWN_GLYPH,
+        (a.id, "@MMK_R_nobody"): "right: " + EMPTY_GROUP,
+        (left_group, "@MMK_L_" + b.leftKerningGroup): "right: " + WRONG_SIDE,
+    }
+
+    keys = KerningKeys(font)
+    assert keys.is_valid_left(a.id) and keys.is_valid_left("a") and keys.is_valid_right(right_group)
+    assert not keys.is_valid_left(right_group)
@@ -0,0 +1,67 @@
+from rolandhuse.glyphsfile import GSFont
+from rolandhuse.kerningcommit import commit_kerning, kerning_delta
+
+
+class RefusingFont(GSFont):
+    """A font that only takes kerning pair by pair, like Glyphs when the bulk assignment fails."""
+
+    @property
+    def kerning(self):
+        return GSFont.kerning.fget(self)
+
+    @kerning.setter
+    def kerning(self, value):
+        if hasattr(self, "_kerning"):
+            raise TypeError("read-only")
+        GSFont.kerning.fset(self, value)
+
+
+def _changes(font):
+    """Set one glyph pair, change one group pair and remove another, all by font.kerning keys."""
+    master_id = font.masters[0].id
+    rows = font.kerning[master_id]
+    group_left = next(key for key in rows if key.startswith("@") and len(rows[key]) > 1)
+    first, second = list(rows[group_left])[:2]
+    a, b = font.glyphs["a"].id, font.glyphs["b"].id
+    return {master_id: {a: {b: -33}, group_left: {first: 7, second: None}}}, (group_left, first, second)
+
+
+def _check(font, keys):
+    master_id = font.masters[0].id
+    group_left, first, second = keys
+    assert font.kerningForPair(master_id, "a", "b") == -33
+    assert font.kerning[master_id][font.glyphs["a"].id][font.glyphs["b"].id] == -33
+    assert font.kerning[master_id][group_left][first] == 7
+    assert second not in font.kerning[master_id][group_left]
+
+
+def test_bulk_commit(make_font):
+    font = make_font(glyphs=80, masters=2, pairs=400)
+    other = {left: dict(row) for left, row in font.kerning[font.masters[1].id].items()}
+    changes, keys = _changes(font)
+    assert commit_kerning(font, changes) == 3
+    _check(font, keys)
+    assert font.kerning[font.masters[1].id] == other
+
+
+def test_pairwise_fallback(make_font, capsys):
+    font = make_font(glyphs=80, masters=1, pairs=400)
+    font.__class__ = RefusingFont
+    changes, keys = _changes(font)
+    commit_kerning(font, changes)
+    _check(font, keys)
+    assert "one by one" in capsys.readouterr().out
+
+
+def test_replace_and_delta(make_font):
+    font = make_font(glyphs=80, masters=1, pairs=400)
+    master_id = font.masters[0].id
+    old = {left: dict(row) for left, row in font.kerning[master_id].items()}
+    new = {left: {right: value - 1 for right, value in list(row.items())[1:]} for left, row in old.items()}
+    new = {left: row for left, row in new.items() if row}
+    delta = kerning_delta(old, new)
+    commit_kerning(font, {master_id: delta})
+    assert font.kerning[master_id] == new
+
+    commit_kerning(font, {master_id: {"@MMK_L_x": {"@MMK_R_y": 1}}}, replace=True)
+    assert font.kerning[master_id] == {"@MMK_L_x": {"@MMK_R_y": 1}}
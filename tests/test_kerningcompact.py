@@ -0,0 +1,54 @@
+from itertools import product
+
+from rolandhuse.kerningcompact import compact_kerning
+from rolandhuse.kerningresolver import KerningResolver
+
+
+def _applied(font, names):
+    return KerningResolver(font).batch(list(product(names, names)))
+
+
+def test_removes_only_redundant_pairs(make_font):
+    font = make_font(glyphs=120, masters=2, pairs=1500)
+    names = [glyph.name for glyph in font.glyphs]
+    resolver = KerningResolver(font)
+
+    # Glyph exceptions that repeat the value their groups give anyway
+    master_id = font.masters[0].id
+    plain = [name for name in names[6:] if font.glyphs[name].id not in font.kerning[master_id]]
+    redundant = []
+    for left, right in product(plain, names[6:40]):
+        values = resolver.values(left, right)
+        if any(values.values()) and len(redundant) < 60:
+            redundant.append((left, right))
+    for left, right in redundant:
+        for master_id, value in resolver.values(left, right).items():
+            font.setKerningForPair(master_id, left, right, value)
+    # and one that changes it
+    kept = redundant.pop()
+    for master_id, value in resolver.values(*kept).items():
+        font.setKerningForPair(master_id, kept[0], kept[1], value + 7)
+
+    before = _applied(font, names)
+    report = compact_kerning(font)
+
+    assert set(redundant) <= set(report["removed"])
+    assert kept not in report["removed"]
+    assert _applied(font, names) == before
+    assert report["pairs"] == {master.id: sum(len(row) for row in font.kerning[master.id].values())
+                               for master in font.masters}
+
+
+def test_dry_run_changes_nothing(make_font):
+    font = make_font(glyphs=120, masters=2, pairs=1500)
+    glyph = font.glyphs["a"]
+    pair = ("@MMK_L_" + glyph.rightKerningGroup, "@MMK_R_" + glyph.leftKerningGroup)
+    for master in font.masters:
+        font.setKerningForPair(master.id, pair[0], pair[1], 0)
+    kerning = {master_id: {left: dict(row) for left, row in rows.items()}
+               for master_id, rows in font.kerning.items()}
+    report = compact_kerning(font, apply=False)
+    assert report["removed"] == [pair]
+    assert report["zeros"] == {master.id: 1 for master in font.masters}
+    assert report["pairs"] is None
+    assert font.kerning == kerning
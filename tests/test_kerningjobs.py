@@ -0,0 +1,39 @@
+import pytest
+
+from rolandhuse.kerningcheck import KerningKeys
+from rolandhuse.kerningjobs import run_master_jobs, transform_kerning
+
+
+def test_transforms_apply_in_order():
+    kerning = {"@MMK_L_T": {"@MMK_R_o": -62, "a": 2}, "V": {"x": -41}}
+    result, report = transform_kerning(kerning, [("round", 5), ("prune_zeros",),
+                                                 ("validate", {"@MMK_L_T", "V"}, {"@MMK_R_o", "a"})])
+    assert result == {"@MMK_L_T": {"@MMK_R_o": -60}}
+    assert report == {"pairs": 3, "zeros": 1, "orphans": [("V", "x", -40)], "result": 1}
+    with pytest.raises(ValueError):
+        transform_kerning(kerning, [("shout",)])
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_pool_matches_single_process(make_font, processes):
+    font = make_font(glyphs=80, masters=3, pairs=400)
+    expected = {master.id: transform_kerning(font.kerning[master.id], [("scale", 0.9), ("round", 5)])[0]
+                for master in font.masters}
+    reports = run_master_jobs(font, [("scale", 0.9), ("round", 5)], processes=processes)
+    assert sorted(reports) == sorted(expected)
+    assert {master.id: font.kerning[master.id] for master in font.masters} == expected
+
+
+def test_validate_keeps_glyph_id_keys(make_font):
+    font = make_font(glyphs=80, masters=1, pairs=400)
+    master_id = font.masters[0].id
+    before = sum(len(row) for row in font.kerning[master_id].values())
+    font.kerning[master_id]["@MMK_L_nothing"] = {"@MMK_R_nothing": -5}
+    keys = KerningKeys(font)
+    reports = run_master_jobs(font, [("validate", keys.left, keys.right)], processes=1)
+    orphans = reports[master_id]["orphans"]
+    assert ("@MMK_L_nothing", "@MMK_R_nothing", -5) in orphans
+    # Glyph-level keys are glyph ids inside Glyphs and stay valid; only empty groups are orphans
+    assert all(key.startswith("@") for left, right, _ in orphans
+               for key, valid in ((left, keys.left), (right, keys.right)) if key not in valid)
+    assert sum(len(row) for row in font.kerning[master_id].values()) == before + 1 - len(orphans)
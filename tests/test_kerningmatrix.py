@@ -0,0 +1,34 @@
+from rolandhuse.kerningmatrix import FontKerning, KerningMatrix
+
+
+KERNING = {"@MMK_L_T": {"@MMK_R_o": -62, "a": 0, "e": -12.5}, "V": {"@MMK_R_o": -41}, "W": {}}
+
+
+def test_dict_round_trip_keeps_ints():
+    kerning = KerningMatrix.from_dict(KERNING).to_dict()
+    assert kerning == {"@MMK_L_T": {"@MMK_R_o": -62, "a": 0, "e": -12.5}, "V": {"@MMK_R_o": -41}}
+    assert [type(value) for value in kerning["@MMK_L_T"].values()] == [int, int, float]
+    assert [type(value) for _, _, value in KerningMatrix.from_dict(KERNING).pairs()] == [int, int, float, int]
+
+
+def test_operations():
+    matrix = KerningMatrix.from_dict(KERNING)
+    assert matrix.rounded(5).to_dict() == {"@MMK_L_T": {"@MMK_R_o": -60, "a": 0, "e": -10}, "V": {"@MMK_R_o": -40}}
+    assert matrix.without_zeros().to_dict() == {"@MMK_L_T": {"@MMK_R_o": -62, "e": -12.5}, "V": {"@MMK_R_o": -41}}
+    assert matrix.clamped(-50, None).get("@MMK_L_T", "@MMK_R_o") == -50
+    assert matrix.get("V", "e", "none") == "none"
+    assert matrix.changed(matrix.offset(0)).sum() == 0
+    assert matrix.changed(matrix.rounded(5)).sum() == 3
+
+
+def test_font_kerning_writes_changed_masters(make_font):
+    font = make_font(glyphs=80, masters=2, pairs=400)
+    first, second = font.masters[0].id, font.masters[1].id
+    untouched = {left: dict(row) for left, row in font.kerning[second].items()}
+    kerning = FontKerning(font)
+    kerning[first] = kerning[first].rounded(5).without_zeros()
+    assert kerning.write() == [first]
+    values = [value for row in font.kerning[first].values() for value in row.values()]
+    assert values and all(value % 5 == 0 and value != 0 and isinstance(value, int) for value in values)
+    assert font.kerning[second] == untouched
+    assert kerning.write() == []
@@ -0,0 +1,54 @@
+from itertools import product
+
+from rolandhuse import synthetic
+from rolandhuse.kerningresolver import KerningResolver
+from rolandhuse.snapshot import LEFT_PREFIX, RIGHT_PREFIX
+
+
+def _pair(font):
+    """Two grouped glyphs of the font and their group keys."""
+    left, right = font.glyphs["a"], font.glyphs["b"]
+    return left.name, right.name, LEFT_PREFIX + left.rightKerningGroup, RIGHT_PREFIX + right.leftKerningGroup
+
+
+def test_precedence(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    master_id = font.masters[0].id
+    left, right, left_group, right_group = _pair(font)
+
+    resolver = KerningResolver(font)
+    assert resolver.lookup(master_id, left, right) == (0, None, None)
+    assert resolver.source(master_id, left, right) is None
+
+    # Each more specific pair overrides the ones before it
+    for value, (left_key, right_key) in enumerate(
+            [(left_group, right_group), (left_group, right), (left, right_group), (left, right)], 1):
+        font.setKerningForPair(master_id, left_key, right_key, -10 * value)
+        resolver.clear()
+        assert resolver.lookup(master_id, left, right) == (-10 * value, left_key, right_key)
+
+    # and removing it falls back to the next one
+    for value, (left_key, right_key) in [(3, (left, right)), (2, (left, right_group)), (1, (left_group, right))]:
+        font.removeKerningForPair(master_id, left_key, right_key)
+        resolver.clear()
+        assert resolver.value(master_id, left, right) == -10 * value
+
+
+def test_keys_are_names_with_glyph_ids(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    master_id = font.masters[0].id
+    left, right, _, right_group = _pair(font)
+    font.setKerningForPair(master_id, left, right_group, -40)
+
+    assert KerningResolver(font).source(master_id, left, right) == (left, right_group)
+    # font.kerning itself holds the glyph's id, which differs from its name in glyph-id mode
+    assert right_group in font.kerning[master_id][font.glyphs[left].id]
+
+
+def test_same_values_by_name_and_by_id(make_font):
+    font = make_font(glyphs=120, masters=2, pairs=1500)
+    names = [glyph.name for glyph in font.glyphs]
+    pairs = list(product(names, names))
+    values = KerningResolver(font).batch(pairs)
+    assert any(value for each in values for value in each.values())
+    assert values == KerningResolver(synthetic.make_font(glyphs=120, masters=2, pairs=1500)).batch(pairs)
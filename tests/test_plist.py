@@ -0,0 +1,93 @@
+import pytest
+
+from rolandhuse import plist, synthetic
+from rolandhuse.glyphsfile import GSComponent, GSFont
+
+
+VALUES = {
+    "bare": "a.ss01",
+    "quoted": "two words",
+    "escapes": 'say "hi" \\ there',
+    "unicode": "Ⅻ ő",
+    "newline": "line\nbreak",
+    "number-like string": "12",
+    "leading zero": "0012",
+    "float string": "1.5",
+    "int": 42,
+    "negative": -7,
+    "float": 0.25,
+    "data": b"\x00\xffab",
+    "empty list": [],
+    "empty dict": {},
+    "inline": [1, 2.5, "x"],
+    "nested": [{"pos": (10, -20), "name": "top"}, ["a", ["b", {}]]],
+}
+
+
+def test_values_round_trip():
+    text = plist.dumps(VALUES)
+    loaded = plist.loads(text)
+    assert loaded["nested"][0]["pos"] == [10, -20]
+    loaded["nested"][0]["pos"] = tuple(loaded["nested"][0]["pos"])
+    assert loaded == VALUES
+    assert plist.dumps(loaded) == text
+
+
+def test_lazy_keys_are_written_back_unchanged():
+    text = plist.dumps({"glyphs": [{"glyphname": "a", "layers": [{"width": 500}]}], "kerning": {"m": {"a": {"b": -5}}}})
+    loaded = plist.loads(text, lazy_keys={"glyphs", "kerning"})
+    assert isinstance(loaded["glyphs"], plist.Deferred)
+    assert plist.dumps(loaded) == text
+    assert plist.resolve(loaded["kerning"]) == {"m": {"a": {"b": -5}}}
+
+
+def test_malformed_text_raises():
+    with pytest.raises(plist.PlistError):
+        plist.loads("{a = 1;")
+    with pytest.raises(plist.PlistError):
+        plist.loads("{a = 1;} trailing")
+
+
+def test_glyphs_file_round_trip(tmp_path):
+    path, copy = tmp_path / "Font.glyphs", tmp_path / "Copy.glyphs"
+    synthetic.make_font(glyphs=80, masters=2, pairs=200).save(str(path))
+    GSFont(str(path)).save(str(copy))
+    assert copy.read_bytes() == path.read_bytes()
+
+
+def test_edits_survive_a_save(tmp_path):
+    path = tmp_path / "Font.glyphs"
+    font = synthetic.make_font(glyphs=80, masters=1, pairs=200)
+    font.save(str(path))
+    font = GSFont(str(path))
+    glyph = font.glyphs["A"]
+    glyph.name = "A.alt"
+    glyph.layers[font.masters[0].id].width = 777
+    font.setKerningForPair(font.masters[0].id, "A.alt", "B", -33)
+    font.save(str(path))
+
+    reread = GSFont(str(path))
+    assert "A" not in reread.glyphs
+    assert reread.glyphs["A.alt"].layers[reread.masters[0].id].width == 777
+    assert reread.kerningForPair(reread.masters[0].id, "A.alt", "B") == -33
+
+
+def test_glyph_ids_are_saved_as_names(tmp_path):
+    path = tmp_path / "Font.glyphs"
+    font = synthetic.make_font(glyphs=80, masters=1, pairs=200)
+    expected = plist.dumps(font.to_plist())
+    font.use_glyph_ids()
+    master_id = font.masters[0].id
+    assert font.glyphs["A"].id != "A"
+    assert font.glyphForId_(font.glyphs["A"].id) is font.glyphs["A"]
+    assert all(font.glyphs[key] is None for key in font.kerning[master_id] if not key.startswith("@"))
+    font.save(str(path))
+    assert path.read_text("utf-8") == expected
+
+
+def test_glyphs2_component_transform():
+    component = GSComponent(data={"name": "a", "transform": "{1, 0, 0, 1, 10, -5.5}"})
+    assert component.transform == (1, 0, 0, 1, 10, -5.5)
+    component.transform = (2, 0, 0, 2, 10, 0)
+    assert "transform" not in component.to_plist()
+    assert tuple(component.scale) == (2, 2) and tuple(component.position) == (10, 0)
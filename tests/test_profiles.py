@@ -0,0 +1,69 @@
+import numpy as np
+
+from rolandhuse import synthetic
+from rolandhuse.profiles import ProfileCache
+
+
+def _profiles(cache, font):
+    master_id = font.masters[0].id
+    return {glyph.name: cache.get(glyph.name, master_id) for glyph in font.glyphs}
+
+
+def _distinct(font):
+    """Profiles a cache without a file computes for the font (layers with the same content share one)."""
+    cache = ProfileCache(font)
+    _profiles(cache, font)
+    return cache.computed
+
+
+def _same(profile, other):
+    return (profile.bottom == other.bottom and profile.width == other.width and profile.bounds == other.bounds
+            and np.array_equal(profile.left, other.left) and np.array_equal(profile.right, other.right))
+
+
+def test_file_round_trip(tmp_path):
+    path = str(tmp_path / "profiles.npz")
+    font = synthetic.make_font(glyphs=60, masters=1, pairs=0)
+    cache = ProfileCache(font, path=path)
+    computed = _profiles(cache, font)
+    assert cache.computed == _distinct(font)
+    cache.save()
+
+    cache = ProfileCache(font, path=path)
+    loaded = _profiles(cache, font)
+    assert cache.computed == 0
+    assert all(_same(loaded[name], profile) for name, profile in computed.items())
+
+
+def test_edited_layers_and_their_users_are_sampled_again(tmp_path):
+    path = str(tmp_path / "profiles.npz")
+    font = synthetic.make_font(glyphs=60, masters=1, pairs=0)
+    master_id = font.masters[0].id
+    cache = ProfileCache(font, path=path)
+    before = _profiles(cache, font)
+    cache.save()
+
+    node = font.glyphs["h"].layers[master_id].shapes[0].nodes[0]
+    node.x -= 300
+    cache = ProfileCache(font, path=path)
+    after = _profiles(cache, font)
+    assert cache.computed == 2      # h and h.ss01, which uses it as a component
+    assert after["h"].bounds[0] == before["h"].bounds[0] - 300
+    assert after["h.ss01"].bounds[0] < before["h.ss01"].bounds[0]
+
+    # within a run, clear() picks up the edit
+    node.x += 300
+    cache.clear()
+    assert _same(cache.get("h", master_id), before["h"])
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "profiles.npz"
+    path.write_bytes(b"PK\x03\x04 cut off")
+    font = synthetic.make_font(glyphs=60, masters=1, pairs=0)
+    cache = ProfileCache(font, path=str(path))
+    _profiles(cache, font)
+    assert cache.computed == _distinct(font)
+    cache.save()
+    assert ProfileCache(font, path=str(path))._stored
+    assert [item.name for item in tmp_path.iterdir()] == ["profiles.npz"]
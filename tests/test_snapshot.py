@@ -0,0 +1,48 @@
+import gc
+import weakref
+
+from rolandhuse import synthetic
+from rolandhuse.snapshot import invalidate, snapshot
+
+
+def test_reused_while_unchanged(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    snap = snapshot(font)
+    font.glyphs["a"].layers[font.masters[0].id].width = 900
+    assert snapshot(font) is snap
+    invalidate(font)
+    assert snapshot(font) is not snap
+
+
+def test_renames_groups_and_unicodes_are_seen(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0, groups=10)
+    snapshot(font)
+    glyph = font.glyphs["b"]
+    glyph.name = "b.alt"
+    assert snapshot(font).glyph("b") is None and snapshot(font).glyph("b.alt") is glyph
+    glyph.rightKerningGroup = "new"
+    assert snapshot(font).members("@MMK_L_new") == ["b.alt"]
+    glyph.unicode = "E000"
+    assert snapshot(font).glyph_for_unicode("e000") is glyph
+
+
+def test_glyph_ids_are_seen():
+    font = synthetic.make_font(glyphs=60, masters=1, pairs=0)
+    assert snapshot(font).key_id("a") == "a"
+    font.use_glyph_ids()
+    assert snapshot(font).key_id("a") == font.glyphs["a"].id != "a"
+
+
+def test_invalidate_all_fonts(make_font):
+    fonts = [make_font(glyphs=60, masters=1, pairs=0) for _ in range(2)]
+    snaps = [snapshot(font) for font in fonts]
+    invalidate()
+    assert all(snapshot(font) is not snap for font, snap in zip(fonts, snaps))
+
+
+def test_lives_with_the_font(make_font):
+    font = make_font(glyphs=60, masters=1, pairs=0)
+    snap = weakref.ref(snapshot(font))
+    font = weakref.ref(font)
+    gc.collect()
+    assert font() is None and snap() is None
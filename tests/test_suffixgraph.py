@@ -0,0 +1,30 @@
+from rolandhuse.suffixgraph import SuffixGraph
+
+NAMES = ["a", "a.ss02", "a.alt", "a.ss01", "a.cv01", "a.init", "a.ss01.init", "a.ss01.fina",
+         "b", "b.cv01", "b.ss10", "c.ss01", "period", "f_i.liga"]
+
+
+def test_levels_by_family_then_number():
+    assert SuffixGraph(NAMES).levels == [".ss01", ".ss02", ".ss10"]
+    graph = SuffixGraph(NAMES, families=("cv", "ss", "alt"))
+    assert graph.levels == [".cv01", ".ss01", ".ss02", ".ss10", ".alt"]
+    assert graph.cycling("a") == [".cv01", ".ss01", ".ss02", ".alt"]
+    assert graph.cycling("b") == [".cv01", ".ss10"]
+    assert SuffixGraph(NAMES, families=(r"liga",)).levels == [".liga"]
+
+
+def test_forms_need_an_existing_base():
+    graph = SuffixGraph(NAMES)
+    assert graph.bases == ["a", "b", "period"]
+    assert graph.form("a", ".ss01", ".init") == "a.ss01.init"
+    assert graph.form("a", ".ss03") is None
+    assert graph.form("c", ".ss01") is None
+    assert graph.cycling_forms() == ["a.ss01", "a.ss02", "b.ss10"]
+
+
+def test_positional_forms():
+    graph = SuffixGraph(NAMES)
+    assert graph.positional(".init") == [("a", "a.init"), ("a.ss01", "a.ss01.init")]
+    assert graph.positional("fina") == [("a.ss01", "a.ss01.fina")]
+    # .cv01 does not cycle with the default families, so its .init would not count
+    assert SuffixGraph(["a", "a.cv01", "a.cv01.init"]).positional(".init") == []